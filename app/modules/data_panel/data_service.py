@@ -1,21 +1,49 @@
 import pandas as pd
 from pathlib import Path
 
+from fpl_data.storage import available_columns, read_table
 
-def load_all_gameweek_data():
+DATA_FILE = Path(__file__).parent.parent.parent.parent / "data" / "gameweek_data" / "gameweek_data.parquet"
+
+# Always loaded, for the summary metrics
+SUMMARY_COLUMNS = ['gameweek', 'player_name', 'team']
+
+# Shown until the user picks other columns
+DEFAULT_COLUMNS = SUMMARY_COLUMNS + [
+    'position', 'opponent_team', 'was_home', 'total_points', 'minutes', 'goals_scored', 'assists', 'value',
+]
+
+
+def get_available_columns():
     """
-    Load the single gameweek data CSV.
+    Columns of the gameweek data file, read from its header only.
     
     Returns:
-        DataFrame: All gameweek data.
+        list: Column names (empty if there is no data file).
+    """
+    try:
+        return available_columns(DATA_FILE)
+    except FileNotFoundError:
+        return []
+
+
+def load_all_gameweek_data(columns=None):
     """
-    data_file = Path(__file__).parent.parent.parent.parent / "data" / "gameweek_data" / "gameweek_data.csv"
+    Load the single gameweek data file (gameweek_data.parquet, or the CSV if only that exists).
     
-    if not data_file.exists():
-        return pd.DataFrame()
+    Args:
+        columns: Columns to load, plus SUMMARY_COLUMNS (default: all).
+        
+    Returns:
+        DataFrame: All gameweek data.
+    """
+    if columns is not None:
+        columns = SUMMARY_COLUMNS + [column for column in columns if column not in SUMMARY_COLUMNS]
     
     try:
-        return pd.read_csv(data_file)
+        return read_table(DATA_FILE, columns=columns)
+    except FileNotFoundError:
+        return pd.DataFrame()
     except Exception as e:
         print(f"Error loading data: {e}")
         return pd.DataFrame()
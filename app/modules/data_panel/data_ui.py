@@ -1,13 +1,25 @@
 import streamlit as st
-from .data_service import load_all_gameweek_data, get_data_summary
+from .data_service import DEFAULT_COLUMNS, get_available_columns, load_all_gameweek_data, get_data_summary
 
 
 def render_data_panel():
     """Render the data panel UI."""
     st.header("Gameweek Data")
     
+    all_columns = get_available_columns()
+    if not all_columns:
+        st.warning("No gameweek data found. Run the data collection scripts first.")
+        return
+    
+    # Only the selected columns are read from disk
+    columns = st.multiselect(
+        "Columns",
+        options=all_columns,
+        default=[column for column in DEFAULT_COLUMNS if column in all_columns]
+    )
+    
     with st.spinner("Loading data..."):
-        df = load_all_gameweek_data()
+        df = load_all_gameweek_data(columns)
     
     if df.empty:
         st.warning("No gameweek data found. Run the data collection scripts first.")
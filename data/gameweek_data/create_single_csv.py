@@ -1,56 +1,66 @@
-import requests
+import argparse
+import csv
+import os
+import sys
+import threading
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from fpl_data.client import BASE_URL, get_client
+from fpl_data.storage import HISTORY_SCHEMA, csv_to_parquet
 
-def fetch_player_history(player_id):
+
+# Columns of gameweek_data.csv, one row per player per fixture played
+COLUMNS = [
+    'player_id', 'player_name', 'full_name', 'team', 'position', 'gameweek', 'kickoff_time',
+    'opponent_team', 'was_home', 'total_points', 'minutes', 'goals_scored', 'assists',
+    'clean_sheets', 'goals_conceded', 'own_goals', 'penalties_saved', 'penalties_missed',
+    'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps', 'influence', 'creativity', 'threat',
+    'ict_index', 'value', 'transfers_balance', 'selected', 'transfers_in', 'transfers_out',
+    'expected_goals', 'expected_assists', 'expected_goal_involvements', 'expected_goals_conceded',
+]
+
+DEFAULT_OUTPUT = Path(__file__).parent / "gameweek_data.csv"
+
+# element-summary requests in flight, and started per second across all of them
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 10
+
+
+def fetch_player_history(player_id, base_url=BASE_URL):
     """
     Fetch complete gameweek history for a specific player.
-    
+
     Args:
         player_id (int): FPL player ID
-        
+        base_url (str): API root URL
+
     Returns:
         dict: Player history data
     """
-    url = f"https://fantasy.premierleague.com/api/element-summary/{player_id}/"
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    return get_client(base_url).get_json(f'element-summary/{player_id}/')
 
 
-def fetch_bootstrap_data():
+def fetch_bootstrap_data(base_url=BASE_URL):
     """Fetch bootstrap data for player names and team info."""
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    return get_client(base_url).get_json('bootstrap-static/')
 
 
-def process_player_gameweek_data(player_id):
+def build_history_rows(player_id, player_info, teams, gameweek_history):
     """
-    Get all gameweek data for a player.
-    
+    Turn a player's element-summary history into gameweek_data.csv rows.
+
     Args:
         player_id (int): FPL player ID
-        
+        player_info (dict): The player's bootstrap element
+        teams (dict): Team ID to team name
+        gameweek_history (list): 'history' list from element-summary
+
     Returns:
-        pd.DataFrame: Complete gameweek history
+        list: Row dicts with COLUMNS keys
     """
-    # Get bootstrap for player info
-    bootstrap = fetch_bootstrap_data()
-    players = {p['id']: p for p in bootstrap['elements']}
-    teams = {t['id']: t['name'] for t in bootstrap['teams']}
-    
-    player_info = players[player_id]
-    
-    # Get player history
-    history_data = fetch_player_history(player_id)
-    
-    # Extract gameweek history
-    gameweek_history = history_data['history']
-    
-    # Process into clean dataframe
     data = []
     for gw in gameweek_history:
         row = {
@@ -92,25 +102,222 @@ def process_player_gameweek_data(player_id):
             'expected_goals_conceded': gw['expected_goals_conceded'],
         }
         data.append(row)
-    
-    return pd.DataFrame(data)
+
+    return data
+
+
+def process_player_gameweek_data(player_id, bootstrap=None):
+    """
+    Get all gameweek data for a player.
+
+    Args:
+        player_id (int): FPL player ID
+        bootstrap (dict): Bootstrap data to reuse (fetched if not given)
+
+    Returns:
+        pd.DataFrame: Complete gameweek history
+    """
+    if bootstrap is None:
+        bootstrap = fetch_bootstrap_data()
+    players = {p['id']: p for p in bootstrap['elements']}
+    teams = {t['id']: t['name'] for t in bootstrap['teams']}
+
+    history_data = fetch_player_history(player_id)
+    rows = build_history_rows(player_id, players[player_id], teams, history_data['history'])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+class RateLimiter:
+    """Space out request starts to at most `rate` per second across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's start slot."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def checkpoint_path_for(output_path):
+    """Checkpoint file (completed player IDs, one per line) next to the output CSV."""
+    return Path(output_path).with_suffix('.checkpoint')
+
+
+def read_checkpoint(checkpoint_path):
+    """Player IDs recorded as complete in a checkpoint file."""
+    checkpoint_path = Path(checkpoint_path)
+    if not checkpoint_path.exists():
+        return set()
+    with open(checkpoint_path) as f:
+        return {int(line) for line in f if line.strip().isdigit()}
+
+
+def trim_to_checkpoint(output_path, completed):
+    """
+    Drop rows of players that are not in the checkpoint.
+
+    Rows are written before their player is checkpointed, so an interrupted run can
+    leave rows (possibly a torn last line) for a player that will be fetched again.
+
+    Args:
+        output_path (Path): Output CSV
+        completed (set): Checkpointed player IDs
+
+    Returns:
+        int: Rows kept
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_suffix('.tmp')
+    kept = 0
+
+    with open(output_path, newline='') as source, open(tmp_path, 'w', newline='') as target:
+        writer = csv.writer(target)
+        writer.writerow(COLUMNS)
+        reader = csv.reader(source)
+        next(reader, None)
+        for row in reader:
+            if len(row) == len(COLUMNS) and row[0].isdigit() and int(row[0]) in completed:
+                writer.writerow(row)
+                kept += 1
+
+    os.replace(tmp_path, output_path)
+    return kept
+
+
+def fetch_player_rows(player_id, players, teams, rate_limiter, base_url):
+    """Fetch one player's history (after their rate-limit slot) and build its rows."""
+    rate_limiter.wait()
+    history_data = fetch_player_history(player_id, base_url)
+    return build_history_rows(player_id, players[player_id], teams, history_data['history'])
+
+
+def build_season_history(output_path=DEFAULT_OUTPUT, player_ids=None, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                         resume=True, base_url=BASE_URL):
+    """
+    Fetch every player's gameweek history into one CSV.
+
+    Bootstrap is fetched once. element-summary requests run on a thread pool, with at
+    most `rate` started per second. Each player's rows are appended to the CSV as
+    their request completes, then the player ID is appended to the checkpoint. A
+    resumed run skips checkpointed players and first drops any rows written for
+    players that were not checkpointed.
+
+    Args:
+        output_path (Path): Output CSV
+        player_ids (list): Players to fetch (default: every player in bootstrap)
+        workers (int): Concurrent requests
+        rate (float): Maximum requests started per second (0 for no limit)
+        resume (bool): Continue from the checkpoint instead of starting over
+        base_url (str): API root URL
+
+    Returns:
+        dict: Counts of players fetched, skipped and failed, rows written, failed IDs and seconds
+    """
+    start = time.perf_counter()
+    output_path = Path(output_path)
+    checkpoint_path = checkpoint_path_for(output_path)
+
+    bootstrap = fetch_bootstrap_data(base_url)
+    players = {p['id']: p for p in bootstrap['elements']}
+    teams = {t['id']: t['name'] for t in bootstrap['teams']}
+    if player_ids is None:
+        player_ids = sorted(players)
+
+    completed = read_checkpoint(checkpoint_path) if resume and output_path.exists() else set()
+    if completed:
+        kept = trim_to_checkpoint(output_path, completed)
+        print(f"Resuming: {len(completed)} players ({kept} rows) already saved")
+    else:
+        with open(output_path, 'w', newline='') as f:
+            csv.writer(f).writerow(COLUMNS)
+        checkpoint_path.write_text('')
+
+    pending = [player_id for player_id in player_ids if player_id not in completed]
+    print(f"Fetching {len(pending)} players with {workers} workers at up to {rate} requests/s...")
+
+    rate_limiter = RateLimiter(rate)
+    rows_written = 0
+    failed = []
+
+    with open(output_path, 'a', newline='') as output_file, open(checkpoint_path, 'a') as checkpoint_file, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(output_file, fieldnames=COLUMNS)
+        futures = {
+            executor.submit(fetch_player_rows, player_id, players, teams, rate_limiter, base_url): player_id
+            for player_id in pending
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                player_id = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    print(f"  Player {player_id}: Error: {e}")
+                    failed.append(player_id)
+                    continue
+
+                writer.writerows(rows)
+                output_file.flush()
+                checkpoint_file.write(f"{player_id}\n")
+                checkpoint_file.flush()
+                rows_written += len(rows)
+
+                if done % 100 == 0 or done == len(futures):
+                    print(f"  {done}/{len(futures)} players, {rows_written} rows "
+                          f"({time.perf_counter() - start:.1f}s)")
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            print("Interrupted - rerun to resume from the checkpoint")
+            raise
+
+    return {
+        'fetched': len(pending) - len(failed),
+        'skipped': len(completed),
+        'failed': len(failed),
+        'failed_ids': failed,
+        'rows': rows_written,
+        'seconds': time.perf_counter() - start,
+    }
 
 
 def main():
-    """Test with David Raya (player_id = 1)."""
-    print("Fetching David Raya's complete gameweek history...")
-    
-    df = process_player_gameweek_data(player_id=1)
-    
-    # Save to CSV
-    output_path = Path(__file__).parent / "gameweek_data.csv"
-    df.to_csv(output_path, index=False)
-    
-    print(f"\nSaved to: {output_path}")
-    print(f"Total gameweeks: {len(df)}")
-    print(f"\nFirst few rows:")
-    print(df.head())
-    print(f"\nColumns: {list(df.columns)}")
+    """Build gameweek_data.csv from every player's element-summary history."""
+    parser = argparse.ArgumentParser(description="Fetch every player's gameweek history into one CSV")
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT))
+    parser.add_argument('--player-ids', type=int, nargs='+', default=None, help="Only these players")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent requests")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="Maximum requests started per second")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and start over")
+    parser.add_argument('--base-url', default=BASE_URL, help="API root URL")
+    args = parser.parse_args()
+
+    try:
+        summary = build_season_history(
+            output_path=args.output,
+            player_ids=args.player_ids,
+            workers=args.workers,
+            rate=args.rate,
+            resume=not args.restart,
+            base_url=args.base_url,
+        )
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    parquet_path = Path(args.output).with_suffix('.parquet')
+    csv_to_parquet(args.output, parquet_path, HISTORY_SCHEMA)
+
+    print(f"\nSaved to: {args.output} and {parquet_path}")
+    print(f"Players fetched: {summary['fetched']}, already saved: {summary['skipped']}, failed: {summary['failed']}")
+    print(f"Rows written: {summary['rows']} in {summary['seconds']:.1f}s")
+    if summary['failed_ids']:
+        print(f"Failed players (rerun to retry): {summary['failed_ids']}")
 
 
 if __name__ == "__main__":
@@ -1,21 +1,30 @@
+import argparse
+import time
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from fpl_data.client import BASE_URL, get_client
+from fpl_data.storage import write_gameweek
 
-def fetch_bootstrap_data():
+
+# Live endpoints fetched at once over the client's pooled connections
+DEFAULT_WORKERS = 8
+
+
+def fetch_bootstrap_data(base_url=BASE_URL):
     """
     Fetch bootstrap-static data containing all player information.
     
+    Args:
+        base_url (str): API root URL
+    
     Returns:
         dict: Complete bootstrap data including players, teams, and events
     """
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client(base_url).get_json('bootstrap-static/')
         print(f"Fetched bootstrap data: {len(data['elements'])} players")
         return data
     except requests.exceptions.RequestException as e:
@@ -23,24 +32,26 @@ def fetch_bootstrap_data():
         return None
 
 
-def fetch_live_gameweek_data(gameweek):
+def fetch_live_gameweek_data(gameweek, base_url=BASE_URL):
     """
     Fetch live gameweek data with player-specific stats.
     
     Args:
         gameweek (int): The gameweek number
+        base_url (str): API root URL
     
     Returns:
-        dict: Live gameweek data, or None if not available
-    """
-    url = f"https://fantasy.premierleague.com/api/event/{gameweek}/live/"
+        dict: Live gameweek data, or None if the gameweek has not started (404)
     
+    Raises:
+        requests.exceptions.RequestException: If the request fails once retries are exhausted
+    """
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None
+        return get_client(base_url).get_json(f'event/{gameweek}/live/')
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
 
 
 def create_team_mapping(teams_data):
@@ -158,50 +169,130 @@ def process_gameweek_data(bootstrap_data, live_data, gameweek):
 
 
 def save_gameweek_csv(df, gameweek, output_dir):
-    """Save gameweek DataFrame to CSV file."""
+    """Save gameweek DataFrame to CSV file and return its path."""
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
     output_path = output_dir / f"gameweek{gameweek}.csv"
     df.to_csv(output_path, index=False)
-    print(f"  Saved gameweek{gameweek}.csv")
+    return output_path
+
+
+def collect_gameweek(bootstrap_data, gameweek, output_dir, base_url=BASE_URL, write_csv=False):
+    """
+    Fetch, process and save one gameweek.
+    
+    The gameweek is written as the gameweek=N partition of the Parquet dataset in
+    output_dir/gameweeks (fpl_data.storage), and optionally as gameweekN.csv.
+    
+    Args:
+        bootstrap_data (dict): Complete bootstrap data
+        gameweek (int): Gameweek number
+        output_dir (Path): Directory for the dataset and CSV files
+        base_url (str): API root URL
+        write_csv (bool): Also write gameweekN.csv
+    
+    A failed fetch is reported as 'Error' and leaves any existing partition in place,
+    so a network problem never overwrites collected stats with an empty gameweek.
+    
+    Returns:
+        dict: Gameweek, status ('Complete', 'Future' or 'Error'), error message and seconds
+    """
+    start = time.perf_counter()
+    error = None
+    
+    try:
+        live_data = fetch_live_gameweek_data(gameweek, base_url)
+        status = "Complete" if live_data and live_data.get('elements') else "Future"
+        df = process_gameweek_data(bootstrap_data, live_data, gameweek)
+        write_gameweek(df, gameweek, Path(output_dir) / 'gameweeks')
+        if write_csv:
+            save_gameweek_csv(df, gameweek, output_dir)
+    except Exception as e:
+        status, error = "Error", str(e)
+    
+    return {
+        'gameweek': gameweek,
+        'status': status,
+        'error': error,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def collect_gameweeks(bootstrap_data, gameweeks, output_dir, base_url=BASE_URL, max_workers=DEFAULT_WORKERS,
+                      write_csv=False):
+    """
+    Fetch, process and save gameweeks concurrently.
+    
+    Each worker thread fetches one live endpoint and then processes and writes its CSV,
+    so network waits overlap with processing and writing of the other gameweeks. At
+    most max_workers requests are in flight at once.
+    
+    Args:
+        bootstrap_data (dict): Complete bootstrap data
+        gameweeks (iterable): Gameweek numbers
+        output_dir (Path): Directory for the dataset and CSV files
+        base_url (str): API root URL
+        max_workers (int): Maximum concurrent gameweeks
+        write_csv (bool): Also write gameweekN.csv files
+    
+    Returns:
+        list: collect_gameweek results, ordered by gameweek
+    """
+    results = []
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(collect_gameweek, bootstrap_data, gameweek, output_dir, base_url, write_csv)
+            for gameweek in gameweeks
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            detail = f"Error: {result['error']}" if result['error'] else f"Saved gameweek={result['gameweek']}"
+            print(f"GW{result['gameweek']:2d} ({result['status']:8s}): {detail} ({result['seconds']:.2f}s)")
+            results.append(result)
+    
+    return sorted(results, key=lambda result: result['gameweek'])
 
 
 def main():
     """
     Fetch and save data for all 38 gameweeks.
-    Uses 1 bootstrap call + 1 live data call per gameweek = 39 total API calls.
+    Uses 1 bootstrap call + 1 live data call per gameweek = 39 total API calls,
+    with the live calls made concurrently.
     """
+    parser = argparse.ArgumentParser(description="Collect player data for every gameweek")
+    parser.add_argument('--base-url', default=BASE_URL, help="API root URL")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Maximum concurrent requests")
+    parser.add_argument('--gameweeks', type=int, nargs='+', default=list(range(1, 39)))
+    parser.add_argument('--output-dir', default=str(Path(__file__).parent))
+    parser.add_argument('--csv', action='store_true', help="Also write gameweekN.csv files")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("FPL All Gameweeks Data Collection")
     print("=" * 60)
     
+    start = time.perf_counter()
+    
     # Fetch bootstrap data (contains all player information)
-    bootstrap_data = fetch_bootstrap_data()
+    bootstrap_data = fetch_bootstrap_data(args.base_url)
     if bootstrap_data is None:
         print("Failed to fetch bootstrap data")
         return
     
-    output_dir = Path(__file__).parent
+    output_dir = Path(args.output_dir)
     
-    print(f"\nProcessing all 38 gameweeks...")
+    print(f"\nProcessing {len(args.gameweeks)} gameweeks with {args.workers} workers...")
     print("-" * 60)
     
-    # Process each gameweek with one additional API call per gameweek
-    for gameweek in range(1, 39):
-        live_data = fetch_live_gameweek_data(gameweek)
-        status = "Complete" if live_data else "Future"
-        print(f"GW{gameweek:2d} ({status:8s}): ", end="", flush=True)
-        
-        try:
-            df = process_gameweek_data(bootstrap_data, live_data, gameweek)
-            save_gameweek_csv(df, gameweek, output_dir)
-        except Exception as e:
-            print(f"Error: {e}")
-            continue
+    results = collect_gameweeks(bootstrap_data, args.gameweeks, output_dir, args.base_url, args.workers, args.csv)
     
+    failed = [result['gameweek'] for result in results if result['status'] == "Error"]
     print("-" * 60)
-    print("Data collection complete")
+    print(f"Data collection complete in {time.perf_counter() - start:.2f}s")
+    if failed:
+        print(f"Failed gameweeks: {failed}")
     print("=" * 60)
 
 
@@ -1,7 +1,11 @@
+import argparse
 import requests
 import pandas as pd
 from pathlib import Path
 
+from fpl_data.client import get_client
+from fpl_data.storage import write_gameweek
+
 
 def fetch_bootstrap_data():
     """
@@ -10,12 +14,8 @@ def fetch_bootstrap_data():
     Returns:
         dict: Complete bootstrap data including players, teams, and events
     """
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client().get_json('bootstrap-static/')
         print(f"Fetched bootstrap data: {len(data['elements'])} players")
         return data
     except requests.exceptions.RequestException as e:
@@ -33,12 +33,8 @@ def fetch_live_gameweek_data(gameweek):
     Returns:
         dict: Live gameweek data, or None if not available
     """
-    url = f"https://fantasy.premierleague.com/api/event/{gameweek}/live/"
-    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client().get_json(f'event/{gameweek}/live/')
         print(f"Fetched live data for gameweek {gameweek}")
         return data
     except requests.exceptions.RequestException:
@@ -203,6 +199,10 @@ def main():
     Fetch and update data for the current gameweek.
     Uses 2 API calls: 1 bootstrap + 1 live data.
     """
+    parser = argparse.ArgumentParser(description="Update the current gameweek's player data")
+    parser.add_argument('--csv', action='store_true', help="Also write gameweekN.csv")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("FPL Current Gameweek Data Update")
     print("=" * 60)
@@ -229,7 +229,10 @@ def main():
     
     try:
         df = process_gameweek_data(bootstrap_data, live_data, current_gw)
-        save_gameweek_csv(df, current_gw, output_dir)
+        partition_path = write_gameweek(df, current_gw, output_dir / 'gameweeks')
+        print(f"Saved to {partition_path}")
+        if args.csv:
+            save_gameweek_csv(df, current_gw, output_dir)
     except Exception as e:
         print(f"Error processing gameweek {current_gw}: {e}")
         return
@@ -1,7 +1,11 @@
+import argparse
 import requests
 import pandas as pd
 from pathlib import Path
 
+from fpl_data.client import get_client
+from fpl_data.storage import TIMETABLE_SCHEMA, write_table
+
 
 def fetch_fpl_fixtures():
     """
@@ -10,12 +14,8 @@ def fetch_fpl_fixtures():
     Returns:
         list: List of fixture dictionaries
     """
-    url = "https://fantasy.premierleague.com/api/fixtures/"
-    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        fixtures = response.json()
+        fixtures = get_client().get_json('fixtures/')
         print(f"Fetched {len(fixtures)} fixtures")
         return fixtures
     except requests.exceptions.RequestException as e:
@@ -30,12 +30,8 @@ def fetch_team_names():
     Returns:
         dict: Dictionary mapping team IDs to team names
     """
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client().get_json('bootstrap-static/')
         teams = {team['id']: team['name'] for team in data['teams']}
         print(f"Fetched {len(teams)} teams")
         return teams
@@ -88,8 +84,18 @@ def save_to_csv(df, output_path):
     print(f"Total fixtures: {len(df)}")
 
 
+def save_to_parquet(df, output_path):
+    """Save DataFrame to Parquet with the timetable schema."""
+    write_table(df, output_path, TIMETABLE_SCHEMA)
+    print(f"Saved to {output_path}")
+
+
 def main():
     """Fetch and save all FPL fixtures for the season."""
+    parser = argparse.ArgumentParser(description="Collect the fixture timetable")
+    parser.add_argument('--csv', action='store_true', help="Also write timetable.csv")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("FPL Fixtures Data Collection")
     print("=" * 60)
@@ -109,9 +115,10 @@ def main():
     print(f"\nFixtures by gameweek:")
     print(df.groupby('gameweek').size())
     
-    # Save to CSV
-    output_path = Path(__file__).parent / "timetable.csv"
-    save_to_csv(df, output_path)
+    # Save to Parquet (and CSV)
+    save_to_parquet(df, Path(__file__).parent / "timetable.parquet")
+    if args.csv:
+        save_to_csv(df, Path(__file__).parent / "timetable.csv")
     
     print("\nSample fixtures:")
     print(df.head(10))
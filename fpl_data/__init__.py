@@ -0,0 +1 @@
+# FPL data access shared by the data scripts, optimiser and app
@@ -0,0 +1,211 @@
+# cache.py
+# TTL-bound on-disk cache of FPL API responses, shared by every process on the machine
+
+import argparse
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FPL_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.fpl_cache')
+)
+
+# Seconds a response is served without contacting the API, by path prefix. Anything
+# else is stored only for ETag/Last-Modified revalidation.
+DEFAULT_TTLS = {
+    'bootstrap-static/': 15 * 60,
+    'fixtures/': 60 * 60,
+    'entry/': 15 * 60,
+}
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on a lock file (flock, or msvcrt on Windows)."""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class DiskCache:
+    """
+    Response store for FPLClient that persists across processes.
+
+    Each URL is one pickle file holding its body, validators and fetch time. Files are
+    written to a temporary name and renamed, so readers never see a partial entry and
+    need no lock. Refreshing an expired entry holds a per-URL lock file, and the client
+    re-checks freshness once it has the lock, so concurrent runs download it once and
+    the others read the new entry. Entries read in this process are kept in memory
+    until the file changes, so repeated lookups neither re-read nor re-parse it.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttls=None):
+        """
+        Args:
+            cache_dir: Directory for cache entries (created if missing)
+            ttls: Dict of path prefix to seconds (default: DEFAULT_TTLS)
+        """
+        self.cache_dir = cache_dir
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._memory = {}
+        self._thread_locks = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url, suffix='.pkl'):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + suffix)
+
+    def ttl(self, url):
+        """Seconds a response for url stays fresh, or None to always revalidate."""
+        for prefix, seconds in self.ttls.items():
+            if f"/{prefix}" in url:
+                return seconds
+        return None
+
+    def get(self, url):
+        """
+        Look up a stored response.
+
+        Returns:
+            dict: Entry with url, etag, last_modified, fetched_at and content, or None
+                  (unreadable entries are removed)
+        """
+        path = self._path(url)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            memory = self._memory.get(url)
+        if memory is not None and memory[0] == version:
+            return memory[1]
+
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Discarding unreadable cache entry for {url}: {e}")
+            self._remove(path)
+            return None
+
+        with self._lock:
+            self._memory[url] = (version, entry)
+        return entry
+
+    def set(self, url, entry):
+        """Store an entry atomically."""
+        entry = dict(entry, url=url)
+        path = self._path(url)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        stat = os.stat(path)
+        with self._lock:
+            self._memory[url] = ((stat.st_mtime_ns, stat.st_size), entry)
+
+    @contextmanager
+    def lock(self, url):
+        """Exclusive lock on url across threads and processes."""
+        with self._lock:
+            thread_lock = self._thread_locks.setdefault(url, threading.Lock())
+        with thread_lock, file_lock(self._path(url, '.lock')):
+            yield
+
+    def entries(self):
+        """
+        Stored entries, newest first.
+
+        Returns:
+            list: Dicts with url, age_seconds, bytes and etag
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, name), 'rb') as f:
+                    entry = pickle.load(f)
+            except Exception:
+                continue
+            entries.append({
+                'url': entry['url'],
+                'age_seconds': time.time() - entry['fetched_at'],
+                'bytes': len(entry['content']),
+                'etag': entry.get('etag'),
+            })
+        return sorted(entries, key=lambda entry: entry['age_seconds'])
+
+    def clear(self):
+        """Remove every entry and lock file."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.pkl', '.lock', '.tmp')):
+                self._remove(os.path.join(self.cache_dir, name))
+        with self._lock:
+            self._memory.clear()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or clear the FPL API response cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--clear', action='store_true', help="Remove every cached response")
+    args = parser.parse_args()
+
+    cache = DiskCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+        print(f"Cleared {args.cache_dir}")
+        return
+
+    entries = cache.entries()
+    for entry in entries:
+        print(f"{entry['age_seconds']:8.0f}s  {entry['bytes'] / 1024:9.1f} KB  {entry['url']}")
+    print(f"{len(entries)} entries, {sum(entry['bytes'] for entry in entries) / 1024 ** 2:.1f} MB in {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# client.py
+# Shared FPL API client: pooled keep-alive connections, timeouts, retries, conditional requests
+# and a TTL-bound disk cache
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fpl_data.cache import DEFAULT_CACHE_DIR, DiskCache
+
+# API root, overridable with FPL_API_BASE_URL (e.g. a local mock server)
+BASE_URL = os.environ.get('FPL_API_BASE_URL', "https://fantasy.premierleague.com/api")
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 30)
+
+# Connections kept open per host, enough for the concurrent collectors
+POOL_SIZE = 16
+
+# Retried with exponential backoff (0.5s, 1s, 2s, ...), honouring Retry-After on 429
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 0.5
+
+USER_AGENT = "fpl-optimiser/2"
+
+
+class MemoryStore:
+    """In-process store of responses for revalidation, keyed by URL (no TTL)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._url_locks = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, url):
+        """Responses are always revalidated."""
+        return None
+
+    def get(self, url):
+        """Return the stored entry for url, or None."""
+        with self._lock:
+            return self._entries.get(url)
+
+    def set(self, url, entry):
+        """Store an entry (dict with etag, last_modified, fetched_at and content)."""
+        with self._lock:
+            self._entries[url] = entry
+
+    @contextmanager
+    def lock(self, url):
+        """Exclusive lock on url across threads."""
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            yield
+
+
+class FPLClient:
+    """
+    FPL API client shared by every caller.
+
+    One requests.Session with a pooled HTTPAdapter keeps connections alive across
+    calls and threads. Connection errors and 429/5xx responses are retried with
+    exponential backoff. Responses are kept in the store. Within the store's TTL for
+    a URL they are served without a request. After that the request sends
+    If-None-Match / If-Modified-Since, so an unchanged resource comes back as an
+    empty 304. Only one thread or process refreshes an expired URL at a time.
+
+    Example:
+        client = get_client()
+        bootstrap = client.get_json('bootstrap-static/')
+        print(client.stats)
+    """
+
+    def __init__(self, base_url=BASE_URL, timeout=DEFAULT_TIMEOUT, store=None, pool_size=POOL_SIZE,
+                 max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR):
+        """
+        Args:
+            base_url: API root URL
+            timeout: Default (connect, read) timeout in seconds
+            store: Response store with get, set, ttl and lock (DiskCache, or MemoryStore by default)
+            pool_size: Connections kept open per host
+            max_retries: Retries for connection errors and RETRY_STATUSES
+            backoff_factor: Backoff base in seconds
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.store = store if store is not None else MemoryStore()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['User-Agent'] = USER_AGENT
+
+        self.stats = {'requests': 0, 'not_modified': 0, 'cache_hits': 0, 'bytes': 0}
+        self._parsed = {}
+        self._lock = threading.Lock()
+
+    def url(self, path):
+        """Full URL for an API path (absolute URLs are returned unchanged)."""
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _is_fresh(self, url, stored, ttl):
+        if stored is None:
+            return False
+        ttl = self.store.ttl(url) if ttl is None else ttl
+        return ttl is not None and time.time() - stored['fetched_at'] < ttl
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def get_content(self, path, timeout=None, revalidate=True, ttl=None):
+        """
+        GET an API path and return the response body.
+
+        Args:
+            path: API path such as 'bootstrap-static/' or a full URL
+            timeout: (connect, read) timeout (default: the client's)
+            revalidate: Use the store (False always downloads and stores nothing)
+            ttl: Seconds a stored response is served without a request (default: the
+                store's for the URL; 0 always revalidates)
+
+        Returns:
+            bytes: Response body
+
+        Raises:
+            requests.HTTPError: Non-2xx response once retries are exhausted
+            requests.RequestException: Connection or timeout error once retries are exhausted
+        """
+        url = self.url(path)
+        if not revalidate:
+            return self._request(url, None, timeout, keep=False)
+
+        stored = self.store.get(url)
+        if self._is_fresh(url, stored, ttl):
+            self._count('cache_hits')
+            return stored['content']
+
+        with self.store.lock(url):
+            # Another thread or process may have refreshed it while we waited
+            stored = self.store.get(url)
+            if self._is_fresh(url, stored, ttl):
+                self._count('cache_hits')
+                return stored['content']
+            return self._request(url, stored, timeout)
+
+    def _request(self, url, stored, timeout, keep=True):
+        """GET url, revalidating a stored entry, and store the response."""
+        headers = {}
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+        self._count('requests')
+        self._count('bytes', len(response.content))
+
+        if response.status_code == 304 and stored:
+            self._count('not_modified')
+            self.store.set(url, dict(stored, fetched_at=time.time()))
+            return stored['content']
+        response.raise_for_status()
+
+        if keep:
+            self.store.set(url, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+                'content': response.content,
+            })
+        return response.content
+
+    def get_json(self, path, timeout=None, revalidate=True, ttl=None):
+        """
+        GET an API path and parse the JSON body (see get_content).
+
+        The parsed object is reused while the body is unchanged, so callers share it
+        and must not modify it.
+        """
+        url = self.url(path)
+        content = self.get_content(path, timeout=timeout, revalidate=revalidate, ttl=ttl)
+        with self._lock:
+            parsed = self._parsed.get(url)
+        if parsed is not None and parsed[0] is content:
+            return parsed[1]
+
+        data = json.loads(content)
+        if revalidate:
+            with self._lock:
+                self._parsed[url] = (content, data)
+        return data
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url=BASE_URL, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Return the process-wide client for a base URL, creating it on first use.
+
+    Args:
+        base_url: API root URL
+        cache_dir: DiskCache directory shared with other processes (None for memory only)
+
+    Returns:
+        FPLClient: Shared client
+    """
+    key = (base_url.rstrip('/'), cache_dir)
+    with _clients_lock:
+        if key not in _clients:
+            store = DiskCache(cache_dir) if cache_dir else MemoryStore()
+            _clients[key] = FPLClient(base_url=key[0], store=store)
+        return _clients[key]
@@ -0,0 +1,505 @@
+# storage.py
+# Columnar (Parquet) storage for the collected datasets, with explicit schemas, column-selective
+# readers and CSV export
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+GAMEWEEK_DIR = REPO_ROOT / 'data' / 'gameweek_data'
+
+# Partitioned dataset written by the gameweek collectors: gameweeks/gameweek=N/part-0.parquet
+DEFAULT_GAMEWEEK_ROOT = GAMEWEEK_DIR / 'gameweeks'
+DEFAULT_HISTORY_PATH = GAMEWEEK_DIR / 'gameweek_data.parquet'
+DEFAULT_TIMETABLE_PATH = REPO_ROOT / 'data' / 'timetable_data' / 'timetable.parquet'
+
+# ============================================================================
+# SCHEMAS
+# ============================================================================
+
+_STAT_FIELDS = [
+    ('minutes', pa.int32()),
+    ('goals_scored', pa.int32()),
+    ('assists', pa.int32()),
+    ('clean_sheets', pa.int32()),
+    ('goals_conceded', pa.int32()),
+    ('own_goals', pa.int32()),
+    ('penalties_saved', pa.int32()),
+    ('penalties_missed', pa.int32()),
+    ('yellow_cards', pa.int32()),
+    ('red_cards', pa.int32()),
+    ('saves', pa.int32()),
+    ('bonus', pa.int32()),
+    ('bps', pa.int32()),
+    ('influence', pa.float64()),
+    ('creativity', pa.float64()),
+    ('threat', pa.float64()),
+    ('ict_index', pa.float64()),
+]
+
+_EXPECTED_FIELDS = [
+    ('expected_goals', pa.float64()),
+    ('expected_assists', pa.float64()),
+    ('expected_goal_involvements', pa.float64()),
+    ('expected_goals_conceded', pa.float64()),
+]
+
+# gameweekN.csv rows from process_gameweek_data (the gameweek is the partition key)
+GAMEWEEK_SCHEMA = pa.schema([
+    ('player_id', pa.int32()),
+    ('player_name', pa.string()),
+    ('full_name', pa.string()),
+    ('team', pa.string()),
+    ('team_id', pa.int32()),
+    ('position', pa.string()),
+    ('position_id', pa.int32()),
+    ('now_cost', pa.float64()),
+    ('selected_by_percent', pa.float64()),
+    ('total_points', pa.int32()),
+    ('points_per_game', pa.float64()),
+    ('form', pa.float64()),
+    ('ep_next', pa.float64()),
+    ('ep_this', pa.float64()),
+    ('status', pa.string()),
+    ('chance_of_playing_next_round', pa.int32()),
+    ('chance_of_playing_this_round', pa.int32()),
+    ('news', pa.string()),
+    ('news_added', pa.timestamp('us', tz='UTC')),
+    *_STAT_FIELDS,
+    ('starts', pa.int32()),
+    *_EXPECTED_FIELDS,
+    *[(f"gw_{name}", field_type) for name, field_type in _STAT_FIELDS],
+    ('gw_total_points', pa.int32()),
+])
+
+GAMEWEEK_PARTITIONING = ds.partitioning(pa.schema([('gameweek', pa.int32())]), flavor='hive')
+
+# gameweek_data.csv rows from create_single_csv (one per player per fixture)
+HISTORY_SCHEMA = pa.schema([
+    ('player_id', pa.int32()),
+    ('player_name', pa.string()),
+    ('full_name', pa.string()),
+    ('team', pa.string()),
+    ('position', pa.string()),
+    ('gameweek', pa.int32()),
+    ('kickoff_time', pa.timestamp('us', tz='UTC')),
+    ('opponent_team', pa.string()),
+    ('was_home', pa.bool_()),
+    ('total_points', pa.int32()),
+    *_STAT_FIELDS,
+    ('value', pa.float64()),
+    ('transfers_balance', pa.int32()),
+    ('selected', pa.int32()),
+    ('transfers_in', pa.int32()),
+    ('transfers_out', pa.int32()),
+    *_EXPECTED_FIELDS,
+])
+
+# timetable.csv rows from timetable_data_collection (gameweek is null for postponed fixtures)
+TIMETABLE_SCHEMA = pa.schema([
+    ('fixture_id', pa.int32()),
+    ('gameweek', pa.int32()),
+    ('kickoff_time', pa.timestamp('us', tz='UTC')),
+    ('team_h', pa.string()),
+    ('team_h_id', pa.int32()),
+    ('team_a', pa.string()),
+    ('team_a_id', pa.int32()),
+    ('team_h_score', pa.int32()),
+    ('team_a_score', pa.int32()),
+    ('finished', pa.bool_()),
+    ('started', pa.bool_()),
+    ('team_h_difficulty', pa.int32()),
+    ('team_a_difficulty', pa.int32()),
+])
+
+# Player table columns the optimiser models read (see synthetic_instances.generate_instance)
+PLAYER_COLUMNS = [
+    'id', 'name', 'position', 'team', 'team_id', 'opponent', 'opponent_id', 'price', 'expected_points',
+    'status', 'minutes', 'selected_by_percent', 'form', 'team_fdr_5gw', 'gameweek',
+]
+
+# ============================================================================
+# WRITING
+# ============================================================================
+
+def to_arrow(df, schema):
+    """
+    Convert a DataFrame to an Arrow table with the given schema.
+
+    The API returns many numbers as strings ('5.5', '0.32'), so numeric columns are
+    parsed (unparseable values become null) before casting.
+
+    Args:
+        df: DataFrame with (at least) the schema's columns
+        schema: pyarrow schema
+
+    Returns:
+        pa.Table: Table with exactly the schema's columns, in order
+    """
+    columns = {}
+    for field in schema:
+        values = df[field.name] if field.name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            values = pd.to_numeric(values, errors='coerce')
+        elif pa.types.is_timestamp(field.type):
+            values = pd.to_datetime(values, errors='coerce', utc=True)
+        elif pa.types.is_boolean(field.type):
+            values = values.map(lambda value: value if pd.isna(value) or isinstance(value, bool)
+                                else str(value).strip().lower() == 'true').astype('boolean')
+        else:
+            values = values.astype(object).where(values.notna(), None)
+        columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+    return pa.table(columns, schema=schema)
+
+
+def write_table(df, path, schema):
+    """
+    Write a DataFrame to one Parquet file atomically.
+
+    Args:
+        df: DataFrame to write
+        path: Output .parquet path
+        schema: pyarrow schema
+
+    Returns:
+        Path: Written path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(to_arrow(df, schema), tmp_path, compression='zstd')
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file owner-only
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def write_gameweek(df, gameweek, root=DEFAULT_GAMEWEEK_ROOT):
+    """
+    Write (or replace) one gameweek's partition of the gameweek dataset.
+
+    Args:
+        df: process_gameweek_data output
+        gameweek: Gameweek number
+        root: Dataset directory
+
+    Returns:
+        Path: Written partition file
+    """
+    return write_table(df, Path(root) / f"gameweek={int(gameweek)}" / 'part-0.parquet', GAMEWEEK_SCHEMA)
+
+
+def csv_to_parquet(csv_path, parquet_path, schema):
+    """Convert a CSV written by a collector to Parquet with the given schema."""
+    return write_table(pd.read_csv(csv_path, dtype=str, keep_default_na=False, na_values=['']), parquet_path, schema)
+
+
+def gameweek_csvs_to_dataset(csv_dir=GAMEWEEK_DIR, root=DEFAULT_GAMEWEEK_ROOT):
+    """
+    Convert existing gameweekN.csv files into the partitioned dataset.
+
+    Returns:
+        list: Gameweeks converted
+    """
+    gameweeks = []
+    for csv_path in sorted(Path(csv_dir).glob('gameweek*.csv')):
+        suffix = csv_path.stem[len('gameweek'):]
+        if not suffix.isdigit():
+            continue
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False, na_values=[''])
+        write_gameweek(df, int(suffix), root)
+        gameweeks.append(int(suffix))
+    return sorted(gameweeks)
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def gameweek_dataset(root=DEFAULT_GAMEWEEK_ROOT, gameweeks=None):
+    """
+    pyarrow dataset over the gameweek partitions.
+
+    Args:
+        root: Dataset directory
+        gameweeks: Only open these partitions (default: every partition, in gameweek order)
+    """
+    if gameweeks is None:
+        gameweeks = sorted(int(path.name.split('=', 1)[1]) for path in Path(root).glob('gameweek=*'))
+    source = [str(Path(root) / f"gameweek={int(gameweek)}" / 'part-0.parquet') for gameweek in gameweeks]
+    source = [path for path in source if os.path.exists(path)]
+    return ds.dataset(source, format='parquet', schema=GAMEWEEK_SCHEMA.append(pa.field('gameweek', pa.int32())),
+                      partitioning=GAMEWEEK_PARTITIONING, partition_base_dir=str(root))
+
+
+def read_gameweeks(root=DEFAULT_GAMEWEEK_ROOT, columns=None, gameweeks=None):
+    """
+    Read the gameweek dataset, only loading the requested columns and partitions.
+
+    Args:
+        root: Dataset directory
+        columns: Columns to read (default: all, including 'gameweek')
+        gameweeks: Gameweeks to read (default: all)
+
+    Returns:
+        pd.DataFrame: One row per player per gameweek
+    """
+    return gameweek_dataset(root, gameweeks).to_table(columns=columns).to_pandas()
+
+
+def resolve_table_path(path):
+    """
+    Return path, or its .parquet/.csv sibling when path itself does not exist.
+
+    Lets callers name either format while collectors move from CSV to Parquet.
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    for suffix in ('.parquet', '.csv'):
+        sibling = path.with_suffix(suffix)
+        if sibling.exists():
+            return sibling
+    return path
+
+
+def available_columns(path):
+    """Column names of a Parquet or CSV table without loading its rows."""
+    path = resolve_table_path(path)
+    if path.suffix == '.parquet':
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_table(path, columns=None):
+    """
+    Read a Parquet or CSV table, loading only the requested columns.
+
+    Args:
+        path: .parquet or .csv path (the other format is used if only that exists)
+        columns: Columns to read; ones missing from the file are skipped (default: all)
+
+    Returns:
+        pd.DataFrame: Table with the requested columns, in the requested order
+    """
+    path = resolve_table_path(path)
+    if path.suffix == '.parquet':
+        if columns is not None:
+            names = set(pq.read_schema(path).names)
+            columns = [column for column in columns if column in names]
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    if columns is None:
+        return pd.read_csv(path)
+    wanted = set(columns)
+    df = pd.read_csv(path, usecols=lambda column: column in wanted)
+    return df[[column for column in columns if column in df.columns]]
+
+
+def read_player_data(path, columns=PLAYER_COLUMNS):
+    """
+    Read the optimiser's player table (Parquet or CSV), loading only the columns the models use.
+
+    Args:
+        path: Player table path
+        columns: Columns to read (None for all)
+
+    Returns:
+        pd.DataFrame: Player data with a RangeIndex
+    """
+    return read_table(path, columns=columns)
+
+# ============================================================================
+# CSV EXPORT
+# ============================================================================
+
+def export_gameweeks_csv(root=DEFAULT_GAMEWEEK_ROOT, output_dir=GAMEWEEK_DIR, gameweeks=None):
+    """
+    Write gameweekN.csv files from the gameweek dataset.
+
+    Returns:
+        list: Written CSV paths
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    df = read_gameweeks(root, gameweeks=gameweeks)
+
+    paths = []
+    for gameweek, rows in df.groupby('gameweek', sort=True):
+        path = output_dir / f"gameweek{gameweek}.csv"
+        rows.drop(columns='gameweek').to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def directory_bytes(path):
+    """Total size of a file or of every file under a directory."""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(child.stat().st_size for child in path.rglob('*') if child.is_file())
+
+
+def time_call(function, repeats):
+    """Best wall time of a call over several repeats, and its last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_gameweeks(csv_dir=GAMEWEEK_DIR, root=DEFAULT_GAMEWEEK_ROOT, columns=None, repeats=3):
+    """
+    Compare the gameweekN.csv files against the partitioned dataset.
+
+    Args:
+        csv_dir: Directory with gameweekN.csv files
+        root: Gameweek dataset directory (converted from the CSVs if empty)
+        columns: Column subset to time (default: player_id, team_id, now_cost, form, gw_total_points)
+        repeats: Timing repeats (best is reported)
+
+    Returns:
+        dict: Sizes in bytes, and seconds to load everything, a column subset and one gameweek
+    """
+    csv_paths = sorted(path for path in Path(csv_dir).glob('gameweek*.csv') if path.stem[len('gameweek'):].isdigit())
+    if not csv_paths:
+        raise FileNotFoundError(f"No gameweekN.csv files in {csv_dir}")
+    if not Path(root).exists() or not any(Path(root).rglob('*.parquet')):
+        gameweek_csvs_to_dataset(csv_dir, root)
+
+    columns = columns or ['player_id', 'team_id', 'now_cost', 'form', 'gw_total_points']
+    wanted = set(columns)
+    last_gameweek = max(int(path.stem[len('gameweek'):]) for path in csv_paths)
+
+    def read_csvs(usecols=None):
+        return pd.concat([pd.read_csv(path, usecols=usecols) for path in csv_paths], ignore_index=True)
+
+    timings = {
+        'csv_all': time_call(read_csvs, repeats)[0],
+        'parquet_all': time_call(lambda: read_gameweeks(root), repeats)[0],
+        'csv_columns': time_call(lambda: read_csvs(lambda column: column in wanted), repeats)[0],
+        'parquet_columns': time_call(lambda: read_gameweeks(root, columns=columns), repeats)[0],
+        'csv_one_gameweek': time_call(lambda: pd.read_csv(Path(csv_dir) / f"gameweek{last_gameweek}.csv"), repeats)[0],
+        'parquet_one_gameweek': time_call(lambda: read_gameweeks(root, gameweeks=[last_gameweek]), repeats)[0],
+    }
+    return {
+        'files': len(csv_paths),
+        'rows': len(read_gameweeks(root, columns=['player_id'])),
+        'columns': columns,
+        'csv_bytes': sum(path.stat().st_size for path in csv_paths),
+        'parquet_bytes': directory_bytes(root),
+        'seconds': timings,
+    }
+
+
+def benchmark_table(csv_path, schema, columns, repeats=3):
+    """
+    Compare one collector CSV against its Parquet conversion.
+
+    Returns:
+        dict: Sizes in bytes and seconds to load everything and a column subset
+    """
+    csv_path = Path(csv_path)
+    parquet_path = csv_path.with_suffix('.parquet')
+    if not parquet_path.exists():
+        csv_to_parquet(csv_path, parquet_path, schema)
+
+    timings = {
+        'csv_all': time_call(lambda: read_table(csv_path), repeats)[0],
+        'parquet_all': time_call(lambda: read_table(parquet_path), repeats)[0],
+        'csv_columns': time_call(lambda: read_table(csv_path, columns), repeats)[0],
+        'parquet_columns': time_call(lambda: read_table(parquet_path, columns), repeats)[0],
+    }
+    return {
+        'rows': len(read_table(parquet_path, columns[:1])),
+        'columns': columns,
+        'csv_bytes': csv_path.stat().st_size,
+        'parquet_bytes': parquet_path.stat().st_size,
+        'seconds': timings,
+    }
+
+
+def print_storage_benchmark(label, result):
+    """Print one benchmark result."""
+    print(f"\n{label}: {result['rows']:,} rows")
+    print(f"  On disk: CSV {result['csv_bytes'] / 1024 ** 2:.2f} MB, Parquet {result['parquet_bytes'] / 1024 ** 2:.2f} MB "
+          f"({result['csv_bytes'] / result['parquet_bytes']:.1f}x smaller)")
+    seconds = result['seconds']
+    for load in ('all', 'columns', 'one_gameweek'):
+        if f"csv_{load}" not in seconds:
+            continue
+        description = {'all': "all columns", 'columns': f"{len(result['columns'])} columns",
+                       'one_gameweek': "one gameweek"}[load]
+        csv_seconds, parquet_seconds = seconds[f"csv_{load}"], seconds[f"parquet_{load}"]
+        print(f"  Load {description:<13} CSV {csv_seconds * 1000:8.1f} ms, Parquet {parquet_seconds * 1000:8.1f} ms "
+              f"({csv_seconds / parquet_seconds:.1f}x)")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar storage for the collected FPL datasets")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help="Convert existing collector CSVs to Parquet")
+    convert_parser.add_argument('--csv-dir', default=str(GAMEWEEK_DIR))
+    convert_parser.add_argument('--root', default=str(DEFAULT_GAMEWEEK_ROOT))
+
+    export_parser = subparsers.add_parser('export', help="Write gameweekN.csv files from the gameweek dataset")
+    export_parser.add_argument('--root', default=str(DEFAULT_GAMEWEEK_ROOT))
+    export_parser.add_argument('--output-dir', default=str(GAMEWEEK_DIR))
+    export_parser.add_argument('--gameweeks', type=int, nargs='+', default=None)
+
+    benchmark_parser = subparsers.add_parser('benchmark', help="Load time and size of CSV vs Parquet")
+    benchmark_parser.add_argument('--csv-dir', default=str(GAMEWEEK_DIR))
+    benchmark_parser.add_argument('--root', default=None, help="Gameweek dataset (default: a temporary conversion)")
+    benchmark_parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        gameweeks = gameweek_csvs_to_dataset(args.csv_dir, args.root)
+        print(f"Converted {len(gameweeks)} gameweeks to {args.root}")
+        for csv_path, parquet_path, schema in (
+            (Path(args.csv_dir) / 'gameweek_data.csv', DEFAULT_HISTORY_PATH, HISTORY_SCHEMA),
+            (DEFAULT_TIMETABLE_PATH.with_suffix('.csv'), DEFAULT_TIMETABLE_PATH, TIMETABLE_SCHEMA),
+        ):
+            if csv_path.exists():
+                csv_to_parquet(csv_path, parquet_path, schema)
+                print(f"Converted {csv_path.name} to {parquet_path}")
+    elif args.command == 'export':
+        paths = export_gameweeks_csv(args.root, args.output_dir, args.gameweeks)
+        print(f"Wrote {len(paths)} CSV files to {args.output_dir}")
+    elif args.command == 'benchmark':
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = args.root or os.path.join(tmp_dir, 'gameweeks')
+            print_storage_benchmark("Gameweek files", benchmark_gameweeks(args.csv_dir, root, repeats=args.repeats))
+        history_csv = Path(args.csv_dir) / 'gameweek_data.csv'
+        if history_csv.exists():
+            print_storage_benchmark("Player history", benchmark_table(
+                history_csv, HISTORY_SCHEMA, ['player_id', 'gameweek', 'total_points', 'minutes'], args.repeats))
+        timetable_csv = DEFAULT_TIMETABLE_PATH.with_suffix('.csv')
+        if timetable_csv.exists():
+            print_storage_benchmark("Timetable", benchmark_table(
+                timetable_csv, TIMETABLE_SCHEMA, ['gameweek', 'team_h_id', 'team_a_id', 'team_h_difficulty',
+                                                  'team_a_difficulty'], args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,565 @@
+# batch_optimiser.py
+# Optimise transfers for many managers at once, sharing one copy of the player data between workers
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import requests
+from pulp import LpStatus, LpStatusOptimal, value
+from model_builder import build_optimisation_problem
+from compact_formulation import build_compact_problem, process_compact_results
+from sparse_backend import SparseSquadModel
+from candidate_pool import prune_candidate_pool
+from warm_start import set_current_squad_warm_start
+from solver_config import SolverConfig, solve_problem, add_solver_arguments, solver_config_from_args
+from squad_creator import process_optimization_results
+from opposing_teams import OPPOSING_FORMULATIONS
+from fdr import CSVFDRCalculator
+from team_class import Team
+
+from fpl_data.client import get_client
+from fpl_data.storage import read_player_data
+
+BATCH_BACKENDS = ['pulp', 'compact', 'sparse']
+
+# Per-worker state, set once by init_batch_worker
+_worker_state = {}
+
+# ============================================================================
+# SHARED PLAYER DATA
+# ============================================================================
+
+class SharedPlayerData:
+    """
+    Copy of a player DataFrame in shared memory blocks, one per column.
+
+    Numeric columns are stored as they are; text and other object columns are stored as
+    int32 codes with a small list of distinct values. Worker processes rebuild the
+    DataFrame from read-only views with attach_player_data, so the player arrays exist
+    once however many workers there are. The owner must call close() (or use the object
+    as a context manager) to free the blocks.
+    """
+
+    def __init__(self, df_players):
+        """
+        Args:
+            df_players: DataFrame with player data (the index is not kept)
+        """
+        self.blocks = []
+        columns = []
+        for name in df_players.columns:
+            series = df_players[name]
+            if series.dtype.kind in 'biuf':
+                array = series.to_numpy()
+                categories = None
+            else:
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                array = codes.astype(np.int32)
+                categories = uniques.tolist()
+
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks.append(block)
+            columns.append({
+                'name': name,
+                'block': block.name,
+                'dtype': array.dtype.str,
+                'categories': categories,
+            })
+
+        self.spec = {'rows': len(df_players), 'columns': columns}
+
+    @property
+    def nbytes(self):
+        """Total size of the shared blocks."""
+        return sum(block.size for block in self.blocks)
+
+    def close(self):
+        """Release and remove the shared memory blocks."""
+        for block in self.blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def attach_player_data(spec):
+    """
+    Rebuild a player DataFrame from SharedPlayerData.spec in another process.
+
+    Numeric columns are read-only views of the shared blocks; coded columns are decoded
+    into ordinary object columns. Each column is its own Series over its array, so pandas
+    does not consolidate (copy) same-dtype columns into one block.
+
+    Returns:
+        tuple: (DataFrame, list of attached SharedMemory blocks, which must stay referenced
+        while the DataFrame is in use)
+
+    Raises:
+        RuntimeError: If a numeric column was copied out of shared memory
+    """
+    rows = spec['rows']
+    blocks = []
+    shared_arrays = {}
+    data = {}
+    for column in spec['columns']:
+        block = shared_memory.SharedMemory(name=column['block'])
+        blocks.append(block)
+        array = np.ndarray((rows,), dtype=np.dtype(column['dtype']), buffer=block.buf)
+        array.flags.writeable = False
+
+        if column['categories'] is None:
+            shared_arrays[column['name']] = array
+            data[column['name']] = pd.Series(array, name=column['name'], copy=False)
+        else:
+            categories = np.array(column['categories'] + [None], dtype=object)
+            data[column['name']] = pd.Series(categories[array], name=column['name'])  # code -1 picks the trailing None
+
+    df_players = pd.DataFrame(data, copy=False)
+    for name, array in shared_arrays.items():
+        if not np.shares_memory(df_players[name].to_numpy(), array):
+            raise RuntimeError(f"Player column '{name}' was copied out of shared memory")
+    return df_players, blocks
+
+# ============================================================================
+# SQUAD SOURCES
+# ============================================================================
+
+def read_squad_file(path):
+    """
+    Read a saved squad.
+
+    JSON files hold starting_ids, bench_ids and optionally team_id, budget and
+    free_transfers. Any other file is read like my_team_override.txt: 15 player IDs, one
+    per line, the first 11 starting, with blank lines and '#' comments ignored.
+
+    Returns:
+        dict: team_id, starting_ids, bench_ids, budget and free_transfers (None if not given)
+    """
+    with open(path, 'r') as f:
+        if path.endswith('.json'):
+            data = json.load(f)
+            starting_ids = [int(pid) for pid in data['starting_ids']]
+            bench_ids = [int(pid) for pid in data['bench_ids']]
+        else:
+            lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+            player_ids = [int(pid) for pid in lines]
+            if len(player_ids) != 15:
+                raise ValueError(f"{path}: expected 15 player IDs, found {len(player_ids)}")
+            starting_ids, bench_ids = player_ids[:11], player_ids[11:]
+            data = {}
+
+    return {
+        'team_id': data.get('team_id', 0),
+        'starting_ids': starting_ids,
+        'bench_ids': bench_ids,
+        'budget': data.get('budget'),
+        'free_transfers': data.get('free_transfers'),
+    }
+
+def build_sources(team_ids=(), squad_files=()):
+    """
+    List the managers to optimise as source dicts.
+
+    Args:
+        team_ids: FPL team IDs, fetched from the API in the workers
+        squad_files: Paths of saved squad files (see read_squad_file)
+
+    Returns:
+        list: Source dicts with a unique 'key' ('team:<id>' or 'file:<path>')
+    """
+    sources = [{'key': f"team:{int(team_id)}", 'team_id': int(team_id)} for team_id in team_ids]
+    sources += [{'key': f"file:{path}", 'path': path} for path in squad_files]
+    return sources
+
+def read_team_id_file(path):
+    """Read FPL team IDs from a text file, one per line ('#' comments ignored)."""
+    with open(path, 'r') as f:
+        return [int(line.split('#')[0]) for line in f if line.split('#')[0].strip()]
+
+def fetch_current_gameweek():
+    """Current (or next) gameweek from the FPL API, chosen the same way as Team."""
+    bootstrap = get_client().get_json('bootstrap-static/')
+    return next((e['id'] for e in bootstrap['events'] if e['is_current']),
+                next((e['id'] for e in bootstrap['events'] if e['is_next']), 1))
+
+def fetch_squad(team_id, gameweek):
+    """
+    Fetch a manager's picks and bank for one gameweek.
+
+    Returns:
+        dict: Same fields as read_squad_file (free transfers are not in the picks data)
+    """
+    try:
+        picks_data = get_client().get_json(f'entry/{team_id}/event/{gameweek}/picks/')
+    except requests.HTTPError as e:
+        raise ValueError(f"Could not fetch team {team_id} (HTTP {e.response.status_code})")
+
+    picks = sorted(picks_data['picks'], key=lambda pick: pick['position'])
+    return {
+        'team_id': team_id,
+        'starting_ids': [pick['element'] for pick in picks if pick['position'] <= 11],
+        'bench_ids': [pick['element'] for pick in picks if pick['position'] > 11],
+        'budget': picks_data.get('entry_history', {}).get('bank', 0) / 10,
+        'free_transfers': None,
+    }
+
+def load_team(source, df_players, picks_gameweek, default_budget, default_free_transfers):
+    """Build the Team for a source from the API or a squad file, against the shared player data."""
+    if 'path' in source:
+        squad = read_squad_file(source['path'])
+    else:
+        squad = fetch_squad(source['team_id'], picks_gameweek)
+
+    return Team.from_player_data(
+        df_players, squad['starting_ids'], squad['bench_ids'],
+        team_id=squad['team_id'],
+        budget=squad['budget'] if squad['budget'] is not None else default_budget,
+        free_transfers=squad['free_transfers'] if squad['free_transfers'] is not None else default_free_transfers
+    )
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def init_batch_worker(spec, settings):
+    """Attach to the shared player data once per worker and build the FDR ratings from it."""
+    df_players, blocks = attach_player_data(spec)
+    _worker_state['df_players'] = df_players
+    _worker_state['blocks'] = blocks
+    _worker_state['settings'] = settings
+    _worker_state['fdr_calculator'] = CSVFDRCalculator(df_players=df_players) if settings['use_fdr'] else None
+
+def solve_squad(df_players, my_team, fdr_calculator, settings):
+    """
+    Optimise one manager's transfers with the configured backend.
+
+    Returns:
+        tuple: (squad output dict, status code, objective)
+    """
+    model_settings = dict(
+        penalty_points=settings['penalty_points'],
+        base_opposing_penalty=settings['base_opposing_penalty'],
+        fdr_calculator=fdr_calculator,
+        fdr_penalty_weight=settings['fdr_penalty_weight'],
+        opposing_formulation=settings['opposing_formulation'],
+    )
+    solver_config = settings['solver_config']
+    backend = settings['backend']
+
+    if backend == 'sparse':
+        model = SparseSquadModel(df_players, my_team, **model_settings)
+        model.solve(solver_config)
+        if model.status != LpStatusOptimal:
+            return None, model.status, None
+        return model.process_results(), model.status, model.objective
+
+    if backend == 'compact':
+        prob, vars = build_compact_problem(df_players, my_team, **model_settings)
+        solve_problem(prob, solver_config)
+    else:
+        prob, vars = build_optimisation_problem(df_players, my_team, **model_settings)
+        warm_start = (settings['use_warm_start'] and solver_config.solver == 'cbc'
+                      and set_current_squad_warm_start(prob, vars, df_players, my_team))
+        solve_problem(prob, solver_config, warm_start=warm_start)
+
+    if prob.status != LpStatusOptimal:
+        return None, prob.status, None
+    if backend == 'compact':
+        squad = process_compact_results(vars, df_players, my_team, prob)
+    else:
+        squad = process_optimization_results(vars, df_players, prob)
+    return squad, prob.status, value(prob.objective)
+
+def summarise_squad(squad, df_players):
+    """
+    Reduce a squad output dict to a JSON-serialisable result record.
+
+    Returns:
+        dict: Transfers in/out, captaincy, final XI and bench, paid transfers, cost and formation
+    """
+    decision_results = squad['decision_results']
+
+    def selected(var_types):
+        return [idx for var_type in var_types for idx in decision_results.get(var_type, [])]
+
+    def player_ids(indices):
+        return [int(df_players.loc[idx, 'id']) for idx in indices]
+
+    def player_names(indices):
+        return [str(df_players.loc[idx, 'name']) for idx in indices]
+
+    transfers_in = selected(['in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid'])
+    transfers_out = selected(['out_starting_free', 'out_starting_paid', 'out_bench_free', 'out_bench_paid'])
+
+    return {
+        'transfers_in': player_ids(transfers_in),
+        'transfers_in_names': player_names(transfers_in),
+        'transfers_out': player_ids(transfers_out),
+        'transfers_out_names': player_names(transfers_out),
+        'paid_transfers': len(selected(['in_to_starting_paid', 'in_to_bench_paid'])),
+        'captain': str(df_players.loc[squad['captain_idx'], 'name']) if squad['captain_idx'] is not None else None,
+        'vice_captain': str(df_players.loc[squad['vice_captain_idx'], 'name']) if squad['vice_captain_idx'] is not None else None,
+        'starting_ids': [int(pid) for pid in squad['starting_df']['id']],
+        'bench_ids': [int(pid) for pid in squad['bench_df']['id']],
+        'total_cost': float(squad['total_cost']),
+        'formation': squad['formation'],
+    }
+
+def optimise_source(source):
+    """
+    Load, optimise and summarise one manager in a worker.
+
+    Failures are returned as records with status 'Error' so one bad team ID or squad
+    file does not stop the batch.
+
+    Returns:
+        dict: Result record for the output file
+    """
+    settings = _worker_state['settings']
+    df_players = _worker_state['df_players']
+    fdr_calculator = _worker_state['fdr_calculator']
+    record = {'source': source['key'], 'team_id': source.get('team_id'), 'worker': os.getpid()}
+
+    start = time.perf_counter()
+    try:
+        my_team = load_team(source, df_players, settings['picks_gameweek'],
+                            settings['budget'], settings['free_transfers'])
+        record['team_id'] = my_team.team_id
+
+        if settings['prune_pool']:
+            df_players, _ = prune_candidate_pool(df_players, my_team, fdr_calculator, settings['fdr_penalty_weight'],
+                                                 base_opposing_penalty=settings['base_opposing_penalty'])
+
+        squad, status, objective = solve_squad(df_players, my_team, fdr_calculator, settings)
+        record['status'] = LpStatus[status]
+        record['objective'] = objective
+        if squad is not None:
+            record.update(summarise_squad(squad, df_players))
+    except Exception as e:
+        record['status'] = 'Error'
+        record['error'] = f"{type(e).__name__}: {e}"
+
+    record['seconds'] = time.perf_counter() - start
+    record['completed_at'] = time.time()
+    return record
+
+# ============================================================================
+# RESULTS FILE
+# ============================================================================
+
+def append_result(f, record):
+    """Append one result as a JSON line and flush it to disk, so completed work survives a crash."""
+    f.write(json.dumps(record, default=lambda o: o.item() if isinstance(o, np.generic) else str(o)) + '\n')
+    f.flush()
+    os.fsync(f.fileno())
+
+def load_batch_results(path):
+    """
+    Read a batch results file, keeping the latest record for each source.
+
+    A truncated last line (from a crash mid-write) is ignored.
+
+    Returns:
+        dict: Source key to result record
+    """
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            results[record['source']] = record
+    return results
+
+def results_to_dataframe(results):
+    """Flatten result records into a table with one row per manager."""
+    df = pd.DataFrame(list(results.values()) if isinstance(results, dict) else results)
+    for column in ['transfers_in_names', 'transfers_out_names']:
+        if column in df.columns:
+            df[column] = df[column].apply(lambda names: ', '.join(names) if isinstance(names, list) else '')
+    return df
+
+# ============================================================================
+# BATCH
+# ============================================================================
+
+def run_batch(df_players, sources, output_path, workers=None, backend='pulp', penalty_points=4,
+              base_opposing_penalty=1, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+              use_fdr=True, prune_pool=False, picks_gameweek=None, budget=0.0, free_transfers=1,
+              solver_config=None, use_warm_start=False, resume=True):
+    """
+    Optimise every source in a process pool, appending results to output_path as they finish.
+
+    The player data is loaded once by the caller and placed in shared memory; each worker
+    attaches to it and builds its FDR ratings once. With resume, sources that already
+    have a solved record in output_path are skipped, and failed ones are retried.
+
+    Args:
+        df_players: DataFrame with player data
+        sources: Source dicts from build_sources
+        output_path: JSONL results file (appended to)
+        workers: Number of worker processes (default: CPU count)
+        backend: 'pulp' (13-variable model), 'compact' or 'sparse'
+        penalty_points: Points penalty per paid transfer
+        base_opposing_penalty: Opposing teams penalty
+        fdr_penalty_weight: Weight for FDR penalties
+        opposing_formulation: Opposing teams penalty formulation
+        use_fdr: Whether to include FDR penalties (ratings come from the player data)
+        prune_pool: Whether to prune the candidate pool per manager
+        picks_gameweek: Gameweek to fetch picks for (needed for team ID sources)
+        budget: Bank balance when a source does not give one
+        free_transfers: Free transfers when a source does not give them
+        solver_config: SolverConfig instance (default: single-threaded CBC)
+        use_warm_start: Seed each 'pulp' backend CBC solve with the current squad (off by
+            default: the setup costs about what it saves, see benchmarks.py warmstart)
+        resume: Whether to skip sources already solved in output_path
+
+    Returns:
+        dict: Source key to result record, including earlier results when resuming
+    """
+    if backend not in BATCH_BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BATCH_BACKENDS}")
+
+    workers = workers or os.cpu_count()
+    settings = {
+        'backend': backend,
+        'penalty_points': penalty_points,
+        'base_opposing_penalty': base_opposing_penalty,
+        'fdr_penalty_weight': fdr_penalty_weight,
+        'opposing_formulation': opposing_formulation,
+        'use_fdr': use_fdr,
+        'prune_pool': prune_pool,
+        'picks_gameweek': picks_gameweek,
+        'budget': budget,
+        'free_transfers': free_transfers,
+        'solver_config': solver_config or SolverConfig(threads=1),
+        'use_warm_start': use_warm_start,
+    }
+
+    results = load_batch_results(output_path) if resume else {}
+    done = {key for key, record in results.items() if record.get('status') == 'Optimal'}
+    pending = [source for source in sources if source['key'] not in done]
+    if done:
+        print(f"Resuming: {len(sources) - len(pending)} of {len(sources)} managers already solved")
+    if not pending:
+        return results
+
+    start = time.perf_counter()
+    with SharedPlayerData(df_players.reset_index(drop=True)) as shared, \
+            open(output_path, 'a' if resume else 'w') as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                initargs=(shared.spec, settings)) as executor:
+        print(f"Optimising {len(pending)} managers on {workers} workers "
+              f"({len(df_players)} players, {shared.nbytes / 1024:.0f} KB shared)")
+
+        futures = [executor.submit(optimise_source, source) for source in pending]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+            append_result(f, record)
+            results[record['source']] = record
+
+            outcome = (f"{record['objective']:.2f}, {record['paid_transfers']} paid"
+                       if record.get('objective') is not None else record.get('error', record['status']))
+            print(f"[{completed}/{len(pending)}] {record['source']}: {record['status']} ({outcome}) "
+                  f"in {record['seconds']:.1f}s")
+
+    wall_seconds = time.perf_counter() - start
+    total_solve = sum(results[source['key']]['seconds'] for source in pending)
+    print(f"Batch finished in {wall_seconds:.1f}s wall-clock (sum of per-manager times {total_solve:.1f}s)")
+    return results
+
+def print_batch_summary(results):
+    """Print one line per manager and a count of outcomes."""
+    df = results_to_dataframe(results)
+    columns = [c for c in ['source', 'status', 'objective', 'paid_transfers', 'transfers_in_names',
+                           'transfers_out_names', 'captain', 'seconds'] if c in df.columns]
+    print(df[columns].to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    print(f"\n{df['status'].value_counts().to_dict()}")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimise transfers for many managers with shared player data")
+    parser.add_argument('--csv', default='data/fpl_players_gw_9.csv', help="Gameweek player CSV")
+    parser.add_argument('--team-ids', type=int, nargs='+', default=[], help="FPL team IDs to fetch")
+    parser.add_argument('--team-id-file', default=None, help="Text file of FPL team IDs, one per line")
+    parser.add_argument('--squad-files', nargs='+', default=[],
+                        help="Saved squads (.json, or 15 IDs per line like my_team_override.txt)")
+    parser.add_argument('--picks-gameweek', type=int, default=None,
+                        help="Gameweek to fetch team picks for (default: current gameweek from the API)")
+    parser.add_argument('--budget', type=float, default=0.0, help="Bank balance for squad files without one")
+    parser.add_argument('--free-transfers', type=int, default=1, help="Free transfers when not given by the source")
+    parser.add_argument('--backend', choices=BATCH_BACKENDS, default='pulp')
+    parser.add_argument('--penalty-points', type=float, default=4)
+    parser.add_argument('--base-opposing-penalty', type=float, default=1)
+    parser.add_argument('--fdr-penalty-weight', type=float, default=0.5)
+    parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    parser.add_argument('--no-fdr', action='store_true', help="Leave FDR penalties out of the objective")
+    parser.add_argument('--prune', action='store_true', help="Prune the candidate pool per manager")
+    parser.add_argument('--warm-start', action='store_true', help="Seed each CBC solve with the current squad")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', default='batch_results.jsonl', help="JSONL file results are appended to")
+    parser.add_argument('--csv-output', default=None, help="Also write the results table to this CSV")
+    parser.add_argument('--restart', action='store_true', help="Ignore earlier results in --output")
+    add_solver_arguments(parser)
+    args = parser.parse_args()
+
+    team_ids = list(args.team_ids)
+    if args.team_id_file:
+        team_ids += read_team_id_file(args.team_id_file)
+    sources = build_sources(team_ids, args.squad_files)
+    if not sources:
+        parser.error("give at least one of --team-ids, --team-id-file or --squad-files")
+
+    picks_gameweek = args.picks_gameweek
+    if team_ids and picks_gameweek is None:
+        picks_gameweek = fetch_current_gameweek()
+
+    df_players = read_player_data(args.csv)
+
+    results = run_batch(
+        df_players, sources, args.output,
+        workers=args.workers,
+        backend=args.backend,
+        penalty_points=args.penalty_points,
+        base_opposing_penalty=args.base_opposing_penalty,
+        fdr_penalty_weight=args.fdr_penalty_weight,
+        opposing_formulation=args.opposing_formulation,
+        use_fdr=not args.no_fdr,
+        prune_pool=args.prune,
+        picks_gameweek=picks_gameweek,
+        budget=args.budget,
+        free_transfers=args.free_transfers,
+        solver_config=solver_config_from_args(args, threads=args.threads or 1),
+        use_warm_start=args.warm_start,
+        resume=not args.restart
+    )
+
+    results = {source['key']: results[source['key']] for source in sources if source['key'] in results}
+    print_batch_summary(results)
+    if args.csv_output:
+        results_to_dataframe(results).to_csv(args.csv_output, index=False)
+        print(f"Results table written to {args.csv_output}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1032 @@
+# benchmarks.py
+# Timing comparisons for building and solving the squad selection model
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from pulp import LpProblem, LpMaximize, LpStatusOptimal, PULP_CBC_CMD, lpSum, value
+from decision_variables import create_decision_variables
+from objective_function import add_objective_function
+from model_builder import build_optimisation_problem
+from opposing_teams import OPPOSING_FORMULATIONS
+from candidate_pool import prune_candidate_pool, print_pool_report
+from warm_start import set_current_squad_warm_start
+from persistent_model import PersistentSquadModel
+from compact_formulation import build_compact_problem, process_compact_results
+from sparse_backend import SparseSquadModel
+from squad_creator import process_optimization_results
+from solver_config import add_solver_arguments, solver_config_from_args, solve_problem
+from instrumentation import RunProfiler
+from multi_gameweek_planner import plan_transfers
+from top_k_plans import find_top_plans, add_no_good_cut
+from stochastic_optimiser import StochasticSquadModel, generate_scenarios, summarise_scores
+from synthetic_instances import BENCHMARK_POOL_SIZES, generate_instance, generate_timetable
+from fdr import CSVFDRCalculator
+from team_class import Team
+
+from fpl_data.storage import read_player_data
+
+DEFAULT_CSV = 'data/fpl_players_gw_9.csv'
+DEFAULT_TEAM_ID = 2562804
+DEFAULT_RESULTS_DIR = 'benchmark_results'
+
+# Model variants timed by the benchmark suite (keyword arguments for build_optimisation_problem)
+SUITE_CONFIGS = {
+    'no_opposing': {'opposing_formulation': 'fixture', 'base_opposing_penalty': 0},
+    'pairwise': {'opposing_formulation': 'pairwise'},
+    'fixture': {'opposing_formulation': 'fixture'},
+    'fixture_bench': {'opposing_formulation': 'fixture', 'bench_criteria': {}},
+}
+
+# Planning horizons (gameweeks) timed with the rolling-horizon planner
+SUITE_HORIZONS = [1, 2, 4, 8]
+
+# ============================================================================
+# OBJECTIVE BUILDER
+# ============================================================================
+
+def build_reference_objective(df_players, vars, penalty_points, fdr_calculator=None, fdr_penalty_weight=0.5):
+    """
+    Build the objective with per-row df_players.loc access, as the builder did before vectorisation.
+
+    Kept only as the baseline for compare_objective_builders (opposing-team terms excluded).
+
+    Returns:
+        LpAffineExpression: Objective expression
+    """
+    regular_points = lpSum([
+        df_players.loc[idx, 'expected_points'] * (
+            vars['stay_starting'].get(idx, 0) +
+            vars['bench_to_starting'].get(idx, 0) +
+            vars['in_to_starting_free'].get(idx, 0)
+        )
+        for idx in df_players.index
+    ])
+    paid_transfer_points = lpSum([
+        (df_players.loc[idx, 'expected_points'] - penalty_points) * vars['in_to_starting_paid'].get(idx, 0)
+        for idx in df_players.index
+    ])
+    captain_bonus = lpSum([
+        df_players.loc[idx, 'expected_points'] * vars['captain'].get(idx, 0)
+        for idx in df_players.index
+    ])
+    bench_transfer_penalty = lpSum([
+        penalty_points * vars['in_to_bench_paid'].get(idx, 0)
+        for idx in df_players.index
+    ])
+
+    fdr_terms = []
+    if fdr_calculator is not None and fdr_calculator.team_fdr_ratings:
+        for var_type in ['stay_starting', 'bench_to_starting', 'in_to_starting_free', 'in_to_starting_paid']:
+            for idx, var in vars[var_type].items():
+                team_id = df_players.loc[idx, 'team_id']
+                fdr_terms.append(fdr_calculator.get_fdr_penalty_points(team_id, fdr_penalty_weight) * var)
+
+    return regular_points + paid_transfer_points + captain_bonus - bench_transfer_penalty + lpSum(fdr_terms)
+
+def expression_coefficients(expression, digits=9):
+    """Map variable name to rounded non-zero coefficient, for comparing expressions."""
+    return {var.name: round(coef, digits) for var, coef in expression.items() if round(coef, digits) != 0}
+
+def compare_objective_builders(df_players, fdr_calculator=None, penalty_points=4, fdr_penalty_weight=0.5, repeats=3):
+    """
+    Time the vectorised objective builder against the per-row reference builder.
+
+    Opposing-team penalties are disabled for both builders so only the coefficient build is compared.
+
+    Args:
+        df_players: DataFrame with player data
+        fdr_calculator: FDR calculator instance (optional)
+        penalty_points: Points penalty for paid transfers
+        fdr_penalty_weight: Weight for FDR penalties
+        repeats: Number of timed builds per builder (best time is reported)
+
+    Returns:
+        dict: Best build time per builder, speedup and whether both objectives are identical
+    """
+    vars = create_decision_variables(df_players)
+
+    reference_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        reference = build_reference_objective(df_players, vars, penalty_points, fdr_calculator, fdr_penalty_weight)
+        reference_times.append(time.perf_counter() - start)
+
+    vectorised_times = []
+    for _ in range(repeats):
+        prob = LpProblem("Objective_Benchmark", LpMaximize)
+        start = time.perf_counter()
+        add_objective_function(
+            prob, df_players, vars,
+            penalty_points=penalty_points,
+            base_opposing_penalty=0,
+            fdr_calculator=fdr_calculator,
+            fdr_penalty_weight=fdr_penalty_weight
+        )
+        vectorised_times.append(time.perf_counter() - start)
+
+    return {
+        'players': len(df_players),
+        'reference_seconds': min(reference_times),
+        'vectorised_seconds': min(vectorised_times),
+        'speedup': min(reference_times) / max(min(vectorised_times), 1e-9),
+        'objectives_match': expression_coefficients(reference) == expression_coefficients(prob.objective),
+    }
+
+def print_objective_comparison(result):
+    """Print the result of compare_objective_builders."""
+    print(f"Objective build on {result['players']} players:")
+    print(f"  Per-row reference: {result['reference_seconds']:.3f}s")
+    print(f"  Vectorised:        {result['vectorised_seconds']:.3f}s")
+    print(f"  Speedup:           {result['speedup']:.1f}x")
+    print(f"  Objectives match:  {result['objectives_match']}")
+
+# ============================================================================
+# OPPOSING TEAMS FORMULATIONS
+# ============================================================================
+
+def compare_opposing_formulations(df_players, my_team, fdr_calculator=None, base_opposing_penalty=1,
+                                  formulations=OPPOSING_FORMULATIONS):
+    """
+    Build and solve the full model once per opposing teams formulation.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        fdr_calculator: FDR calculator instance (optional)
+        base_opposing_penalty: Base penalty for opposing teams
+        formulations: Formulation names to compare
+
+    Returns:
+        list: One dict per formulation with variable/constraint counts, build and solve times and objective
+    """
+    results = []
+    for formulation in formulations:
+        start = time.perf_counter()
+        prob, vars = build_optimisation_problem(
+            df_players, my_team,
+            base_opposing_penalty=base_opposing_penalty,
+            fdr_calculator=fdr_calculator,
+            opposing_formulation=formulation
+        )
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prob.solve(PULP_CBC_CMD(msg=False))
+        solve_seconds = time.perf_counter() - start
+
+        results.append({
+            'formulation': formulation,
+            'variables': prob.numVariables(),
+            'constraints': len(prob.constraints),
+            'build_seconds': build_seconds,
+            'solve_seconds': solve_seconds,
+            'objective': value(prob.objective),
+        })
+    return results
+
+def print_formulation_comparison(results):
+    """Print the result of compare_opposing_formulations."""
+    print(f"{'Formulation':<12} {'Variables':>10} {'Constraints':>12} {'Build (s)':>10} {'Solve (s)':>10} {'Objective':>10}")
+    for result in results:
+        print(f"{result['formulation']:<12} {result['variables']:>10} {result['constraints']:>12} "
+              f"{result['build_seconds']:>10.2f} {result['solve_seconds']:>10.2f} {result['objective']:>10.3f}")
+
+# ============================================================================
+# CANDIDATE POOL PRUNING
+# ============================================================================
+
+def solve_and_time(df_players, my_team, fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise'):
+    """
+    Build and solve the full model once.
+
+    Returns:
+        dict: Variable/constraint counts, build and solve times and objective value
+    """
+    start = time.perf_counter()
+    prob, vars = build_optimisation_problem(
+        df_players, my_team,
+        fdr_calculator=fdr_calculator,
+        fdr_penalty_weight=fdr_penalty_weight,
+        opposing_formulation=opposing_formulation
+    )
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prob.solve(PULP_CBC_CMD(msg=False))
+    solve_seconds = time.perf_counter() - start
+
+    return {
+        'players': len(df_players),
+        'variables': prob.numVariables(),
+        'constraints': len(prob.constraints),
+        'build_seconds': build_seconds,
+        'solve_seconds': solve_seconds,
+        'objective': value(prob.objective),
+    }
+
+def compare_pool_pruning(df_players, my_team, fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                         drop_zero_minutes=True):
+    """
+    Solve the full pool and the pruned pool and compare size, time and objective.
+
+    Returns:
+        dict: 'report' from prune_candidate_pool, 'full' and 'pruned' solve results, and 'objective_match'
+    """
+    start = time.perf_counter()
+    pruned_players, report = prune_candidate_pool(
+        df_players, my_team, fdr_calculator, fdr_penalty_weight, drop_zero_minutes=drop_zero_minutes
+    )
+    prune_seconds = time.perf_counter() - start
+
+    full = solve_and_time(df_players, my_team, fdr_calculator, fdr_penalty_weight, opposing_formulation)
+    pruned = solve_and_time(pruned_players, my_team, fdr_calculator, fdr_penalty_weight, opposing_formulation)
+    pruned['prune_seconds'] = prune_seconds
+
+    return {
+        'report': report,
+        'full': full,
+        'pruned': pruned,
+        'objective_match': abs(full['objective'] - pruned['objective']) < 1e-6,
+    }
+
+def print_pruning_comparison(result):
+    """Print the result of compare_pool_pruning."""
+    print_pool_report(result['report'])
+    print(f"{'Pool':<8} {'Players':>8} {'Variables':>10} {'Constraints':>12} {'Build (s)':>10} {'Solve (s)':>10} {'Objective':>10}")
+    for label in ('full', 'pruned'):
+        run = result[label]
+        print(f"{label:<8} {run['players']:>8} {run['variables']:>10} {run['constraints']:>12} "
+              f"{run['build_seconds']:>10.2f} {run['solve_seconds']:>10.2f} {run['objective']:>10.3f}")
+    print(f"Pruning took {result['pruned']['prune_seconds']:.3f}s, objective match: {result['objective_match']}")
+
+# ============================================================================
+# WARM START
+# ============================================================================
+
+def compare_warm_start(df_players, my_team, fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                       repeats=3):
+    """
+    Solve the model cold and warm-started from the current squad.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        fdr_calculator: FDR calculator instance (optional)
+        fdr_penalty_weight: Weight for FDR penalties
+        opposing_formulation: Opposing teams penalty formulation
+        repeats: Number of solves per mode, the fastest end to end (setup + solve) is reported
+
+    Returns:
+        dict: 'cold' and 'warm' results (setup, solve and total seconds, objective), 'warm_start_used' and
+              'objective_match'
+    """
+    results = {}
+    for label in ('cold', 'warm'):
+        best = None
+        for _ in range(repeats):
+            prob, vars = build_optimisation_problem(
+                df_players, my_team,
+                fdr_calculator=fdr_calculator,
+                fdr_penalty_weight=fdr_penalty_weight,
+                opposing_formulation=opposing_formulation
+            )
+
+            start = time.perf_counter()
+            warm_start = label == 'warm' and set_current_squad_warm_start(prob, vars, df_players, my_team)
+            setup_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            prob.solve(PULP_CBC_CMD(msg=False, warmStart=warm_start))
+            solve_seconds = time.perf_counter() - start
+
+            if best is None or setup_seconds + solve_seconds < best['total_seconds']:
+                best = {
+                    'setup_seconds': setup_seconds,
+                    'solve_seconds': solve_seconds,
+                    'total_seconds': setup_seconds + solve_seconds,
+                    'objective': value(prob.objective),
+                    'warm_start_used': warm_start,
+                }
+        results[label] = best
+
+    return {
+        'cold': results['cold'],
+        'warm': results['warm'],
+        'warm_start_used': results['warm']['warm_start_used'],
+        'objective_match': abs(results['cold']['objective'] - results['warm']['objective']) < 1e-6,
+    }
+
+def print_warm_start_comparison(result):
+    """Print the result of compare_warm_start."""
+    print(f"{'Start':<6} {'Setup (s)':>10} {'Solve (s)':>10} {'Total (s)':>10} {'Objective':>10}")
+    for label in ('cold', 'warm'):
+        run = result[label]
+        print(f"{label:<6} {run['setup_seconds']:>10.2f} {run['solve_seconds']:>10.2f} "
+              f"{run['total_seconds']:>10.2f} {run['objective']:>10.3f}")
+    print(f"Warm start used: {result['warm_start_used']}, objective match: {result['objective_match']}")
+
+# ============================================================================
+# PERSISTENT MODEL
+# ============================================================================
+
+WHAT_IF_EDITS = [
+    {'penalty_points': 8},
+    {'fdr_penalty_weight': 1.0},
+    {'base_opposing_penalty': 2.0},
+    {'free_transfers': 2},
+]
+
+def compare_persistent_model(df_players, my_team, fdr_calculator=None, opposing_formulation='pairwise', edits=WHAT_IF_EDITS):
+    """
+    Apply a sequence of what-if edits to a persistent model and to fresh rebuilds.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        fdr_calculator: FDR calculator instance (optional)
+        opposing_formulation: Opposing teams penalty formulation
+        edits: List of keyword argument dicts for PersistentSquadModel.update
+
+    Returns:
+        list: One dict per edit with update/rebuild seconds, both objectives and whether they match
+    """
+    model = PersistentSquadModel(df_players, my_team, fdr_calculator=fdr_calculator, opposing_formulation=opposing_formulation)
+    free_transfers = my_team.free_transfers
+
+    results = []
+    for edit in edits:
+        update_seconds = model.update(**edit)
+        model.solve()
+        persistent_objective = value(model.prob.objective)
+
+        # Rebuild from scratch with the same parameters
+        my_team.free_transfers = model.free_transfers
+        start = time.perf_counter()
+        prob, vars = build_optimisation_problem(
+            df_players, my_team,
+            penalty_points=model.penalty_points,
+            base_opposing_penalty=model.base_opposing_penalty,
+            fdr_calculator=fdr_calculator,
+            fdr_penalty_weight=model.fdr_penalty_weight,
+            opposing_formulation=opposing_formulation
+        )
+        rebuild_seconds = time.perf_counter() - start
+        prob.solve(PULP_CBC_CMD(msg=False))
+
+        results.append({
+            'edit': edit,
+            'update_seconds': update_seconds,
+            'rebuild_seconds': rebuild_seconds,
+            'persistent_objective': persistent_objective,
+            'rebuilt_objective': value(prob.objective),
+            'objective_match': abs(persistent_objective - value(prob.objective)) < 1e-6,
+        })
+
+    my_team.free_transfers = free_transfers
+    return results
+
+def print_persistent_comparison(results):
+    """Print the result of compare_persistent_model."""
+    print(f"{'Edit':<32} {'Update (ms)':>12} {'Rebuild (s)':>12} {'Objective':>10} {'Match':>6}")
+    for result in results:
+        edit = ', '.join(f"{key}={val}" for key, val in result['edit'].items())
+        print(f"{edit:<32} {result['update_seconds'] * 1000:>12.1f} {result['rebuild_seconds']:>12.2f} "
+              f"{result['persistent_objective']:>10.3f} {str(result['objective_match']):>6}")
+
+# ============================================================================
+# COMPACT FORMULATION
+# ============================================================================
+
+def squad_signature(squad):
+    """Player ids of the starting XI, bench and sold players, and the captain's id."""
+    captain = squad['starting_df'].loc[squad['captain_idx'], 'id'] if squad['captain_idx'] is not None else None
+    return {
+        'starting': sorted(squad['starting_df']['id'].tolist()),
+        'bench': sorted(squad['bench_df']['id'].tolist()),
+        'out': sorted(squad['out_df']['id'].tolist()),
+        'captain': captain,
+    }
+
+def compare_compact_formulation(sizes=BENCHMARK_POOL_SIZES, seeds=(0,), opposing_formulation='fixture',
+                                solver_config=None):
+    """
+    Build and solve the 13-variable and compact models on synthetic instances.
+
+    Bench players add nothing to the objective, so when several benches tie the two
+    models may pick different ones; starting XI, captain and objective must match.
+
+    Args:
+        sizes: Player pool sizes
+        seeds: Instance seeds
+        opposing_formulation: Opposing teams penalty formulation for both models
+        solver_config: SolverConfig instance (default: CBC without limits)
+
+    Returns:
+        list: One dict per (size, seed) with variables, constraints, build and solve
+              times and objective per model, and whether the squads match
+    """
+    builders = {
+        'full': (build_optimisation_problem, lambda vars, df, team, prob: process_optimization_results(vars, df, prob)),
+        'compact': (build_compact_problem, process_compact_results),
+    }
+
+    results = []
+    for size in sizes:
+        for seed in seeds:
+            df_players, my_team = generate_instance(size, seed=seed)
+            fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+            result = {'players': size, 'seed': seed}
+            signatures = {}
+            for name, (build, process) in builders.items():
+                start = time.perf_counter()
+                prob, vars = build(df_players, my_team, fdr_calculator=fdr_calculator,
+                                   opposing_formulation=opposing_formulation)
+                build_seconds = time.perf_counter() - start
+
+                stats = solve_problem(prob, solver_config)
+                signatures[name] = squad_signature(process(vars, df_players, my_team, prob))
+                result[name] = {
+                    'variables': prob.numVariables(),
+                    'constraints': len(prob.constraints),
+                    'build_seconds': build_seconds,
+                    'solve_seconds': stats['wall_seconds'],
+                    'objective': stats['objective'],
+                }
+
+            result['same_starting_xi'] = all(
+                signatures['full'][key] == signatures['compact'][key] for key in ('starting', 'captain')
+            )
+            result['same_squad'] = signatures['full'] == signatures['compact']
+            result['same_objective'] = abs(result['full']['objective'] - result['compact']['objective']) < 1e-6
+            results.append(result)
+    return results
+
+def print_compact_comparison(results, models=('full', 'compact')):
+    """Print the result of compare_compact_formulation (or compare_sparse_backend, with models=('pulp', 'sparse'))."""
+    print(f"{'Players':>7} {'Seed':>4} {'Model':<8} {'Variables':>10} {'Constraints':>12} "
+          f"{'Build (s)':>10} {'Solve (s)':>10} {'Objective':>10}")
+    for result in results:
+        for name in models:
+            model = result[name]
+            print(f"{result['players']:>7} {result['seed']:>4} {name:<8} {model['variables']:>10} {model['constraints']:>12} "
+                  f"{model['build_seconds']:>10.2f} {model['solve_seconds']:>10.2f} {model['objective']:>10.3f}")
+        squad = 'identical squad' if result['same_squad'] else (
+            'same XI and captain, tied bench' if result['same_starting_xi'] else 'DIFFERENT XI')
+        objective = 'same objective' if result['same_objective'] else 'DIFFERENT objective'
+        print(f"{'':>13}{squad}, {objective}")
+
+# ============================================================================
+# SPARSE BACKEND
+# ============================================================================
+
+def compare_sparse_backend(sizes=BENCHMARK_POOL_SIZES, seeds=(0,), opposing_formulation='fixture',
+                           solver_config=None):
+    """
+    Build and solve the compact model through PuLP and through the SciPy sparse backend.
+
+    Args:
+        sizes: Player pool sizes
+        seeds: Instance seeds
+        opposing_formulation: Opposing teams penalty formulation for both backends
+        solver_config: SolverConfig for the PuLP model (the sparse backend uses its
+            time limit and gap only)
+
+    Returns:
+        list: One dict per (size, seed) with variables, constraints, build and solve
+              times and objective per backend, and whether the squads match
+    """
+    results = []
+    for size in sizes:
+        for seed in seeds:
+            df_players, my_team = generate_instance(size, seed=seed)
+            fdr_calculator = CSVFDRCalculator(df_players=df_players)
+            result = {'players': size, 'seed': seed}
+
+            start = time.perf_counter()
+            prob, vars = build_compact_problem(df_players, my_team, fdr_calculator=fdr_calculator,
+                                               opposing_formulation=opposing_formulation)
+            build_seconds = time.perf_counter() - start
+            stats = solve_problem(prob, solver_config)
+            pulp_signature = squad_signature(process_compact_results(vars, df_players, my_team, prob))
+            result['pulp'] = {
+                'variables': prob.numVariables(),
+                'constraints': len(prob.constraints),
+                'build_seconds': build_seconds,
+                'solve_seconds': stats['wall_seconds'],
+                'objective': stats['objective'],
+            }
+
+            start = time.perf_counter()
+            model = SparseSquadModel(df_players, my_team, fdr_calculator=fdr_calculator,
+                                     opposing_formulation=opposing_formulation)
+            build_seconds = time.perf_counter() - start
+            stats = model.solve(solver_config)
+            sparse_signature = squad_signature(model.process_results())
+            result['sparse'] = {
+                'variables': model.num_variables,
+                'constraints': model.num_constraints,
+                'build_seconds': build_seconds,
+                'solve_seconds': stats['wall_seconds'],
+                'objective': stats['objective'],
+            }
+
+            result['same_starting_xi'] = all(pulp_signature[key] == sparse_signature[key] for key in ('starting', 'captain'))
+            result['same_squad'] = pulp_signature == sparse_signature
+            result['same_objective'] = abs(result['pulp']['objective'] - result['sparse']['objective']) < 1e-6
+            results.append(result)
+    return results
+
+# ============================================================================
+# TOP-K PLANS
+# ============================================================================
+
+def compare_top_k(df_players, my_team, fdr_calculator=None, k=5, opposing_formulation='pairwise', solver_config=None):
+    """
+    Enumerate the K best plans on one model with no-good cuts, and again by rebuilding.
+
+    The rebuild path builds a fresh model for every rank, adds the cuts for the plans
+    already found and solves it cold, which is what re-running optimiser.py by hand
+    amounts to.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        fdr_calculator: FDR calculator instance (optional)
+        k: Number of plans
+        opposing_formulation: Opposing teams penalty formulation
+        solver_config: SolverConfig instance (default: CBC without limits)
+
+    Returns:
+        dict: Seconds and objectives for both paths, and whether the objectives match
+    """
+    start = time.perf_counter()
+    plans, model = find_top_plans(df_players, my_team, k=k, fdr_calculator=fdr_calculator,
+                                  opposing_formulation=opposing_formulation, solver_config=solver_config)
+    incremental_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuilt_objectives = []
+    for rank in range(len(plans)):
+        prob, vars = build_optimisation_problem(df_players, my_team, fdr_calculator=fdr_calculator,
+                                                opposing_formulation=opposing_formulation)
+        for previous in plans[:rank]:
+            add_no_good_cut(prob, vars, previous['final_squad'], f"No_Good_Plan_{previous['rank']}")
+        stats = solve_problem(prob, solver_config)
+        rebuilt_objectives.append(stats['objective'])
+    rebuild_seconds = time.perf_counter() - start
+
+    incremental_objectives = [plan['objective'] for plan in plans]
+    return {
+        'k': len(plans),
+        'build_seconds': model.build_seconds,
+        'incremental_seconds': incremental_seconds,
+        'rebuild_seconds': rebuild_seconds,
+        'warm_starts': sum(plan['warm_start'] for plan in plans),
+        'incremental_objectives': incremental_objectives,
+        'rebuilt_objectives': rebuilt_objectives,
+        'objective_match': all(abs(a - b) < 1e-6 for a, b in zip(incremental_objectives, rebuilt_objectives)),
+    }
+
+def print_top_k_comparison(result):
+    """Print the result of compare_top_k."""
+    print(f"Top {result['k']} plans: incremental {result['incremental_seconds']:.2f}s "
+          f"(one build of {result['build_seconds']:.2f}s, {result['warm_starts']} warm-started solves), "
+          f"rebuilds {result['rebuild_seconds']:.2f}s "
+          f"({result['rebuild_seconds'] / result['incremental_seconds']:.1f}x)")
+    for rank, (incremental, rebuilt) in enumerate(zip(result['incremental_objectives'], result['rebuilt_objectives']), start=1):
+        print(f"  #{rank}: {incremental:.3f} vs {rebuilt:.3f}")
+    print(f"Objectives match: {result['objective_match']}")
+
+# ============================================================================
+# STOCHASTIC SCENARIOS
+# ============================================================================
+
+# Scenario counts timed by the stochastic benchmark
+SCENARIO_COUNTS = [50, 100, 200, 400]
+
+def compare_scenario_counts(df_players, my_team, fdr_calculator=None, scenario_counts=SCENARIO_COUNTS,
+                            cvar_alpha=0.1, cvar_margin=1.0, out_of_sample=1000, seed=0,
+                            opposing_formulation='fixture', solver_config=None):
+    """
+    Build and solve the sample-average model, with and without a CVaR floor, for several S.
+
+    The floor is set cvar_margin points above the in-sample CVaR of the mean-optimal
+    squad for the same scenarios. Peak memory is the tracemalloc peak while building
+    the CVaR model (scenario array excluded, as it is generated beforehand).
+
+    Args:
+        df_players: DataFrame with player data and a RangeIndex
+        my_team: Team instance with the current squad
+        fdr_calculator: FDR calculator instance (optional)
+        scenario_counts: Values of S
+        cvar_alpha: Share of worst scenarios in the CVaR
+        cvar_margin: Floor above the mean-optimal squad's CVaR
+        out_of_sample: Fresh scenarios for evaluating both squads
+        seed: Scenario seed (out-of-sample scenarios use seed + 1)
+        opposing_formulation: Opposing teams penalty formulation
+        solver_config: SolverConfig instance (time limit and gap only)
+
+    Returns:
+        list: One dict per S with the scenario array size and, for the 'mean' and
+              'cvar' models, matrix size, build and solve times, objective and CVaR
+    """
+    fresh = generate_scenarios(df_players, out_of_sample, seed=seed + 1)
+    results = []
+    for n_scenarios in scenario_counts:
+        scenarios = generate_scenarios(df_players, n_scenarios, seed=seed)
+        result = {'scenarios': n_scenarios, 'players': len(df_players), 'scenario_mb': scenarios.nbytes / 1024 ** 2}
+
+        cvar_floor = None
+        for label in ('mean', 'cvar'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            model = StochasticSquadModel(df_players, my_team, scenarios, cvar_alpha=cvar_alpha, cvar_floor=cvar_floor,
+                                         fdr_calculator=fdr_calculator, opposing_formulation=opposing_formulation)
+            build_seconds = time.perf_counter() - start
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            stats = model.solve(solver_config)
+            entry = {
+                'variables': model.num_variables,
+                'constraints': model.num_constraints,
+                'nonzeros': model.matrix_entries,
+                'matrix_mb': model.matrix_bytes / 1024 ** 2,
+                'build_peak_mb': peak_bytes / 1024 ** 2,
+                'build_seconds': build_seconds,
+                'solve_seconds': stats['wall_seconds'],
+                'status': stats['status'],
+                'objective': stats['objective'],
+                'floor': cvar_floor,
+                'cvar': None,
+                'cvar_out_of_sample': None,
+            }
+            if model.status == LpStatusOptimal:
+                entry['cvar'] = summarise_scores(model.scenario_scores(), cvar_alpha)['cvar']
+                entry['cvar_out_of_sample'] = summarise_scores(model.scenario_scores(fresh), cvar_alpha)['cvar']
+            result[label] = entry
+
+            if entry['cvar'] is None:
+                break
+            cvar_floor = entry['cvar'] + cvar_margin
+        results.append(result)
+    return results
+
+def print_scenario_comparison(results):
+    """Print the result of compare_scenario_counts."""
+    print(f"{'S':>5} {'model':<5} {'scen MB':>8} {'nnz':>9} {'A MB':>7} {'peak MB':>8} {'build s':>8} "
+          f"{'solve s':>8} {'objective':>10} {'CVaR':>7} {'CVaR oos':>9}")
+    for result in results:
+        for label in ('mean', 'cvar'):
+            entry = result.get(label)
+            if entry is None:
+                continue
+            objective = f"{entry['objective']:.3f}" if entry['objective'] is not None else entry['status']
+            cvar = f"{entry['cvar']:.2f}" if entry['cvar'] is not None else '-'
+            cvar_oos = f"{entry['cvar_out_of_sample']:.2f}" if entry['cvar_out_of_sample'] is not None else '-'
+            print(f"{result['scenarios']:>5} {label:<5} {result['scenario_mb']:>8.2f} {entry['nonzeros']:>9} "
+                  f"{entry['matrix_mb']:>7.2f} {entry['build_peak_mb']:>8.1f} {entry['build_seconds']:>8.3f} "
+                  f"{entry['solve_seconds']:>8.2f} {objective:>10} {cvar:>7} {cvar_oos:>9}")
+
+# ============================================================================
+# BENCHMARK SUITE
+# ============================================================================
+
+def run_benchmark_suite(sizes=BENCHMARK_POOL_SIZES, configs=tuple(SUITE_CONFIGS), seeds=(0,), solver_config=None,
+                        prune=False, max_pairwise_players=2000, horizons=SUITE_HORIZONS, planner_window=4,
+                        max_planner_players=1000):
+    """
+    Build and solve every model variant on synthetic instances of each size, and plan
+    each horizon length with the rolling-horizon planner.
+
+    Args:
+        sizes: Player pool sizes
+        configs: Names from SUITE_CONFIGS
+        seeds: Instance seeds; each seed gives a different pool and squad
+        solver_config: SolverConfig instance (default: CBC without limits)
+        prune: Whether to prune the candidate pool before building
+        max_pairwise_players: Skip the pairwise variant above this pool size (it grows quadratically)
+        horizons: Planning horizons (gameweeks) for plan_transfers, reported as config 'plan_<N>gw'
+        planner_window: Rolling window length for plan_transfers
+        max_planner_players: Skip the planner above this pool size
+
+    Returns:
+        dict: Run metadata and one result per (size, seed, config), including per-stage build times
+    """
+    results = []
+    for size in sizes:
+        for seed in seeds:
+            df_players, my_team = generate_instance(size, seed=seed)
+            fdr_calculator = CSVFDRCalculator(df_players=df_players)
+            if prune:
+                df_players, _ = prune_candidate_pool(df_players, my_team, fdr_calculator)
+
+            for config in configs:
+                result = {'players': size, 'seed': seed, 'config': config, 'pool_players': len(df_players)}
+                if config == 'pairwise' and size > max_pairwise_players:
+                    result['skipped'] = f"pairwise skipped above {max_pairwise_players} players"
+                    results.append(result)
+                    continue
+
+                profiler = RunProfiler(config)
+                start = time.perf_counter()
+                prob, vars = build_optimisation_problem(
+                    df_players, my_team,
+                    fdr_calculator=fdr_calculator,
+                    profiler=profiler,
+                    **SUITE_CONFIGS[config]
+                )
+                result['build_seconds'] = time.perf_counter() - start
+                result['variables'] = prob.numVariables()
+                result['constraints'] = len(prob.constraints)
+                result['build_stages'] = {span['name']: span['seconds'] for span in profiler.report()['spans']}
+
+                stats = solve_problem(prob, solver_config)
+                result['solve_seconds'] = stats['wall_seconds']
+                result.update({key: stats[key] for key in ('status', 'objective', 'nodes', 'gap')})
+                results.append(result)
+
+                print(f"{size:>6} players, seed {seed}, {config:<14} build {result['build_seconds']:7.2f}s "
+                      f"solve {result['solve_seconds']:7.2f}s objective {result['objective']}")
+
+            for horizon in horizons:
+                result = {'players': size, 'seed': seed, 'config': f'plan_{horizon}gw', 'pool_players': len(df_players)}
+                if size > max_planner_players:
+                    result['skipped'] = f"planner skipped above {max_planner_players} players"
+                    results.append(result)
+                    continue
+
+                timetable = generate_timetable(df_players, horizon, seed=seed, blank_rate=0.1, double_rate=0.1)
+                plan = plan_transfers(df_players, my_team, timetable, horizon=horizon, window=planner_window,
+                                      solver_config=solver_config)
+                result.update({
+                    'build_seconds': plan['build_seconds'],
+                    'solve_seconds': plan['solve_seconds'],
+                    'variables': max(window['variables'] for window in plan['windows']),
+                    'constraints': max(window['constraints'] for window in plan['windows']),
+                    'windows': len(plan['windows']),
+                    'status': 'Optimal' if all(w['status'] == 'Optimal' for w in plan['windows']) else 'Not optimal',
+                    'objective': plan['expected_points'],
+                    'nodes': None,
+                    'gap': None,
+                })
+                results.append(result)
+
+                print(f"{size:>6} players, seed {seed}, {result['config']:<14} build {result['build_seconds']:7.2f}s "
+                      f"solve {result['solve_seconds']:7.2f}s expected points {result['objective']:.2f}")
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'solver': repr(solver_config) if solver_config else 'default CBC',
+        'prune': prune,
+        'results': results,
+    }
+
+def write_suite_results(suite, output=None):
+    """
+    Write suite results to JSON.
+
+    Args:
+        suite: Output of run_benchmark_suite
+        output: File path (default: benchmark_results/suite_<timestamp>.json)
+
+    Returns:
+        str: Path written
+    """
+    if output is None:
+        os.makedirs(DEFAULT_RESULTS_DIR, exist_ok=True)
+        output = os.path.join(DEFAULT_RESULTS_DIR, f"suite_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, 'w') as f:
+        json.dump(suite, f, indent=2)
+    return output
+
+def compare_suite_runs(baseline, current):
+    """
+    Match two suite runs on (players, seed, config) and compare times and objectives.
+
+    Args:
+        baseline: Suite dict (or JSON path) to compare against
+        current: Suite dict (or JSON path) to compare
+
+    Returns:
+        list: One dict per result present in both runs
+    """
+    runs = []
+    for run in (baseline, current):
+        if isinstance(run, str):
+            with open(run) as f:
+                run = json.load(f)
+        runs.append({(r['players'], r['seed'], r['config']): r for r in run['results'] if 'skipped' not in r})
+
+    comparison = []
+    for key, before in runs[0].items():
+        after = runs[1].get(key)
+        if after is None:
+            continue
+        comparison.append({
+            'players': key[0], 'seed': key[1], 'config': key[2],
+            'build_before': before['build_seconds'], 'build_after': after['build_seconds'],
+            'solve_before': before['solve_seconds'], 'solve_after': after['solve_seconds'],
+            'objective_match': (before['objective'] is not None and after['objective'] is not None
+                                and abs(before['objective'] - after['objective']) < 1e-6),
+        })
+    return comparison
+
+def print_suite_comparison(comparison):
+    """Print the result of compare_suite_runs."""
+    print(f"{'Players':>8} {'Seed':>5} {'Config':<14} {'Build (s)':>17} {'Solve (s)':>17} {'Match':>6}")
+    for row in comparison:
+        print(f"{row['players']:>8} {row['seed']:>5} {row['config']:<14} "
+              f"{row['build_before']:>7.2f} -> {row['build_after']:<6.2f} "
+              f"{row['solve_before']:>7.2f} -> {row['solve_after']:<6.2f} {str(row['objective_match']):>6}")
+
+# ============================================================================
+# INSTANCES
+# ============================================================================
+
+def add_instance_arguments(parser, needs_team=True):
+    """Add options to load a gameweek CSV (and live team) or generate a synthetic instance."""
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="Gameweek player CSV")
+    if needs_team:
+        parser.add_argument('--team-id', type=int, default=DEFAULT_TEAM_ID, help="FPL team ID for the current squad")
+    parser.add_argument('--synthetic-players', type=int, default=None,
+                        help="Use a synthetic pool (and squad) of this many players instead of --csv")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the synthetic instance")
+    return parser
+
+def load_instance(args, needs_team=True):
+    """
+    Load the player pool, current team and FDR calculator selected by add_instance_arguments.
+
+    Returns:
+        tuple: (df_players, my_team or None, fdr_calculator)
+    """
+    if args.synthetic_players:
+        df_players, my_team = generate_instance(args.synthetic_players, seed=args.seed)
+        return df_players, my_team, CSVFDRCalculator(df_players=df_players)
+
+    df_players = read_player_data(args.csv)
+    my_team = Team(team_id=args.team_id) if needs_team else None
+    return df_players, my_team, CSVFDRCalculator(df_players=df_players)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Squad selection model benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    objective_parser = subparsers.add_parser('objective', help="Vectorised vs per-row objective builder")
+    add_instance_arguments(objective_parser, needs_team=False)
+    objective_parser.add_argument('--repeats', type=int, default=3)
+
+    opposing_parser = subparsers.add_parser('opposing', help="Pairwise vs fixture-counter opposing teams penalty")
+    add_instance_arguments(opposing_parser)
+
+    pruning_parser = subparsers.add_parser('pruning', help="Full vs dominance-pruned candidate pool")
+    add_instance_arguments(pruning_parser)
+    pruning_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    pruning_parser.add_argument('--keep-zero-minutes', action='store_true', help="Only prune unavailable and dominated players")
+
+    warm_start_parser = subparsers.add_parser('warmstart', help="Cold vs current-squad warm-started solve")
+    add_instance_arguments(warm_start_parser)
+    warm_start_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    warm_start_parser.add_argument('--repeats', type=int, default=3)
+
+    persistent_parser = subparsers.add_parser('persistent', help="In-place what-if updates vs full rebuilds")
+    add_instance_arguments(persistent_parser)
+    persistent_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+
+    compact_parser = subparsers.add_parser('compact', help="13-variable vs compact (squad/start/captain) model")
+    compact_parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_POOL_SIZES)
+    compact_parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    compact_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='fixture')
+    add_solver_arguments(compact_parser)
+
+    sparse_parser = subparsers.add_parser('sparse', help="Compact model through PuLP vs SciPy sparse arrays and milp")
+    sparse_parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_POOL_SIZES)
+    sparse_parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    sparse_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='fixture')
+    add_solver_arguments(sparse_parser)
+
+    top_k_parser = subparsers.add_parser('topk', help="Top-K plans with no-good cuts on one model vs K rebuilds")
+    add_instance_arguments(top_k_parser)
+    top_k_parser.add_argument('-k', '--k', type=int, default=5)
+    top_k_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    add_solver_arguments(top_k_parser)
+
+    stochastic_parser = subparsers.add_parser('stochastic', help="Sample-average model memory and time against S")
+    add_instance_arguments(stochastic_parser)
+    stochastic_parser.add_argument('--scenario-counts', type=int, nargs='+', default=SCENARIO_COUNTS)
+    stochastic_parser.add_argument('--cvar-alpha', type=float, default=0.1)
+    stochastic_parser.add_argument('--cvar-margin', type=float, default=1.0)
+    stochastic_parser.add_argument('--out-of-sample', type=int, default=1000)
+    stochastic_parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='fixture')
+    add_solver_arguments(stochastic_parser)
+
+    suite_parser = subparsers.add_parser('suite', help="Build and solve model variants on synthetic instances, saved as JSON")
+    suite_parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_POOL_SIZES)
+    suite_parser.add_argument('--configs', nargs='+', choices=list(SUITE_CONFIGS), default=list(SUITE_CONFIGS))
+    suite_parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    suite_parser.add_argument('--prune', action='store_true', help="Prune the candidate pool before building")
+    suite_parser.add_argument('--max-pairwise-players', type=int, default=2000)
+    suite_parser.add_argument('--horizons', type=int, nargs='*', default=SUITE_HORIZONS,
+                              help="Planner horizons in gameweeks (none to skip the planner)")
+    suite_parser.add_argument('--planner-window', type=int, default=4)
+    suite_parser.add_argument('--max-planner-players', type=int, default=1000)
+    suite_parser.add_argument('--output', default=None, help="JSON file (default: benchmark_results/suite_<timestamp>.json)")
+    suite_parser.add_argument('--compare', default=None, help="Earlier suite JSON to compare against")
+    add_solver_arguments(suite_parser)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two suite JSON files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'objective':
+        df_players, _, fdr_calculator = load_instance(args, needs_team=False)
+        print_objective_comparison(compare_objective_builders(df_players, fdr_calculator, repeats=args.repeats))
+    elif args.benchmark == 'opposing':
+        df_players, my_team, fdr_calculator = load_instance(args)
+        print_formulation_comparison(compare_opposing_formulations(df_players, my_team, fdr_calculator))
+    elif args.benchmark == 'pruning':
+        df_players, my_team, fdr_calculator = load_instance(args)
+        print_pruning_comparison(compare_pool_pruning(
+            df_players, my_team, fdr_calculator,
+            opposing_formulation=args.opposing_formulation,
+            drop_zero_minutes=not args.keep_zero_minutes
+        ))
+    elif args.benchmark == 'warmstart':
+        df_players, my_team, fdr_calculator = load_instance(args)
+        print_warm_start_comparison(compare_warm_start(
+            df_players, my_team, fdr_calculator,
+            opposing_formulation=args.opposing_formulation,
+            repeats=args.repeats
+        ))
+    elif args.benchmark == 'persistent':
+        df_players, my_team, fdr_calculator = load_instance(args)
+        print_persistent_comparison(compare_persistent_model(
+            df_players, my_team, fdr_calculator,
+            opposing_formulation=args.opposing_formulation
+        ))
+    elif args.benchmark == 'compact':
+        print_compact_comparison(compare_compact_formulation(
+            sizes=args.sizes,
+            seeds=args.seeds,
+            opposing_formulation=args.opposing_formulation,
+            solver_config=solver_config_from_args(args)
+        ))
+    elif args.benchmark == 'sparse':
+        print_compact_comparison(compare_sparse_backend(
+            sizes=args.sizes,
+            seeds=args.seeds,
+            opposing_formulation=args.opposing_formulation,
+            solver_config=solver_config_from_args(args)
+        ), models=('pulp', 'sparse'))
+    elif args.benchmark == 'topk':
+        df_players, my_team, fdr_calculator = load_instance(args)
+        print_top_k_comparison(compare_top_k(
+            df_players, my_team, fdr_calculator,
+            k=args.k,
+            opposing_formulation=args.opposing_formulation,
+            solver_config=solver_config_from_args(args)
+        ))
+    elif args.benchmark == 'stochastic':
+        df_players, my_team, fdr_calculator = load_instance(args)
+        print_scenario_comparison(compare_scenario_counts(
+            df_players, my_team, fdr_calculator,
+            scenario_counts=args.scenario_counts,
+            cvar_alpha=args.cvar_alpha,
+            cvar_margin=args.cvar_margin,
+            out_of_sample=args.out_of_sample,
+            seed=args.seed,
+            opposing_formulation=args.opposing_formulation,
+            solver_config=solver_config_from_args(args)
+        ))
+    elif args.benchmark == 'suite':
+        suite = run_benchmark_suite(
+            sizes=args.sizes,
+            configs=args.configs,
+            seeds=args.seeds,
+            solver_config=solver_config_from_args(args),
+            prune=args.prune,
+            max_pairwise_players=args.max_pairwise_players,
+            horizons=args.horizons,
+            planner_window=args.planner_window,
+            max_planner_players=args.max_planner_players
+        )
+        print(f"Suite results written to {write_suite_results(suite, args.output)}")
+        if args.compare:
+            print_suite_comparison(compare_suite_runs(args.compare, suite))
+    elif args.benchmark == 'compare':
+        print_suite_comparison(compare_suite_runs(args.baseline, args.current))
+
+if __name__ == "__main__":
+    main()
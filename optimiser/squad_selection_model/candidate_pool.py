@@ -0,0 +1,202 @@
+# candidate_pool.py
+# Pre-solve reduction of the player pool before decision variables are created
+
+import numpy as np
+from fdr import get_fdr_coefficients
+from compact_formulation import SQUAD_SIZE, MAX_PLAYERS_PER_TEAM
+from constraints.bench_selection_constraints import get_bench_eligibility_mask
+from opposing_teams import get_penalty_for_positions
+
+# Squad slots per position; a player beaten by this many others can always be swapped out
+SQUAD_SLOTS_BY_POSITION = {'Goalkeeper': 2, 'Defender': 5, 'Midfielder': 5, 'Forward': 3}
+
+# Clubs that can already hold MAX_PLAYERS_PER_TEAM of the other squad members, blocking a swap
+# to any of their players
+MAX_FULL_CLUBS = (SQUAD_SIZE - 1) // MAX_PLAYERS_PER_TEAM
+
+def get_worst_opposing_penalties(df_players, base_opposing_penalty):
+    """
+    Largest opposing teams penalty each player can add to a squad by starting.
+
+    A starter faces at most MAX_PLAYERS_PER_TEAM starters from the club they play,
+    each costing at most the highest position weight against the starter's position.
+
+    Returns:
+        np.ndarray: Penalty points per player (0 for players without a fixture)
+    """
+    positions = df_players['position'].to_numpy(dtype=object)
+    worst_weight = {
+        position: max(get_penalty_for_positions(position, other) or 0 for other in SQUAD_SLOTS_BY_POSITION)
+        for position in SQUAD_SLOTS_BY_POSITION
+    }
+    penalties = np.array([worst_weight.get(position, 0) for position in positions], dtype=float)
+    penalties *= base_opposing_penalty * MAX_PLAYERS_PER_TEAM
+
+    if 'opponent' in df_players.columns:
+        penalties[(df_players['opponent'] == 'No fixture').to_numpy()] = 0
+    return penalties
+
+def find_dominated_players(prices, positions, scores, candidates, min_dominators=SQUAD_SLOTS_BY_POSITION, clubs=None,
+                           penalties=None, opponents=None, bench_eligible=None, block_size=1024):
+    """
+    Flag candidates dominated by at least k same-position candidates.
+
+    Player q dominates player p when q is no more expensive, scores at least as much
+    on every score array after subtracting q's penalty, is bench-eligible whenever p
+    is, and is strictly better on price or a score (exact ties are broken by row order
+    so duplicates can still be pruned). q's penalty is not subtracted when q plays the
+    same opponent as p, since q then faces exactly the starters p faced. With clubs
+    given, k counts the distinct clubs of the dominators rather than the dominators
+    themselves.
+
+    Args:
+        prices: Array of player prices
+        positions: Array of player positions
+        scores: List of score arrays (e.g. expected points, expected points plus FDR)
+        candidates: Boolean array of players that may be pruned and may act as dominators
+        min_dominators: Mapping of position to the number of dominators (or clubs) required (k)
+        clubs: Array of club IDs (optional)
+        penalties: Array of worst-case penalties a dominator can bring (optional)
+        opponents: Array of opponent club IDs, used with penalties (optional)
+        bench_eligible: Boolean array of bench-eligible players (optional)
+        block_size: Number of players compared per block, bounds memory to block_size * group size
+
+    Returns:
+        np.ndarray: Boolean array, True for dominated players
+    """
+    dominated = np.zeros(len(prices), dtype=bool)
+
+    for position, slots in min_dominators.items():
+        members = np.flatnonzero((positions == position) & candidates)
+        if len(members) <= slots:
+            continue
+
+        member_prices = prices[members]
+        member_scores = [score[members] for score in scores]
+        member_penalties = penalties[members] if penalties is not None else np.zeros(len(members))
+        member_opponents = opponents[members] if opponents is not None else None
+        if clubs is not None:
+            member_clubs = [clubs[members] == club for club in np.unique(clubs[members])]
+
+        for start in range(0, len(members), block_size):
+            block = slice(start, start + block_size)
+
+            # Rows are potential dominators q, columns are the players p being tested
+            at_least_as_good = member_prices[:, None] <= member_prices[None, block]
+            strictly_better = member_prices[:, None] < member_prices[None, block]
+            penalty = np.broadcast_to(member_penalties[:, None], at_least_as_good.shape)
+            if member_opponents is not None:
+                penalty = np.where(member_opponents[:, None] == member_opponents[None, block], 0, penalty)
+            for score in member_scores:
+                dominator_score = score[:, None] - penalty
+                at_least_as_good &= dominator_score >= score[None, block]
+                strictly_better |= dominator_score > score[None, block]
+            if bench_eligible is not None:
+                member_eligible = bench_eligible[members]
+                at_least_as_good &= member_eligible[:, None] | ~member_eligible[None, block]
+            strictly_better |= members[:, None] < members[None, block]
+
+            dominators = at_least_as_good & strictly_better
+            if clubs is None:
+                dominator_counts = dominators.sum(axis=0)
+            else:
+                dominator_counts = sum(dominators[in_club].any(axis=0) for in_club in member_clubs)
+            dominated[members[block]] = dominator_counts >= slots
+
+    return dominated
+
+def prune_candidate_pool(df_players, my_team, fdr_calculator=None, fdr_penalty_weight=0.5, drop_zero_minutes=True,
+                         top_k=1, base_opposing_penalty=1, bench_criteria=None):
+    """
+    Remove players that cannot (or in practice will not) appear in an optimal squad.
+
+    Current team members are always kept. Other players are removed when they are
+    unavailable (they cannot be transferred in), have played no minutes (optional), or
+    are dominated on price and expected points (plus FDR, when a calculator is given).
+
+    A dominated player p in a squad can be swapped for one of its dominators q unless q
+    is already in the squad (at most slots - 1 same-position players) or q's club is
+    full (at most MAX_FULL_CLUBS clubs). So p is removed when its dominators come from
+    at least slots + MAX_FULL_CLUBS distinct clubs. q must keep its lead after the
+    largest opposing teams penalty it can bring (none when it plays p's opponent), and
+    be bench-eligible whenever p is,
+    so the swap never lowers the objective or breaks a constraint.
+
+    When the top_k best plans are wanted rather than just the best, top_k - 1 extra
+    dominator clubs are required: a squad holding such a player can be improved by at
+    least top_k different swaps, so it is never among the top_k plans.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        fdr_calculator: FDR calculator instance (optional)
+        fdr_penalty_weight: Weight for FDR penalties, as used in the objective
+        drop_zero_minutes: Whether to remove non-owned players with zero minutes
+        top_k: Number of best plans that must survive pruning (see top_k_plans.py)
+        base_opposing_penalty: Opposing teams penalty, as used in the objective
+        bench_criteria: Bench eligibility criteria, as used in the model (optional)
+
+    Returns:
+        tuple: (pruned DataFrame with a fresh RangeIndex, report dict)
+    """
+    owned = df_players['id'].isin(my_team.all_ids).to_numpy()
+    available = (df_players['status'] == 'a').to_numpy() if 'status' in df_players.columns else np.ones(len(df_players), dtype=bool)
+
+    if drop_zero_minutes and 'minutes' in df_players.columns:
+        played = (df_players['minutes'].fillna(0) > 0).to_numpy()
+    else:
+        played = np.ones(len(df_players), dtype=bool)
+
+    candidates = ~owned & available & played
+
+    # Score on expected points, and on expected points plus FDR for starters when available
+    expected_points = df_players['expected_points'].to_numpy(dtype=float)
+    scores = [expected_points]
+    if fdr_calculator is not None:
+        fdr_coefficients = get_fdr_coefficients(df_players, fdr_calculator, fdr_penalty_weight)
+        if fdr_coefficients is not None:
+            scores.append(expected_points + fdr_coefficients)
+
+    penalties = get_worst_opposing_penalties(df_players, base_opposing_penalty) if base_opposing_penalty > 0 else None
+    bench_eligible = None
+    if bench_criteria is not None:
+        bench_eligible = get_bench_eligibility_mask(df_players, **bench_criteria).to_numpy(dtype=bool)
+
+    dominated = find_dominated_players(
+        df_players['price'].to_numpy(dtype=float),
+        df_players['position'].to_numpy(dtype=object),
+        scores,
+        candidates,
+        min_dominators={
+            position: slots + MAX_FULL_CLUBS + top_k - 1 for position, slots in SQUAD_SLOTS_BY_POSITION.items()
+        },
+        clubs=df_players['team_id'].to_numpy(),
+        penalties=penalties,
+        opponents=df_players['opponent_id'].to_numpy() if 'opponent_id' in df_players.columns else None,
+        bench_eligible=bench_eligible,
+    )
+
+    keep = owned | (candidates & ~dominated)
+    pruned = df_players[keep].reset_index(drop=True)
+
+    report = {
+        'original_players': len(df_players),
+        'remaining_players': len(pruned),
+        'removed_unavailable': int((~owned & ~available).sum()),
+        'removed_zero_minutes': int((~owned & available & ~played).sum()),
+        'removed_dominated': int(dominated.sum()),
+        'by_position': {
+            position: (int((df_players['position'] == position).sum()), int((pruned['position'] == position).sum()))
+            for position in SQUAD_SLOTS_BY_POSITION
+        },
+    }
+    return pruned, report
+
+def print_pool_report(report):
+    """Print how much the candidate pool shrank."""
+    removed = report['original_players'] - report['remaining_players']
+    print(f"Candidate pool: {report['original_players']} -> {report['remaining_players']} players "
+          f"({removed} removed: {report['removed_unavailable']} unavailable, "
+          f"{report['removed_zero_minutes']} zero minutes, {report['removed_dominated']} dominated)")
+    for position, (before, after) in report['by_position'].items():
+        print(f"  {position}: {before} -> {after}")
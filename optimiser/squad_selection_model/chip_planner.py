@@ -0,0 +1,374 @@
+# chip_planner.py
+# Choose gameweeks for the wildcard, free hit, bench boost and triple captain chips
+
+import argparse
+import itertools
+import os
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pulp import LpStatus, LpStatusOptimal, value
+from model_builder import build_optimisation_problem
+from objective_function import CHIPS
+from candidate_pool import prune_candidate_pool
+from warm_start import set_current_squad_warm_start
+from solver_config import SolverConfig, solve_problem, add_solver_arguments, solver_config_from_args
+from squad_creator import process_optimization_results
+from opposing_teams import OPPOSING_FORMULATIONS
+from multi_gameweek_planner import DEFAULT_TIMETABLE, load_timetable, project_expected_points
+
+from fpl_data.storage import read_player_data
+
+# Gameweeks of expected points a wildcard squad is picked for (it is kept after the chip week)
+DEFAULT_WILDCARD_LOOKAHEAD = 4
+
+# Per-worker state, set once by init_chip_worker
+_worker_state = {}
+
+# ============================================================================
+# CANDIDATE SOLVES
+# ============================================================================
+
+def build_candidate_solves(gameweeks, chips=CHIPS, wildcard_lookahead=DEFAULT_WILDCARD_LOOKAHEAD):
+    """
+    List every solve needed to value each chip in each gameweek.
+
+    Each gameweek gets a solve without a chip and one per single-week chip (free hit,
+    bench boost, triple captain), scored on that gameweek's expected points. A wildcard
+    squad is kept, so the wildcard and its no-chip baseline are scored on the expected
+    points summed over wildcard_lookahead gameweeks from the chip week. The window always
+    has wildcard_lookahead gameweeks, running past the last gameweek when needed, so
+    wildcard gains in different weeks are on the same scale (see plan_chips).
+
+    Returns:
+        list: Task dicts with gameweek, chip (None for a baseline) and the scored gameweeks
+    """
+    tasks = []
+    for gameweek in gameweeks:
+        week = [gameweek]
+        tasks.append({'gameweek': gameweek, 'chip': None, 'gameweeks': week})
+        for chip in chips:
+            if chip == 'wildcard':
+                window = list(range(gameweek, gameweek + wildcard_lookahead))
+                if len(window) > 1:
+                    tasks.append({'gameweek': gameweek, 'chip': None, 'gameweeks': window})
+                tasks.append({'gameweek': gameweek, 'chip': chip, 'gameweeks': window})
+            else:
+                tasks.append({'gameweek': gameweek, 'chip': chip, 'gameweeks': week})
+    return tasks
+
+def gameweek_pool(df_players, expected_points, gameweeks, scored_gameweeks):
+    """Copy of the player pool with expected_points summed over the scored gameweeks (columns of gameweeks)."""
+    columns = [gameweeks.index(gameweek) for gameweek in scored_gameweeks]
+    pool = df_players.copy()
+    pool['expected_points'] = expected_points[:, columns].sum(axis=1)
+    return pool
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def init_chip_worker(df_players, my_team, expected_points, gameweeks, fdr_calculator, settings):
+    """Store the shared player data and projections in the worker process."""
+    _worker_state['df_players'] = df_players
+    _worker_state['my_team'] = my_team
+    _worker_state['expected_points'] = expected_points
+    _worker_state['gameweeks'] = gameweeks
+    _worker_state['fdr_calculator'] = fdr_calculator
+    _worker_state['settings'] = settings
+
+def solve_chip_candidate(task):
+    """
+    Build and solve the one-gameweek model for a task, with its chip as an objective variant.
+
+    Returns:
+        dict: Task fields, status, objective, transfers, captain and solve time
+    """
+    settings = _worker_state['settings']
+    my_team = _worker_state['my_team']
+    fdr_calculator = _worker_state['fdr_calculator']
+    solver_config = settings['solver_config']
+
+    start = time.perf_counter()
+    df_players = gameweek_pool(_worker_state['df_players'], _worker_state['expected_points'],
+                               _worker_state['gameweeks'], task['gameweeks'])
+    if settings['prune_pool']:
+        df_players, _ = prune_candidate_pool(df_players, my_team, fdr_calculator, settings['fdr_penalty_weight'],
+                                             base_opposing_penalty=settings['base_opposing_penalty'])
+
+    prob, vars = build_optimisation_problem(
+        df_players, my_team,
+        penalty_points=settings['penalty_points'],
+        base_opposing_penalty=settings['base_opposing_penalty'],
+        fdr_calculator=fdr_calculator,
+        fdr_penalty_weight=settings['fdr_penalty_weight'],
+        opposing_formulation=settings['opposing_formulation'],
+        chip=task['chip']
+    )
+    warm_start = (settings['use_warm_start'] and solver_config.solver == 'cbc'
+                  and set_current_squad_warm_start(prob, vars, df_players, my_team))
+    solve_problem(prob, solver_config, warm_start=warm_start)
+
+    result = {
+        **task,
+        'status': LpStatus[prob.status],
+        'objective': value(prob.objective) if prob.status == LpStatusOptimal else None,
+        'solve_seconds': time.perf_counter() - start,
+        'worker': os.getpid(),
+    }
+    if prob.status == LpStatusOptimal:
+        result.update(summarise_candidate(process_optimization_results(vars, df_players, prob), df_players))
+    return result
+
+def summarise_candidate(squad, df_players):
+    """Transfers, captain and bench of a solved candidate, by player name."""
+    decision_results = squad['decision_results']
+
+    def names(var_types):
+        return [df_players.loc[idx, 'name'] for var_type in var_types for idx in decision_results.get(var_type, [])]
+
+    return {
+        'transfers_in': names(['in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid']),
+        'transfers_out': names(['out_starting_free', 'out_starting_paid', 'out_bench_free', 'out_bench_paid']),
+        'captain': df_players.loc[squad['captain_idx'], 'name'] if squad['captain_idx'] is not None else None,
+        'bench': squad['bench_df']['name'].tolist(),
+        'bench_points': float(squad['bench_df']['expected_points'].sum()),
+    }
+
+# ============================================================================
+# CHIP VALUES AND PLAN
+# ============================================================================
+
+def compute_chip_values(results, gameweeks, chips=CHIPS):
+    """
+    Gain of each chip in each gameweek over the same gameweek(s) without a chip.
+
+    Returns:
+        pd.DataFrame: Points gained, indexed by gameweek with one column per chip
+                      (NaN when either solve failed)
+    """
+    objectives = {
+        (result['gameweek'], result['chip'], len(result['gameweeks'])): result['objective'] for result in results
+    }
+
+    values = pd.DataFrame(index=pd.Index(gameweeks, name='gameweek'), columns=list(chips), dtype=float)
+    for result in results:
+        if result['chip'] is None:
+            continue
+        baseline = objectives.get((result['gameweek'], None, len(result['gameweeks'])))
+        if result['objective'] is not None and baseline is not None:
+            values.loc[result['gameweek'], result['chip']] = result['objective'] - baseline
+    return values
+
+def choose_chip_plan(values, min_gain=0.0):
+    """
+    Pick at most one gameweek per chip and at most one chip per gameweek, maximising the total gain.
+
+    Every assignment is enumerated ((gameweeks + 1) ** chips combinations, e.g. 6,561 for
+    four chips over eight gameweeks). Chips gaining no more than min_gain are held back.
+
+    Returns:
+        dict: Chip to gameweek (None when the chip is held back)
+    """
+    options = {}
+    for chip in values.columns:
+        gains = values[chip].dropna()
+        options[chip] = [None] + [gameweek for gameweek, gain in gains.items() if gain > min_gain]
+
+    best_plan, best_gain = {chip: None for chip in values.columns}, 0.0
+    for assignment in itertools.product(*options.values()):
+        weeks = [gameweek for gameweek in assignment if gameweek is not None]
+        if len(weeks) != len(set(weeks)):
+            continue
+        gain = sum(values.loc[gameweek, chip] for chip, gameweek in zip(options, assignment) if gameweek is not None)
+        if gain > best_gain + 1e-9:
+            best_plan, best_gain = dict(zip(options, assignment)), gain
+    return best_plan
+
+def plan_chips(df_players, my_team, timetable, start_gameweek=None, horizon=8, chips=CHIPS,
+               wildcard_lookahead=DEFAULT_WILDCARD_LOOKAHEAD, penalty_points=4, base_opposing_penalty=1,
+               fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise', prune_pool=False,
+               min_gain=0.0, workers=None, solver_config=None, use_warm_start=False):
+    """
+    Value every chip in every upcoming gameweek and choose when to play each one.
+
+    Each chip is solved as a variant of the one-gameweek model (build_optimisation_problem
+    with chip=...) on the projected expected points of its gameweek, starting from the
+    current squad, and compared with the same gameweek solved without a chip. A free hit
+    squad is only scored for its own gameweek, as the squad reverts afterwards. The
+    candidate solves are independent and run in a process pool. Interactions between
+    chips (e.g. a bench boost after a wildcard) are not modelled. Expected points are
+    projected wildcard_lookahead - 1 gameweeks past the horizon, so a wildcard late in the
+    horizon is valued over as many gameweeks as an early one (gameweeks after the end of
+    the season have no fixtures and score 0).
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        timetable: Fixture timetable from load_timetable
+        start_gameweek: First gameweek to consider (default: the 'gameweek' column of df_players)
+        horizon: Number of gameweeks to consider
+        chips: Chips still available, from CHIPS
+        wildcard_lookahead: Gameweeks of expected points a wildcard squad is picked for
+        penalty_points: Points penalty per paid transfer
+        base_opposing_penalty: Opposing teams penalty
+        fdr_calculator: FDR calculator instance (optional)
+        fdr_penalty_weight: Weight for FDR penalties
+        opposing_formulation: Opposing teams penalty formulation
+        prune_pool: Whether to prune the candidate pool for each solve
+        min_gain: Only play a chip that gains more than this many points
+        workers: Number of worker processes (default: CPU count)
+        solver_config: SolverConfig instance (default: single-threaded CBC)
+        use_warm_start: Seed each CBC solve with the current squad (off by default: the
+            setup costs about what it saves, see benchmarks.py warmstart)
+
+    Returns:
+        dict: gameweeks, values (DataFrame), plan (chip to gameweek), candidates (solve
+              results), wall_seconds and solve_seconds
+    """
+    unknown = set(chips) - set(CHIPS)
+    if unknown:
+        raise ValueError(f"Unknown chips: {', '.join(sorted(unknown))}")
+
+    if start_gameweek is None:
+        start_gameweek = int(df_players['gameweek'].iloc[0])
+    gameweeks = list(range(start_gameweek, start_gameweek + horizon))
+    lookahead = wildcard_lookahead if 'wildcard' in chips else 1
+    projected_gameweeks = list(range(start_gameweek, start_gameweek + horizon + lookahead - 1))
+    expected_points = project_expected_points(df_players, timetable, projected_gameweeks)
+
+    workers = workers or os.cpu_count()
+    settings = {
+        'penalty_points': penalty_points,
+        'base_opposing_penalty': base_opposing_penalty,
+        'fdr_penalty_weight': fdr_penalty_weight,
+        'opposing_formulation': opposing_formulation,
+        'prune_pool': prune_pool,
+        'solver_config': solver_config or SolverConfig(threads=1),
+        'use_warm_start': use_warm_start,
+    }
+    tasks = build_candidate_solves(gameweeks, chips, wildcard_lookahead)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_chip_worker,
+        initargs=(df_players, my_team, expected_points, projected_gameweeks, fdr_calculator, settings)
+    ) as executor:
+        candidates = list(executor.map(solve_chip_candidate, tasks))
+    wall_seconds = time.perf_counter() - start
+
+    values = compute_chip_values(candidates, gameweeks, chips)
+    return {
+        'gameweeks': gameweeks,
+        'values': values,
+        'plan': choose_chip_plan(values, min_gain),
+        'candidates': candidates,
+        'wall_seconds': wall_seconds,
+        'solve_seconds': sum(candidate['solve_seconds'] for candidate in candidates),
+        'workers': workers,
+    }
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def find_candidate(chip_plan, chip, gameweek):
+    """Solve result for a chip played in a gameweek."""
+    return next(candidate for candidate in chip_plan['candidates']
+                if candidate['chip'] == chip and candidate['gameweek'] == gameweek)
+
+def print_chip_plan(chip_plan):
+    """Print the chip value table, the chosen gameweeks and what each chip would do."""
+    print("\n" + "=" * 60)
+    print("CHIP VALUES (points gained over the same gameweek without a chip)")
+    print("=" * 60)
+    print(chip_plan['values'].to_string(float_format=lambda x: f"{x:.2f}"))
+
+    print("\nCHIP PLAN")
+    for chip, gameweek in chip_plan['plan'].items():
+        if gameweek is None:
+            print(f"{chip}: hold (no gain in GW{chip_plan['gameweeks'][0]}-{chip_plan['gameweeks'][-1]})")
+            continue
+
+        candidate = find_candidate(chip_plan, chip, gameweek)
+        print(f"{chip}: GW{gameweek} (+{chip_plan['values'].loc[gameweek, chip]:.2f} pts)")
+        if chip in ('wildcard', 'free_hit'):
+            print(f"  {len(candidate['transfers_in'])} transfer(s) in: {', '.join(candidate['transfers_in'])}")
+            print(f"  out: {', '.join(candidate['transfers_out'])}")
+            if chip == 'free_hit':
+                print(f"  Squad reverts to the current squad in GW{gameweek + 1}")
+        elif chip == 'bench_boost':
+            print(f"  Bench: {', '.join(candidate['bench'])} ({candidate['bench_points']:.1f} xP)")
+        elif chip == 'triple_captain':
+            print(f"  Captain: {candidate['captain']}")
+
+    print(f"\n{len(chip_plan['candidates'])} candidate solves in {chip_plan['wall_seconds']:.1f}s wall-clock "
+          f"on {chip_plan['workers']} workers (sum of solve times {chip_plan['solve_seconds']:.1f}s)")
+    print("=" * 60)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Choose gameweeks for the FPL chips")
+    parser.add_argument('--csv', default='data/fpl_players_gw_9.csv', help="Gameweek player CSV")
+    parser.add_argument('--team-id', type=int, default=2562804, help="FPL team ID for the current squad")
+    parser.add_argument('--timetable', default=DEFAULT_TIMETABLE, help="Fixture timetable CSV")
+    parser.add_argument('--synthetic-players', type=int, default=None,
+                        help="Use a synthetic pool, squad and timetable instead of --csv, --team-id and --timetable")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start-gameweek', type=int, default=None)
+    parser.add_argument('--horizon', type=int, default=8)
+    parser.add_argument('--chips', nargs='+', choices=CHIPS, default=CHIPS, help="Chips still available")
+    parser.add_argument('--wildcard-lookahead', type=int, default=DEFAULT_WILDCARD_LOOKAHEAD)
+    parser.add_argument('--penalty-points', type=float, default=4)
+    parser.add_argument('--base-opposing-penalty', type=float, default=1)
+    parser.add_argument('--fdr-penalty-weight', type=float, default=0.5)
+    parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    parser.add_argument('--prune', action='store_true', help="Prune the candidate pool for each solve")
+    parser.add_argument('--warm-start', action='store_true', help="Seed each CBC solve with the current squad")
+    parser.add_argument('--min-gain', type=float, default=0.0, help="Hold chips gaining no more than this")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', default='chip_values.csv', help="CSV file for the chip value table")
+    add_solver_arguments(parser)
+    args = parser.parse_args()
+
+    from fdr import CSVFDRCalculator
+    if args.synthetic_players:
+        from synthetic_instances import generate_instance, generate_timetable
+        df_players, my_team = generate_instance(args.synthetic_players, seed=args.seed)
+        timetable = generate_timetable(df_players, args.horizon + args.wildcard_lookahead - 1, seed=args.seed,
+                                       blank_rate=0.1, double_rate=0.1)
+        fdr_calculator = CSVFDRCalculator(df_players=df_players)
+    else:
+        from team_class import Team
+        df_players = read_player_data(args.csv)
+        my_team = Team(team_id=args.team_id)
+        timetable = load_timetable(args.timetable)
+        fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+    chip_plan = plan_chips(
+        df_players, my_team, timetable,
+        start_gameweek=args.start_gameweek,
+        horizon=args.horizon,
+        chips=args.chips,
+        wildcard_lookahead=args.wildcard_lookahead,
+        penalty_points=args.penalty_points,
+        base_opposing_penalty=args.base_opposing_penalty,
+        fdr_calculator=fdr_calculator,
+        fdr_penalty_weight=args.fdr_penalty_weight,
+        opposing_formulation=args.opposing_formulation,
+        prune_pool=args.prune,
+        min_gain=args.min_gain,
+        workers=args.workers,
+        solver_config=solver_config_from_args(args, threads=args.threads or 1),
+        use_warm_start=args.warm_start
+    )
+    print_chip_plan(chip_plan)
+    chip_plan['values'].to_csv(args.output)
+    print(f"Chip values written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+# compact_formulation.py
+# Aggregated-variable squad selection model: squad, start and captain binaries per player
+# and a single integer count of paid transfers
+
+import numpy as np
+from pulp import LpProblem, LpMaximize, LpVariable, LpAffineExpression, lpSum
+from constraints.bench_selection_constraints import get_bench_eligibility_mask
+from constraints.free_transfer_limit_constraint import FREE_TRANSFER_LIMIT_NAME
+from opposing_teams import add_opposing_teams_penalty_to_objective
+from player_arrays import extract_player_arrays, build_linear_expression
+from fdr import get_fdr_coefficients
+from squad_creator import create_squad_output
+from instrumentation import profile_span
+
+COMPACT_VAR_TYPES = ['squad', 'start', 'captain']
+
+SQUAD_SIZE = 15
+STARTING_SIZE = 11
+MAX_PLAYERS_PER_TEAM = 3
+MAX_SQUAD_COST = 110
+SQUAD_BY_POSITION = {'Goalkeeper': 2, 'Defender': 5, 'Midfielder': 5, 'Forward': 3}
+STARTING_BY_POSITION = {'Goalkeeper': (1, 1), 'Defender': (3, 5), 'Midfielder': (2, 5), 'Forward': (1, 3)}
+
+# ============================================================================
+# DECISION VARIABLES
+# ============================================================================
+
+def get_current_roles(df_players, my_team):
+    """
+    Split the player pool by current squad role.
+
+    Returns:
+        tuple: (starters, bench, new) lists of df_players indices; new players are only
+               included when available, as in create_decision_variables
+    """
+    is_starter = df_players['id'].isin(my_team.starting_ids).to_numpy()
+    is_bench = df_players['id'].isin(my_team.bench_ids).to_numpy()
+    if 'status' in df_players.columns:
+        is_available = (df_players['status'] == 'a').to_numpy()
+    else:
+        is_available = np.ones(len(df_players), dtype=bool)
+
+    index = df_players.index.to_numpy()
+    starters = index[is_starter].tolist()
+    bench = index[is_bench & ~is_starter].tolist()
+    new = index[~is_starter & ~is_bench & is_available].tolist()
+    return starters, bench, new
+
+def create_compact_variables(df_players, my_team):
+    """
+    Create squad, start and captain binaries for each selectable player.
+
+    Transfers are not separate variables: a current squad player is sold when squad is 0
+    and any other player is bought when squad is 1. Free and paid transfers are only
+    distinguished by the integer paid_transfers count.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+
+    Returns:
+        dict: {'squad', 'start', 'captain'} mappings of player index to LpVariable, the
+              'paid_transfers' LpVariable and the 'starters', 'bench' and 'new' index lists
+    """
+    starters, bench, new = get_current_roles(df_players, my_team)
+
+    vars = {var_type: {} for var_type in COMPACT_VAR_TYPES}
+    for idx in starters + bench + new:
+        for var_type in COMPACT_VAR_TYPES:
+            vars[var_type][idx] = LpVariable(f"{var_type}_{idx}", cat='Binary')
+
+    vars['paid_transfers'] = LpVariable("paid_transfers", lowBound=0, upBound=SQUAD_SIZE, cat='Integer')
+    vars['starters'] = starters
+    vars['bench'] = bench
+    vars['new'] = new
+    return vars
+
+# ============================================================================
+# CONSTRAINTS
+# ============================================================================
+
+def add_compact_constraints(prob, vars, df_players, my_team, bench_criteria=None):
+    """
+    Add the squad, transfer and budget rules of the 13-variable model in aggregate form.
+
+    Args:
+        prob: PuLP problem instance
+        vars: Variables from create_compact_variables
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        bench_criteria: Keyword arguments for get_bench_eligibility_mask (optional)
+
+    Returns:
+        LpProblem: The problem with constraints added
+    """
+    squad, start, captain = vars['squad'], vars['start'], vars['captain']
+    starters, bench, new = vars['starters'], vars['bench'], vars['new']
+
+    # Linking: captain starts, starters are in the squad
+    for idx in squad:
+        prob += start[idx] <= squad[idx], f"Start_{idx}_In_Squad"
+        prob += captain[idx] <= start[idx], f"Captain_{idx}_Must_Start"
+
+    prob += lpSum(squad.values()) == SQUAD_SIZE, "Squad_Size"
+    prob += lpSum(start.values()) == STARTING_SIZE, "Starting_XI"
+    prob += lpSum(captain.values()) == 1, "One_Captain"
+
+    # Transfers replace like for like: bought starters replace sold starters, bought bench
+    # players replace sold bench players, and bench/XI swaps balance
+    prob += lpSum(start[idx] for idx in new) + lpSum(squad[idx] for idx in starters) == len(starters), \
+        "Flow_In_Starting_Out_Starting"
+    prob += lpSum(squad[idx] - start[idx] for idx in new) + lpSum(squad[idx] for idx in bench) == len(bench), \
+        "Flow_In_Bench_Out_Bench"
+    prob += lpSum(squad[idx] - start[idx] for idx in starters) == lpSum(start[idx] for idx in bench), \
+        "Flow_Swap_Start_Bench"
+
+    # Transfers beyond the free allowance are paid (FPL cap 5)
+    prob += lpSum(squad[idx] for idx in new) - vars['paid_transfers'] <= min(my_team.free_transfers, 5), \
+        FREE_TRANSFER_LIMIT_NAME
+
+    # Positions
+    for position, count in SQUAD_BY_POSITION.items():
+        indices = df_players.index[df_players['position'] == position]
+        prob += lpSum(squad[idx] for idx in indices if idx in squad) == count, f"Squad_{position}_{count}"
+
+        low, high = STARTING_BY_POSITION[position]
+        starting = lpSum(start[idx] for idx in indices if idx in start)
+        if low == high:
+            prob += starting == low, f"Starting_{position}_{low}"
+        else:
+            prob += starting >= low, f"Starting_{position}_Min_{low}"
+            prob += starting <= high, f"Starting_{position}_Max_{high}"
+
+    # At most three players per club
+    for team, indices in df_players.groupby('team').groups.items():
+        prob += lpSum(squad[idx] for idx in indices if idx in squad) <= MAX_PLAYERS_PER_TEAM, \
+            f"Max_3_Players_From_Team_{team}"
+
+    # Total squad cost
+    arrays = extract_player_arrays(df_players)
+    prob += build_linear_expression(squad, arrays['index'], arrays['price']) <= MAX_SQUAD_COST, "Budget_Constraint"
+
+    # Ineligible players cannot stay on or be bought to the bench (current starters may still drop to it)
+    if bench_criteria is not None:
+        eligible = get_bench_eligibility_mask(df_players, **bench_criteria)
+        for idx in bench + new:
+            if not eligible[idx]:
+                prob += squad[idx] <= start[idx], f"Bench_Ineligible_{idx}"
+
+    return prob
+
+# ============================================================================
+# OBJECTIVE
+# ============================================================================
+
+def add_compact_objective(prob, df_players, vars, penalty_points=4, base_opposing_penalty=1,
+                          fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise'):
+    """
+    Objective of the 13-variable model: starters' expected points with FDR adjustment,
+    captain bonus and opposing teams penalty, minus the hit per paid transfer.
+
+    Returns:
+        LpProblem: The problem with the objective set
+    """
+    arrays = extract_player_arrays(df_players)
+    expected_points = arrays['expected_points']
+
+    starting_coefficients = expected_points
+    if fdr_calculator is not None:
+        fdr_coefficients = get_fdr_coefficients(df_players, fdr_calculator, fdr_penalty_weight)
+        if fdr_coefficients is not None:
+            starting_coefficients = expected_points + fdr_coefficients
+
+    objective = build_linear_expression(vars['start'], arrays['index'], starting_coefficients)
+    objective.addInPlace(build_linear_expression(vars['captain'], arrays['index'], expected_points))
+    objective.addInPlace(LpAffineExpression([(vars['paid_transfers'], -float(penalty_points))]))
+
+    opposing_penalty_terms = add_opposing_teams_penalty_to_objective(
+        prob, df_players, vars, base_opposing_penalty,
+        formulation=opposing_formulation, starting_var_types=['start']
+    )
+    if opposing_penalty_terms:
+        objective.subInPlace(lpSum(opposing_penalty_terms))
+
+    prob += objective, "Total_Expected_Points_With_All_Penalties"
+
+    return prob
+
+# ============================================================================
+# MODEL BUILDER
+# ============================================================================
+
+def build_compact_problem(df_players, my_team, penalty_points=4, base_opposing_penalty=1,
+                          fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                          bench_criteria=None, profiler=None):
+    """
+    Build the compact transfer optimisation problem for one gameweek.
+
+    Takes the same arguments as build_optimisation_problem and has the same optimal
+    squads; use process_compact_results to get the usual squad output.
+
+    Returns:
+        tuple: (prob, vars)
+    """
+    prob = LpProblem("FPL_Transfer_Optimisation_Compact", LpMaximize)
+
+    with profile_span(profiler, 'decision_variables'):
+        vars = create_compact_variables(df_players, my_team)
+
+    with profile_span(profiler, 'objective', prob):
+        prob = add_compact_objective(
+            prob, df_players, vars,
+            penalty_points=penalty_points,
+            base_opposing_penalty=base_opposing_penalty,
+            fdr_calculator=fdr_calculator,
+            fdr_penalty_weight=fdr_penalty_weight,
+            opposing_formulation=opposing_formulation
+        )
+
+    with profile_span(profiler, 'constraints', prob):
+        prob = add_compact_constraints(prob, vars, df_players, my_team, bench_criteria=bench_criteria)
+
+    return prob, vars
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def extract_compact_decision_results(vars, free_transfers):
+    """
+    Map a compact solution back onto the 13 transition types.
+
+    Args:
+        vars: Solved variables from create_compact_variables
+        free_transfers: Free transfers available
+
+    Returns:
+        dict: Mapping of transition type to active player indices, as returned by
+              extract_decision_variable_results
+    """
+    def selected(var_type):
+        return {idx for idx, var in vars[var_type].items() if (var.value() or 0) > 0.5}
+
+    return map_selection_to_transitions(
+        vars['starters'], vars['bench'], vars['new'],
+        selected('squad'), selected('start'), selected('captain'),
+        free_transfers
+    )
+
+def map_selection_to_transitions(starters, bench, new, squad, start, captain, free_transfers):
+    """
+    Turn the selected squad, starters and captain into the 13 transition types.
+
+    Which transfers count as paid is arbitrary in both models; bought starters are
+    labelled free first, then bought bench players, and each sold player takes the label
+    of the purchase that replaced them.
+
+    Args:
+        starters, bench, new: Player indices by current role (from get_current_roles)
+        squad, start, captain: Sets of selected player indices
+        free_transfers: Free transfers available
+
+    Returns:
+        dict: Mapping of transition type to active player indices
+    """
+    results = {var_type: [] for var_type in [
+        'stay_starting', 'stay_bench', 'starting_to_bench', 'bench_to_starting',
+        'out_starting_free', 'out_starting_paid', 'out_bench_free', 'out_bench_paid',
+        'in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid',
+        'captain'
+    ]}
+
+    out_starting, out_bench, in_starting, in_bench = [], [], [], []
+    for idx in starters:
+        if idx not in squad:
+            out_starting.append(idx)
+        else:
+            results['stay_starting' if idx in start else 'starting_to_bench'].append(idx)
+    for idx in bench:
+        if idx not in squad:
+            out_bench.append(idx)
+        else:
+            results['bench_to_starting' if idx in start else 'stay_bench'].append(idx)
+    for idx in new:
+        if idx in squad:
+            (in_starting if idx in start else in_bench).append(idx)
+
+    free = min(min(free_transfers, 5), len(in_starting) + len(in_bench))
+    free_starting = min(free, len(in_starting))
+    free_bench = free - free_starting
+
+    results['in_to_starting_free'] = in_starting[:free_starting]
+    results['in_to_starting_paid'] = in_starting[free_starting:]
+    results['in_to_bench_free'] = in_bench[:free_bench]
+    results['in_to_bench_paid'] = in_bench[free_bench:]
+    results['out_starting_free'] = out_starting[:free_starting]
+    results['out_starting_paid'] = out_starting[free_starting:]
+    results['out_bench_free'] = out_bench[:free_bench]
+    results['out_bench_paid'] = out_bench[free_bench:]
+    results['captain'] = [idx for idx in starters + bench + new if idx in captain]
+
+    return results
+
+def process_compact_results(vars, df_players, my_team, prob):
+    """
+    Build the squad output of process_optimization_results from a solved compact model.
+
+    Returns:
+        dict: Squad output with starting_df, bench_df, out_df, captain, formation and decision_results
+    """
+    decision_results = extract_compact_decision_results(vars, my_team.free_transfers)
+    return create_squad_output(decision_results, df_players, prob)
@@ -1,10 +1,60 @@
 # bench_selection_constraints.py: Only select players for the bench if they had at least 59 minutes in fpl_players_gw_2.csv
 
-from pulp import LpProblem, LpVariable, lpSum, LpStatus, LpBinary
+import pandas as pd
 
-def add_bench_selection_constraints(prob, vars, df_players, 
-                                  min_minutes=59, 
-                                  min_price=4.0, 
+# Transitions that put a player on the bench and are subject to eligibility
+BENCH_ELIGIBILITY_VAR_TYPES = ['stay_bench', 'in_to_bench_free', 'in_to_bench_paid']
+
+def get_bench_eligibility_mask(df_players,
+                               min_minutes=59,
+                               min_price=4.0,
+                               max_price=6.0,
+                               min_expected_points=1.0,
+                               max_expected_points=8.0,
+                               min_ownership=0.1,
+                               max_ownership=50.0,
+                               allow_injured=False,
+                               min_form=0.0):
+    """
+    Compute which players meet every bench criterion.
+
+    Criteria whose column is missing from df_players are treated as met.
+
+    Returns:
+        pd.Series: Boolean mask aligned with df_players.index
+    """
+    eligible = pd.Series(True, index=df_players.index)
+
+    # 1. MINUTES - Must have played at least minimum minutes
+    if 'minutes' in df_players.columns:
+        eligible &= df_players['minutes'] >= min_minutes
+
+    # 2. PRICE - Must be within price range (bench players should be cheap)
+    eligible &= (df_players['price'] >= min_price) & (df_players['price'] <= max_price)
+
+    # 3. EXPECTED POINTS - Not too high (expensive) or too low (useless)
+    if 'expected_points' in df_players.columns:
+        expected_points = df_players['expected_points']
+        eligible &= (expected_points >= min_expected_points) & (expected_points <= max_expected_points)
+
+    # 4. OWNERSHIP - Avoid very popular players on bench
+    if 'selected_by_percent' in df_players.columns:
+        ownership_pct = df_players['selected_by_percent'].astype(float)
+        eligible &= (ownership_pct >= min_ownership) & (ownership_pct <= max_ownership)
+
+    # 5. AVAILABILITY - Exclude injured/suspended players if specified
+    if not allow_injured and 'status' in df_players.columns:
+        eligible &= df_players['status'].isin(['a', 'available', 'Available'])
+
+    # 6. FORM - Must have minimum form
+    if 'form' in df_players.columns:
+        eligible &= df_players['form'].astype(float) >= min_form
+
+    return eligible
+
+def add_bench_selection_constraints(prob, vars, df_players,
+                                  min_minutes=59,
+                                  min_price=4.0,
                                   max_price=6.0,
                                   min_expected_points=1.0,
                                   max_expected_points=8.0,
@@ -13,12 +63,18 @@ def add_bench_selection_constraints(prob, vars, df_players,
                                   allow_injured=False,
                                   min_form=0.0):
     """
-    Add comprehensive constraints for bench player selection.
-    
+    Restrict bench player selection to players meeting all eligibility criteria.
+
+    Every criterion is known before solving, so eligibility is computed as a mask and the
+    bench transitions (stay, free or paid transfer in) of ineligible players are removed
+    from vars instead of being modelled with auxiliary binaries. Removed variables are
+    also fixed at zero, so the call is safe after other constraints have used them; call
+    it before building the objective and constraints to keep them out of the model.
+
     Parameters:
     - min_minutes: Minimum minutes played in previous gameweek (default: 59)
     - min_price: Minimum player price for bench eligibility (default: 4.0)
-    - max_price: Maximum player price for bench eligibility (default: 6.0) 
+    - max_price: Maximum player price for bench eligibility (default: 6.0)
     - min_expected_points: Minimum expected points for next gameweek (default: 1.0)
     - max_expected_points: Maximum expected points (to avoid expensive players on bench) (default: 8.0)
     - min_ownership: Minimum ownership percentage (default: 0.1)
@@ -26,83 +82,24 @@ def add_bench_selection_constraints(prob, vars, df_players,
     - allow_injured: Whether to allow injured/doubtful players on bench (default: False)
     - min_form: Minimum form rating (default: 0.0)
     """
-    
-    # Create binary variables for different eligibility criteria
-    bench_eligible = LpVariable.dicts("BenchEligible", df_players.index, cat=LpBinary)
-    minutes_eligible = LpVariable.dicts("MinutesEligible", df_players.index, cat=LpBinary)
-    price_eligible = LpVariable.dicts("PriceEligible", df_players.index, cat=LpBinary)
-    points_eligible = LpVariable.dicts("PointsEligible", df_players.index, cat=LpBinary)
-    ownership_eligible = LpVariable.dicts("OwnershipEligible", df_players.index, cat=LpBinary)
-    availability_eligible = LpVariable.dicts("AvailabilityEligible", df_players.index, cat=LpBinary)
-    form_eligible = LpVariable.dicts("FormEligible", df_players.index, cat=LpBinary)
-
-    for idx in df_players.index:
-        player = df_players.loc[idx]
-        
-        # 1. MINUTES CONSTRAINT - Must have played at least minimum minutes
-        if 'minutes' in df_players.columns:
-            prob += (minutes_eligible[idx] <= (player['minutes'] >= min_minutes)), f"MinutesEligibility_{idx}"
-        else:
-            prob += (minutes_eligible[idx] == 1), f"MinutesEligibility_{idx}_NoData"
-        
-        # 2. PRICE CONSTRAINTS - Must be within price range (bench players should be cheap)
-        prob += (price_eligible[idx] <= (player['price'] >= min_price)), f"MinPriceEligibility_{idx}"
-        prob += (price_eligible[idx] <= (player['price'] <= max_price)), f"MaxPriceEligibility_{idx}"
-        
-        # 3. EXPECTED POINTS CONSTRAINTS - Not too high (expensive) or too low (useless)
-        if 'expected_points' in df_players.columns:
-            prob += (points_eligible[idx] <= (player['expected_points'] >= min_expected_points)), f"MinPointsEligibility_{idx}"
-            prob += (points_eligible[idx] <= (player['expected_points'] <= max_expected_points)), f"MaxPointsEligibility_{idx}"
-        else:
-            prob += (points_eligible[idx] == 1), f"PointsEligibility_{idx}_NoData"
-        
-        # 4. OWNERSHIP CONSTRAINTS - Avoid very popular players on bench
-        if 'selected_by_percent' in df_players.columns:
-            ownership_pct = float(player['selected_by_percent'])
-            prob += (ownership_eligible[idx] <= (ownership_pct >= min_ownership)), f"MinOwnershipEligibility_{idx}"
-            prob += (ownership_eligible[idx] <= (ownership_pct <= max_ownership)), f"MaxOwnershipEligibility_{idx}"
-        else:
-            prob += (ownership_eligible[idx] == 1), f"OwnershipEligibility_{idx}_NoData"
-        
-        # 5. AVAILABILITY CONSTRAINTS - Exclude injured/suspended players if specified
-        if not allow_injured and 'status' in df_players.columns:
-            is_available = player['status'] in ['a', 'available', 'Available']
-            prob += (availability_eligible[idx] <= is_available), f"AvailabilityEligibility_{idx}"
-        else:
-            prob += (availability_eligible[idx] == 1), f"AvailabilityEligibility_{idx}_NoData"
-        
-        # 6. FORM CONSTRAINTS - Must have minimum form
-        if 'form' in df_players.columns:
-            prob += (form_eligible[idx] <= (float(player['form']) >= min_form)), f"FormEligibility_{idx}"
-        else:
-            prob += (form_eligible[idx] == 1), f"FormEligibility_{idx}_NoData"
-        
-        # 7. OVERALL ELIGIBILITY - Player must meet ALL criteria
-        prob += (bench_eligible[idx] <= minutes_eligible[idx]), f"BenchEligibility_Minutes_{idx}"
-        prob += (bench_eligible[idx] <= price_eligible[idx]), f"BenchEligibility_Price_{idx}"
-        prob += (bench_eligible[idx] <= points_eligible[idx]), f"BenchEligibility_Points_{idx}"
-        prob += (bench_eligible[idx] <= ownership_eligible[idx]), f"BenchEligibility_Ownership_{idx}"
-        prob += (bench_eligible[idx] <= availability_eligible[idx]), f"BenchEligibility_Availability_{idx}"
-        prob += (bench_eligible[idx] <= form_eligible[idx]), f"BenchEligibility_Form_{idx}"
-        
-        # If player meets all criteria, they can be eligible
-        prob += (bench_eligible[idx] >= 
-                minutes_eligible[idx] + price_eligible[idx] + points_eligible[idx] + 
-                ownership_eligible[idx] + availability_eligible[idx] + form_eligible[idx] - 5), f"BenchEligibility_All_{idx}"
-
-    # Apply eligibility to bench selection variables
-    for idx in df_players.index:
-        # Only eligible players can stay on bench
-        if 'stay_bench' in vars:
-            prob += (vars['stay_bench'][idx] <= bench_eligible[idx]), f"StayBenchEligibility_{idx}"
-        
-        # Only eligible players can be moved to bench
-        if 'in_to_bench_free' in vars:
-            prob += (vars['in_to_bench_free'][idx] <= bench_eligible[idx]), f"InToBenchFreeEligibility_{idx}"
-        
-        if 'in_to_bench_paid' in vars:
-            prob += (vars['in_to_bench_paid'][idx] <= bench_eligible[idx]), f"InToBenchPaidEligibility_{idx}"
-
-    
-
-    return prob
\ No newline at end of file
+    eligible = get_bench_eligibility_mask(
+        df_players,
+        min_minutes=min_minutes,
+        min_price=min_price,
+        max_price=max_price,
+        min_expected_points=min_expected_points,
+        max_expected_points=max_expected_points,
+        min_ownership=min_ownership,
+        max_ownership=max_ownership,
+        allow_injured=allow_injured,
+        min_form=min_form
+    )
+
+    # Remove bench transitions for ineligible players
+    for idx in df_players.index[~eligible.to_numpy()]:
+        for var_type in BENCH_ELIGIBILITY_VAR_TYPES:
+            var = vars.get(var_type, {}).pop(idx, None)
+            if var is not None:
+                var.upBound = 0
+
+    return prob
@@ -13,12 +13,14 @@ def add_captain_constraints(prob, vars, df_players):
 
     # Captain must be in starting XI
     for idx in df_players.index:
+        if idx not in vars['captain']:
+            continue
         starting_sum = (
             vars['stay_starting'].get(idx, 0) +
             vars['bench_to_starting'].get(idx, 0) +
             vars['in_to_starting_free'].get(idx, 0) +
             vars['in_to_starting_paid'].get(idx, 0)
         )
-        prob += vars['captain'].get(idx, 0) <= starting_sum, f"Captain_{idx}_Must_Start"
+        prob += vars['captain'][idx] <= starting_sum, f"Captain_{idx}_Must_Start"
 
     return prob
@@ -1,5 +1,8 @@
 from pulp import lpSum
 
+# Constraint name kept independent of the limit so the right-hand side can be changed in place
+FREE_TRANSFER_LIMIT_NAME = "Max_Free_Transfers"
+
 def add_free_transfer_limit_constraint(prob, vars, df_players, my_team):
     """
     Limit the number of free transfers in the upcoming gameweek (flat 13-variable structure).
@@ -15,6 +18,13 @@ def add_free_transfer_limit_constraint(prob, vars, df_players, my_team):
     ])
 
     # Constraint: cannot exceed available free transfers
-    prob += free_transfers_in <= max_free_transfers, f"Max_{max_free_transfers}_Free_Transfers"
+    prob += free_transfers_in <= max_free_transfers, FREE_TRANSFER_LIMIT_NAME
+
+    return prob
 
+def set_free_transfer_limit(prob, free_transfers):
+    """
+    Change the free transfer limit of an already built problem.
+    """
+    prob.constraints[FREE_TRANSFER_LIMIT_NAME].changeRHS(min(free_transfers, 5))
     return prob
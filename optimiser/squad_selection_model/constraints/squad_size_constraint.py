@@ -28,20 +28,12 @@ def add_squad_size_constraints(prob, vars, df_players):
     prob += bench_players == 4, "Bench_Size"
 
 
+    decision_types = [var_type for var_type in vars if var_type != 'captain']
     for idx in df_players.index:
-        prob += lpSum([
-            vars['stay_starting'].get(idx, 0),
-            vars['stay_bench'].get(idx, 0),
-            vars['starting_to_bench'].get(idx, 0),
-            vars['bench_to_starting'].get(idx, 0),
-            vars['out_starting_free'].get(idx, 0),
-            vars['out_starting_paid'].get(idx, 0),
-            vars['out_bench_free'].get(idx, 0),
-            vars['out_bench_paid'].get(idx, 0),
-            vars['in_to_starting_free'].get(idx, 0),
-            vars['in_to_starting_paid'].get(idx, 0),
-            vars['in_to_bench_free'].get(idx, 0),
-            vars['in_to_bench_paid'].get(idx, 0)
-        ]) <= 1, f"OneDecisionPerPlayer_{idx}"
+        player_vars = [vars[var_type][idx] for var_type in decision_types if idx in vars[var_type]]
+
+        # A single binary already satisfies the limit, so only constrain players with a choice
+        if len(player_vars) > 1:
+            prob += lpSum(player_vars) <= 1, f"OneDecisionPerPlayer_{idx}"
         
     return prob
\ No newline at end of file
@@ -18,14 +18,14 @@ def add_team_constraints(prob, vars, df_players):
         
         # Add constraint for this team
         prob += (
-            lpSum(vars['stay_starting'][idx] + 
-                  vars['stay_bench'][idx] +
-                vars['in_to_starting_free'][idx] + 
-                vars['in_to_starting_paid'][idx] +
-                   vars['in_to_bench_free'][idx] + 
-                   vars['in_to_bench_paid'][idx] +
-                     vars['starting_to_bench'][idx] +
-                     vars['bench_to_starting'][idx] 
+            lpSum(vars['stay_starting'].get(idx, 0) + 
+                  vars['stay_bench'].get(idx, 0) +
+                vars['in_to_starting_free'].get(idx, 0) + 
+                vars['in_to_starting_paid'].get(idx, 0) +
+                   vars['in_to_bench_free'].get(idx, 0) + 
+                   vars['in_to_bench_paid'].get(idx, 0) +
+                     vars['starting_to_bench'].get(idx, 0) +
+                     vars['bench_to_starting'].get(idx, 0) 
                    for idx in team_indices) <= 3,
             f"Max_3_Players_From_Team_{team}"
         )
@@ -2,39 +2,59 @@
 
 from pulp import LpVariable
 
-def create_decision_variables(df_players):
-    vars = {
-        'stay_starting': {},
-        'stay_bench': {},
-        'starting_to_bench': {},
-        'bench_to_starting': {},
-        'out_starting_free': {},
-        'out_starting_paid': {},
-        'out_bench_free': {},
-        'out_bench_paid': {},
-        'in_to_starting_free': {},
-        'in_to_starting_paid': {},
-        'in_to_bench_free': {},
-        'in_to_bench_paid': {},
-        'captain': {}
-    }
-    
-    for idx in df_players.index:
-        vars['stay_starting'][idx]       = LpVariable(f"stay_starting_{idx}", cat='Binary')
-        vars['stay_bench'][idx]          = LpVariable(f"stay_bench_{idx}", cat='Binary')
-        vars['starting_to_bench'][idx]   = LpVariable(f"starting_to_bench_{idx}", cat='Binary')
-        vars['bench_to_starting'][idx]   = LpVariable(f"bench_to_starting_{idx}", cat='Binary')
-        
-        vars['out_starting_free'][idx]   = LpVariable(f"out_starting_free_{idx}", cat='Binary')
-        vars['out_starting_paid'][idx]   = LpVariable(f"out_starting_paid_{idx}", cat='Binary')
-        vars['out_bench_free'][idx]      = LpVariable(f"out_bench_free_{idx}", cat='Binary')
-        vars['out_bench_paid'][idx]      = LpVariable(f"out_bench_paid_{idx}", cat='Binary')
-        
-        vars['in_to_starting_free'][idx] = LpVariable(f"in_to_starting_free_{idx}", cat='Binary')
-        vars['in_to_starting_paid'][idx] = LpVariable(f"in_to_starting_paid_{idx}", cat='Binary')
-        vars['in_to_bench_free'][idx]    = LpVariable(f"in_to_bench_free_{idx}", cat='Binary')
-        vars['in_to_bench_paid'][idx]    = LpVariable(f"in_to_bench_paid_{idx}", cat='Binary')
-        
-        vars['captain'][idx]             = LpVariable(f"captain_{idx}", cat='Binary')
-    
+VAR_TYPES = [
+    'stay_starting', 'stay_bench', 'starting_to_bench', 'bench_to_starting',
+    'out_starting_free', 'out_starting_paid', 'out_bench_free', 'out_bench_paid',
+    'in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid',
+    'captain'
+]
+
+# Transitions available to each kind of player when the current team is known
+STARTER_VAR_TYPES = ['stay_starting', 'starting_to_bench', 'out_starting_free', 'out_starting_paid', 'captain']
+BENCH_PLAYER_VAR_TYPES = ['stay_bench', 'bench_to_starting', 'out_bench_free', 'out_bench_paid', 'captain']
+NEW_PLAYER_VAR_TYPES = ['in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid', 'captain']
+
+def create_decision_variables(df_players, my_team=None):
+    """
+    Create binary decision variables for each player transition.
+
+    Without a team, all 13 variables are created for every player. With a team, only the
+    transitions a player can actually make are created: current starters can stay, move
+    to the bench or be sold; bench players can stay, move into the XI or be sold; other
+    players can only be bought, and only if available. Constraint modules treat missing
+    keys as zero.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad (optional)
+
+    Returns:
+        dict: Mapping of variable type to {player index: LpVariable}
+    """
+    vars = {var_type: {} for var_type in VAR_TYPES}
+
+    if my_team is None:
+        allowed = {idx: VAR_TYPES for idx in df_players.index}
+    else:
+        player_ids = df_players['id']
+        is_starter = player_ids.isin(my_team.starting_ids)
+        is_bench = player_ids.isin(my_team.bench_ids)
+        if 'status' in df_players.columns:
+            is_available = df_players['status'] == 'a'
+        else:
+            is_available = [True] * len(df_players)
+
+        allowed = {}
+        for idx, starter, bench, available in zip(df_players.index, is_starter, is_bench, is_available):
+            if starter:
+                allowed[idx] = STARTER_VAR_TYPES
+            elif bench:
+                allowed[idx] = BENCH_PLAYER_VAR_TYPES
+            elif available:
+                allowed[idx] = NEW_PLAYER_VAR_TYPES
+
+    for idx, var_types in allowed.items():
+        for var_type in var_types:
+            vars[var_type][idx] = LpVariable(f"{var_type}_{idx}", cat='Binary')
+
     return vars
@@ -4,11 +4,11 @@ FDR (Fixture Difficulty Rating) module for FPL optimization
 Calculates FDR-based penalties and bonuses for the objective function
 """
 
-import requests
-import pandas as pd
 import io
 import sys
-from pulp import lpSum
+
+from fpl_data.client import get_client
+from fpl_data.storage import read_table
 
 class FDRCalculator:
     """Calculate FDR ratings and penalties for optimization"""
@@ -30,8 +30,7 @@ class FDRCalculator:
         """Fetch FDR data from FPL API"""
         try:
             # Get bootstrap data for current gameweek
-            response = requests.get('https://fantasy.premierleague.com/api/bootstrap-static/')
-            data = response.json()
+            data = get_client().get_json('bootstrap-static/')
             
             # Get current gameweek
             events = data['events']
@@ -44,8 +43,7 @@ class FDRCalculator:
             teams = {team['id']: team['name'] for team in data['teams']}
             
             # Get fixtures
-            fixtures_response = requests.get('https://fantasy.premierleague.com/api/fixtures/')
-            fixtures = fixtures_response.json()
+            fixtures = get_client().get_json('fixtures/')
             
             # Calculate FDR ratings
             self.team_fdr_ratings = self._calculate_team_fdr(fixtures, teams)
@@ -130,8 +128,11 @@ class FDRCalculator:
 class CSVFDRCalculator:
     """FDR Calculator that uses pre-calculated CSV data"""
     
-    def __init__(self, csv_path='data/fpl_players_gw_4.csv'):
-        self.team_fdr_ratings = get_team_fdr_from_csv(csv_path)
+    def __init__(self, csv_path='data/fpl_players_gw_4.csv', df_players=None):
+        if df_players is not None:
+            self.team_fdr_ratings = get_team_fdr_from_dataframe(df_players)
+        else:
+            self.team_fdr_ratings = get_team_fdr_from_csv(csv_path)
         
     def get_fdr_multiplier(self, team_id):
         """Get FDR multiplier for a team"""
@@ -148,38 +149,29 @@ class CSVFDRCalculator:
         return multiplier * base_points
 
 
-def add_fdr_penalty_to_objective(prob, df_players, vars, fdr_calculator, base_penalty=0.5):
+def get_fdr_coefficients(df_players, fdr_calculator, base_penalty=0.5):
     """
-    Add FDR-based penalties/bonuses to the objective function
+    Get per-player FDR penalty/bonus points aligned with df_players.index
+    
+    The calculator is queried once per team rather than once per player.
     
     Args:
-        prob: PuLP problem instance
         df_players: DataFrame with player data
-        vars: Dictionary of decision variables
         fdr_calculator: FDRCalculator instance
         base_penalty: Base penalty points for FDR scaling
         
     Returns:
-        list: FDR penalty terms for the objective function
+        np.ndarray: FDR points per player, or None if no FDR data is available
     """
     if not fdr_calculator.team_fdr_ratings:
         print("Warning: No FDR data available")
-        return []
-    
-    fdr_terms = []
-    
-    # Apply FDR penalty/bonus to all starting players
-    for var_type in ['stay_starting', 'bench_to_starting', 'in_to_starting_free', 'in_to_starting_paid']:
-        if var_type in vars:
-            for idx, var in vars[var_type].items():
-                if idx in df_players.index:
-                    team_id = df_players.loc[idx, 'team_id']
-                    fdr_penalty = fdr_calculator.get_fdr_penalty_points(team_id, base_penalty)
-                    
-                    # Add FDR term (positive for good fixtures, negative for bad)
-                    fdr_terms.append(fdr_penalty * var)
+        return None
     
-    return fdr_terms
+    team_points = {
+        team_id: fdr_calculator.get_fdr_penalty_points(team_id, base_penalty)
+        for team_id in df_players['team_id'].unique()
+    }
+    return df_players['team_id'].map(team_points).to_numpy(dtype=float)
 
 
 def create_fdr_calculator(start_gw=None, weeks=5):
@@ -223,14 +215,14 @@ def get_team_fdr_from_csv(csv_path='data/fpl_players_gw_3_with_fdr.csv'):
     Get team FDR ratings from the CSV file we created earlier
     
     Args:
-        csv_path (str): Path to CSV with FDR data
+        csv_path (str): Path to the player table (CSV or Parquet) with FDR data
         
     Returns:
         dict: Mapping of team_id to FDR rating
     """
     try:
-        df = pd.read_csv(csv_path)
-        team_fdr_map = df[['team_id', 'team_fdr_5gw']].drop_duplicates().set_index('team_id')['team_fdr_5gw'].to_dict()
+        df = read_table(csv_path, columns=['team_id', 'team_fdr_5gw'])
+        team_fdr_map = get_team_fdr_from_dataframe(df)
         
         print(f"✅ Loaded FDR data from CSV for {len(team_fdr_map)} teams")
         return team_fdr_map
@@ -240,6 +232,19 @@ def get_team_fdr_from_csv(csv_path='data/fpl_players_gw_3_with_fdr.csv'):
         return {}
 
 
+def get_team_fdr_from_dataframe(df_players):
+    """
+    Get team FDR ratings from player data already in memory
+    
+    Args:
+        df_players: DataFrame with team_id and team_fdr_5gw columns
+        
+    Returns:
+        dict: Mapping of team_id to FDR rating
+    """
+    return df_players[['team_id', 'team_fdr_5gw']].drop_duplicates().set_index('team_id')['team_fdr_5gw'].to_dict()
+
+
 def capture_opposing_teams_analysis(df_players, squad, base_penalty=1.0):
     """Capture opposing teams analysis output"""
     try:
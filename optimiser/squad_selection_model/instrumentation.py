@@ -0,0 +1,124 @@
+# instrumentation.py
+# Lightweight timing spans for each stage of an optimiser run, reported as JSON
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+class RunProfiler:
+    """
+    Record nested timing spans for a run.
+
+    Each span records elapsed time, the variables and constraints it added to the
+    problem (when one is given) and, with track_memory, the peak traced memory while
+    it was open.
+
+    Example:
+        profiler = RunProfiler()
+        with profiler.span('load_csv'):
+            df_players = pd.read_csv(path)
+        with profiler.span('build_model', prob):
+            ...
+        profiler.write_json('run_profile.json')
+    """
+
+    def __init__(self, name='optimiser', track_memory=False):
+        """
+        Args:
+            name: Run name written to the report
+            track_memory: Whether to record peak memory with tracemalloc (slows allocation-heavy code
+                and inflates the recorded times)
+        """
+        self.name = name
+        self.track_memory = track_memory
+        self.spans = []
+        self._stack = []  # Open spans: [record, peak bytes seen so far]
+        self._started_at = datetime.now()
+        self._start = time.perf_counter()
+
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, prob=None):
+        """
+        Time a block of code.
+
+        Args:
+            name: Span name (nested spans are reported with their parent's name as prefix)
+            prob: PuLP problem whose variable and constraint counts are tracked (optional)
+        """
+        full_name = '.'.join([entry[0]['name'] for entry in self._stack[-1:]] + [name])
+        record = {'name': full_name, 'depth': len(self._stack)}
+
+        variables_before = prob.numVariables() if prob is not None else None
+        constraints_before = len(prob.constraints) if prob is not None else None
+
+        if self.track_memory:
+            self._fold_peak_into_parent()
+        self._stack.append([record, 0])
+        start = time.perf_counter()
+        record['start_offset'] = start - self._start
+
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+
+            if prob is not None:
+                record['variables_added'] = prob.numVariables() - variables_before
+                record['constraints_added'] = len(prob.constraints) - constraints_before
+
+            _, peak = self._stack.pop()
+            if self.track_memory:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record['peak_memory_mb'] = peak / 1024 ** 2
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                tracemalloc.reset_peak()
+
+            self.spans.append(record)
+
+    def _fold_peak_into_parent(self):
+        """Save the parent's peak before a child span resets the tracemalloc peak."""
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    def report(self):
+        """
+        Build the run report.
+
+        Returns:
+            dict: Run name, start time, total seconds and spans in start order
+        """
+        return {
+            'run': self.name,
+            'started_at': self._started_at.isoformat(timespec='seconds'),
+            'total_seconds': time.perf_counter() - self._start,
+            'spans': sorted(self.spans, key=lambda record: record['start_offset']),
+        }
+
+    def write_json(self, path):
+        """Write the run report to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def print_summary(self):
+        """Print one line per span, indented by nesting depth."""
+        print(f"{'Stage':<45} {'Time (s)':>9} {'Vars':>8} {'Cons':>8} {'Peak MB':>9}")
+        for record in self.report()['spans']:
+            label = '  ' * record['depth'] + record['name'].split('.')[-1]
+            variables = record.get('variables_added', '')
+            constraints = record.get('constraints_added', '')
+            peak = f"{record['peak_memory_mb']:.1f}" if 'peak_memory_mb' in record else ''
+            print(f"{label:<45} {record['seconds']:>9.3f} {variables:>8} {constraints:>8} {peak:>9}")
+
+def profile_span(profiler, name, prob=None):
+    """Return profiler.span(name, prob), or a no-op context when profiler is None."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, prob)
@@ -0,0 +1,89 @@
+# model_builder.py
+# Assemble the transfer optimisation problem: decision variables, objective and constraints
+
+from pulp import LpProblem, LpMaximize
+from decision_variables import create_decision_variables
+from objective_function import add_objective_function
+from constraints import *
+from instrumentation import profile_span
+
+def build_optimisation_problem(df_players, my_team, penalty_points=4, base_opposing_penalty=1,
+                               fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                               bench_criteria=None, chip=None, profiler=None):
+    """
+    Build the full transfer optimisation problem for one gameweek.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        penalty_points: Points penalty for paid transfers
+        base_opposing_penalty: Base penalty for opposing teams
+        fdr_calculator: FDR calculator instance (optional)
+        fdr_penalty_weight: Weight for FDR penalties
+        opposing_formulation: Opposing teams penalty formulation, 'pairwise' or 'fixture'
+        bench_criteria: Keyword arguments for add_bench_selection_constraints (optional);
+            ineligible bench transitions are removed before the model is built
+        chip: Chip played this gameweek, one of objective_function.CHIPS (optional)
+        profiler: RunProfiler recording a span per build stage and constraint module (optional)
+
+    Returns:
+        tuple: (prob, vars)
+    """
+    prob = LpProblem("FPL_Transfer_Optimisation", LpMaximize)
+
+    # Only create the transitions each player can make given the current squad
+    with profile_span(profiler, 'decision_variables'):
+        vars = create_decision_variables(df_players, my_team)
+    if bench_criteria is not None:
+        with profile_span(profiler, 'bench_selection', prob):
+            prob = add_bench_selection_constraints(prob, vars, df_players, **bench_criteria)
+
+    with profile_span(profiler, 'objective', prob):
+        prob = add_objective_function(
+            prob, df_players, vars,
+            penalty_points=penalty_points,
+            base_opposing_penalty=base_opposing_penalty,
+            fdr_calculator=fdr_calculator,
+            fdr_penalty_weight=fdr_penalty_weight,
+            opposing_formulation=opposing_formulation,
+            chip=chip
+        )
+
+    prob = add_model_constraints(prob, vars, df_players, my_team, profiler=profiler)
+
+    return prob, vars
+
+def add_model_constraints(prob, vars, df_players, my_team, profiler=None):
+    """
+    Add every squad, transfer and budget constraint to the problem.
+
+    Args:
+        prob: PuLP problem instance
+        vars: Dictionary of decision variables
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        profiler: RunProfiler recording a span per constraint module (optional)
+
+    Returns:
+        LpProblem: The problem with constraints added
+    """
+    with profile_span(profiler, 'constraints.squad_size', prob):
+        prob = add_squad_size_constraints(prob, vars, df_players)
+    with profile_span(profiler, 'constraints.captain', prob):
+        prob = add_captain_constraints(prob, vars, df_players)
+    with profile_span(profiler, 'constraints.equal_flow', prob):
+        prob = add_equal_flow_constraints(prob, vars, df_players)
+    with profile_span(profiler, 'constraints.status', prob):
+        prob = add_status_constraints(prob, vars, df_players, my_team)
+    with profile_span(profiler, 'constraints.positional', prob):
+        prob = add_positional_constraints(prob, vars, df_players)
+    with profile_span(profiler, 'constraints.free_transfer_limit', prob):
+        prob = add_free_transfer_limit_constraint(prob, vars, df_players, my_team)
+    with profile_span(profiler, 'constraints.availability', prob):
+        prob = add_availability_constraints(prob, vars, df_players, my_team)
+    with profile_span(profiler, 'constraints.budget', prob):
+        prob = add_budget_constraint(prob, vars, df_players, my_team.current_team)
+    with profile_span(profiler, 'constraints.team', prob):
+        prob = add_team_constraints(prob, vars, df_players)
+
+    return prob
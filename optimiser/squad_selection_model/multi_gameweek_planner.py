@@ -0,0 +1,472 @@
+# multi_gameweek_planner.py
+# Rolling-horizon transfer planner: transfers, free transfer banking and lineups over several gameweeks
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from pulp import LpProblem, LpMaximize, LpVariable, LpAffineExpression, lpSum
+from compact_formulation import (
+    get_current_roles,
+    SQUAD_SIZE, STARTING_SIZE, MAX_PLAYERS_PER_TEAM, MAX_SQUAD_COST, SQUAD_BY_POSITION, STARTING_BY_POSITION
+)
+from solver_config import add_solver_arguments, solver_config_from_args, solve_problem
+
+from fpl_data.storage import read_player_data, read_table
+
+DEFAULT_TIMETABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'timetable_data', 'timetable.parquet')
+
+# Timetable columns the planner uses
+TIMETABLE_COLUMNS = ['gameweek', 'team_h_id', 'team_a_id', 'team_h_difficulty', 'team_a_difficulty']
+
+# FPL caps banked free transfers at five
+MAX_FREE_TRANSFERS = 5
+
+# Expected points multiplier per fixture by FDR (1 = easiest, 5 = hardest)
+FDR_POINTS_MULTIPLIER = {1: 1.2, 2: 1.1, 3: 1.0, 4: 0.9, 5: 0.8}
+
+# ============================================================================
+# EXPECTED POINTS PER GAMEWEEK
+# ============================================================================
+
+def load_timetable(path=DEFAULT_TIMETABLE):
+    """
+    Load the fixture timetable written by timetable_data_collection.py.
+
+    Reads timetable.parquet, or timetable.csv when only that exists.
+
+    Returns:
+        pd.DataFrame: One row per fixture (gameweek, team_h_id, team_a_id and difficulties);
+                      fixtures without a gameweek (postponed) are dropped
+    """
+    timetable = read_table(path, columns=TIMETABLE_COLUMNS)
+    timetable = timetable.dropna(subset=['gameweek'])
+    timetable['gameweek'] = timetable['gameweek'].astype(int)
+    return timetable
+
+def get_fixture_weights(timetable, team_ids, gameweeks):
+    """
+    Sum of FDR multipliers over each club's fixtures in each gameweek.
+
+    A blank gameweek has weight 0 and a double gameweek roughly 2.
+
+    Returns:
+        pd.DataFrame: Weights indexed by team_id with one column per gameweek
+    """
+    fixtures = timetable[timetable['gameweek'].isin(gameweeks)]
+    sides = pd.concat([
+        fixtures[['gameweek', 'team_h_id', 'team_h_difficulty']].set_axis(['gameweek', 'team_id', 'difficulty'], axis=1),
+        fixtures[['gameweek', 'team_a_id', 'team_a_difficulty']].set_axis(['gameweek', 'team_id', 'difficulty'], axis=1),
+    ])
+    sides['weight'] = sides['difficulty'].map(FDR_POINTS_MULTIPLIER).fillna(1.0)
+    weights = sides.pivot_table(index='team_id', columns='gameweek', values='weight', aggfunc='sum')
+    return weights.reindex(index=pd.Index(team_ids).unique(), columns=gameweeks).fillna(0.0)
+
+def project_expected_points(df_players, timetable, gameweeks):
+    """
+    Expected points per player and gameweek.
+
+    Columns named expected_points_gw<N> are used as given. Other gameweeks are projected
+    from a per-match rate: expected_points divided by the fixture weight of the first
+    gameweek (form when the club blanks in it), times each gameweek's fixture weight.
+
+    Args:
+        df_players: DataFrame with player data
+        timetable: Fixture timetable from load_timetable
+        gameweeks: List of gameweek numbers
+
+    Returns:
+        np.ndarray: (players x gameweeks) expected points, rows in df_players row order
+    """
+    weights = get_fixture_weights(timetable, df_players['team_id'], gameweeks)
+    player_weights = weights.reindex(df_players['team_id']).to_numpy()
+
+    first_weight = player_weights[:, 0]
+    expected_points = df_players['expected_points'].to_numpy(dtype=float)
+    fallback = df_players['form'].to_numpy(dtype=float) if 'form' in df_players.columns else np.zeros(len(df_players))
+    rate = np.where(first_weight > 0, expected_points / np.where(first_weight > 0, first_weight, 1.0), fallback)
+
+    projected = rate[:, None] * player_weights
+    for k, gameweek in enumerate(gameweeks):
+        column = f'expected_points_gw{gameweek}'
+        if column in df_players.columns:
+            projected[:, k] = df_players[column].to_numpy(dtype=float)
+
+    # Injured, suspended and unavailable players score nothing while their status lasts
+    if 'status' in df_players.columns:
+        projected[df_players['status'].isin(['i', 's', 'u']).to_numpy()] = 0.0
+
+    return projected
+
+# ============================================================================
+# WINDOW MODEL
+# ============================================================================
+
+def build_window_problem(df_players, expected_points, gameweeks, squad, free_transfers, candidates,
+                         penalty_points=4, decay=0.9):
+    """
+    Build the transfer model for one window of consecutive gameweeks.
+
+    Each gameweek has squad, start, captain, buy and sell binaries per candidate, with
+    squad[g] = squad[g-1] + buy[g] - sell[g]. Free transfers bank by one per gameweek up
+    to five: ft[g+1] <= ft[g] - free_used[g] + 1. Purchases beyond the free transfers
+    are paid. Later gameweeks are weighted by decay per week.
+
+    Args:
+        df_players: DataFrame with player data
+        expected_points: (players x gameweeks) array from project_expected_points, for this window
+        gameweeks: Gameweek numbers in the window
+        squad: Set of df_players indices in the squad before the window
+        free_transfers: Free transfers available in the first gameweek of the window
+        candidates: df_players indices that may be in the squad (must include squad)
+        penalty_points: Points penalty per paid transfer
+        decay: Objective weight multiplier per gameweek into the window
+
+    Returns:
+        tuple: (prob, vars) where vars holds {(idx, gameweek): LpVariable} dicts for
+               'squad', 'start', 'captain', 'buy' and 'sell', and {gameweek: LpVariable}
+               dicts for 'free_transfers', 'free_used' and 'paid'
+    """
+    prob = LpProblem("FPL_Multi_Gameweek_Plan", LpMaximize)
+    row = {idx: position for position, idx in enumerate(df_players.index)}
+    candidates = list(candidates)
+
+    available = set(df_players.index[df_players['status'] == 'a']) if 'status' in df_players.columns else set(candidates)
+    positions = df_players['position']
+    clubs = df_players['team']
+    prices = df_players['price']
+
+    vars = {name: {} for name in ['squad', 'start', 'captain', 'buy', 'sell', 'free_transfers', 'free_used', 'paid']}
+    objective = LpAffineExpression()
+
+    for k, gameweek in enumerate(gameweeks):
+        weight = decay ** k
+        purchases = []
+
+        for idx in candidates:
+            key = (idx, gameweek)
+            vars['squad'][key] = LpVariable(f"squad_{idx}_{gameweek}", cat='Binary')
+            vars['start'][key] = LpVariable(f"start_{idx}_{gameweek}", cat='Binary')
+            vars['captain'][key] = LpVariable(f"captain_{idx}_{gameweek}", cat='Binary')
+
+            previous = vars['squad'][(idx, gameweeks[k - 1])] if k > 0 else int(idx in squad)
+            in_squad_before = k > 0 or idx in squad
+            flow = vars['squad'][key] - previous
+
+            # Players can only be bought while available, and only sold if they could be in the squad
+            if idx in available and (k > 0 or idx not in squad):
+                vars['buy'][key] = LpVariable(f"buy_{idx}_{gameweek}", cat='Binary')
+                purchases.append(vars['buy'][key])
+                flow -= vars['buy'][key]
+            if in_squad_before:
+                vars['sell'][key] = LpVariable(f"sell_{idx}_{gameweek}", cat='Binary')
+                flow += vars['sell'][key]
+            prob += flow == 0, f"Squad_Flow_{idx}_{gameweek}"
+
+            prob += vars['start'][key] <= vars['squad'][key], f"Start_{idx}_{gameweek}_In_Squad"
+            prob += vars['captain'][key] <= vars['start'][key], f"Captain_{idx}_{gameweek}_Must_Start"
+
+            points = expected_points[row[idx], k]
+            if points:
+                objective.addInPlace(LpAffineExpression([
+                    (vars['start'][key], weight * points),
+                    (vars['captain'][key], weight * points),
+                ]))
+
+        squad_vars = [vars['squad'][(idx, gameweek)] for idx in candidates]
+        prob += lpSum(squad_vars) == SQUAD_SIZE, f"Squad_Size_{gameweek}"
+        prob += lpSum(vars['start'][(idx, gameweek)] for idx in candidates) == STARTING_SIZE, f"Starting_XI_{gameweek}"
+        prob += lpSum(vars['captain'][(idx, gameweek)] for idx in candidates) == 1, f"One_Captain_{gameweek}"
+
+        for position, count in SQUAD_BY_POSITION.items():
+            members = [idx for idx in candidates if positions[idx] == position]
+            prob += lpSum(vars['squad'][(idx, gameweek)] for idx in members) == count, f"Squad_{position}_{gameweek}"
+            low, high = STARTING_BY_POSITION[position]
+            starting = lpSum(vars['start'][(idx, gameweek)] for idx in members)
+            prob += starting >= low, f"Starting_{position}_Min_{gameweek}"
+            prob += starting <= high, f"Starting_{position}_Max_{gameweek}"
+
+        club_members = {}
+        for idx in candidates:
+            club_members.setdefault(clubs[idx], []).append(idx)
+        for club, members in club_members.items():
+            if len(members) > MAX_PLAYERS_PER_TEAM:
+                prob += lpSum(vars['squad'][(idx, gameweek)] for idx in members) <= MAX_PLAYERS_PER_TEAM, \
+                    f"Max_3_Players_From_Team_{club}_{gameweek}"
+
+        prob += LpAffineExpression(
+            (vars['squad'][(idx, gameweek)], float(prices[idx])) for idx in candidates
+        ) <= MAX_SQUAD_COST, f"Budget_{gameweek}"
+
+        # Free transfers: used ones come from the bank, the rest are paid
+        if k == 0:
+            available_free = min(free_transfers, MAX_FREE_TRANSFERS)
+        else:
+            available_free = LpVariable(f"free_transfers_{gameweek}", 1, MAX_FREE_TRANSFERS, cat='Integer')
+            previous_gameweek = gameweeks[k - 1]
+            prob += available_free <= vars['free_transfers'][previous_gameweek] - vars['free_used'][previous_gameweek] + 1, \
+                f"Bank_Free_Transfers_{gameweek}"
+        vars['free_transfers'][gameweek] = available_free
+        vars['free_used'][gameweek] = LpVariable(f"free_used_{gameweek}", 0, MAX_FREE_TRANSFERS, cat='Integer')
+        vars['paid'][gameweek] = LpVariable(f"paid_transfers_{gameweek}", 0, SQUAD_SIZE, cat='Integer')
+
+        prob += lpSum(purchases) <= vars['free_used'][gameweek] + vars['paid'][gameweek], f"Transfers_{gameweek}"
+        prob += vars['free_used'][gameweek] <= available_free, f"Free_Used_{gameweek}"
+
+        objective.addInPlace(LpAffineExpression([(vars['paid'][gameweek], -weight * penalty_points)]))
+
+    prob += objective, "Discounted_Expected_Points"
+    return prob, vars
+
+def select_window_candidates(df_players, expected_points, squad, candidates_per_position=None):
+    """
+    Players considered in a window: the current squad plus, per position, the best
+    available players by window expected points and the cheapest ones (to keep
+    budget-friendly bench options).
+
+    Args:
+        candidates_per_position: Players kept per position (all available players when None)
+
+    Returns:
+        list: df_players indices
+    """
+    if 'status' in df_players.columns:
+        available = df_players['status'].to_numpy() == 'a'
+    else:
+        available = np.ones(len(df_players), dtype=bool)
+
+    if candidates_per_position is None:
+        keep = available
+    else:
+        total_points = expected_points.sum(axis=1)
+        keep = np.zeros(len(df_players), dtype=bool)
+        positions = df_players['position'].to_numpy()
+        prices = df_players['price'].to_numpy(dtype=float)
+        for position in SQUAD_BY_POSITION:
+            rows = np.flatnonzero((positions == position) & available)
+            keep[rows[np.argsort(-total_points[rows], kind='stable')[:candidates_per_position]]] = True
+            keep[rows[np.argsort(prices[rows], kind='stable')[:max(1, candidates_per_position // 4)]]] = True
+
+    selected = set(df_players.index[keep]) | set(squad)
+    return sorted(selected)
+
+# ============================================================================
+# ROLLING HORIZON
+# ============================================================================
+
+def plan_transfers(df_players, my_team, timetable, start_gameweek=None, horizon=8, window=4, step=1,
+                   penalty_points=4, decay=0.9, candidates_per_position=None, solver_config=None):
+    """
+    Plan transfers, free transfer banking, lineups and captains over a horizon.
+
+    The horizon is solved in rolling windows: each window optimises `window` gameweeks,
+    the first `step` of them are fixed, and the next window starts from the resulting
+    squad and free transfer bank. window = step = horizon solves the horizon in one model.
+
+    Args:
+        df_players: DataFrame with player data (any unique index)
+        my_team: Team instance with the current squad and free transfers
+        timetable: Fixture timetable from load_timetable
+        start_gameweek: First gameweek to plan (default: the 'gameweek' column of df_players)
+        horizon: Number of gameweeks to plan
+        window: Gameweeks optimised together
+        step: Gameweeks fixed per window
+        penalty_points: Points penalty per paid transfer
+        decay: Objective weight multiplier per gameweek into a window
+        candidates_per_position: Limit the players considered per position (optional)
+        solver_config: SolverConfig instance (default: CBC without limits)
+
+    Returns:
+        dict: 'gameweeks' (one dict per planned gameweek), 'windows' (build and solve
+              statistics per window), 'expected_points', 'build_seconds' and 'solve_seconds'
+    """
+    if start_gameweek is None:
+        start_gameweek = int(df_players['gameweek'].iloc[0])
+    gameweeks = list(range(start_gameweek, start_gameweek + horizon))
+    window = max(window, step)
+    expected_points = project_expected_points(df_players, timetable, gameweeks)
+    row = {idx: position for position, idx in enumerate(df_players.index)}
+
+    starters, bench, _ = get_current_roles(df_players, my_team)
+    squad = set(starters + bench)
+    free_transfers = min(my_team.free_transfers, MAX_FREE_TRANSFERS)
+
+    plan = {'gameweeks': [], 'windows': [], 'expected_points': 0.0, 'build_seconds': 0.0, 'solve_seconds': 0.0}
+    offset = 0
+    while offset < horizon:
+        window_gameweeks = gameweeks[offset:offset + window]
+        window_points = expected_points[:, offset:offset + window]
+        candidates = select_window_candidates(df_players, window_points, squad, candidates_per_position)
+
+        start = time.perf_counter()
+        prob, vars = build_window_problem(
+            df_players, window_points, window_gameweeks, squad, free_transfers, candidates,
+            penalty_points=penalty_points, decay=decay
+        )
+        build_seconds = time.perf_counter() - start
+
+        stats = solve_problem(prob, solver_config)
+        if stats['objective'] is None:
+            raise RuntimeError(f"Window starting GW{window_gameweeks[0]} could not be solved: {stats['status']}")
+
+        plan['windows'].append({
+            'first_gameweek': window_gameweeks[0],
+            'gameweeks': len(window_gameweeks),
+            'candidates': len(candidates),
+            'variables': prob.numVariables(),
+            'constraints': len(prob.constraints),
+            'build_seconds': build_seconds,
+            **stats,
+        })
+        plan['build_seconds'] += build_seconds
+        plan['solve_seconds'] += stats['wall_seconds']
+
+        for k, gameweek in enumerate(window_gameweeks[:step]):
+            gameweek_plan = extract_gameweek_plan(vars, candidates, gameweek, squad, free_transfers, penalty_points)
+            gameweek_plan['expected_points'] = float(
+                sum(expected_points[row[idx], offset + k] for idx in gameweek_plan['starting'])
+                + expected_points[row[gameweek_plan['captain']], offset + k]
+            ) - gameweek_plan['hit']
+            plan['gameweeks'].append(gameweek_plan)
+            plan['expected_points'] += gameweek_plan['expected_points']
+
+            squad = set(gameweek_plan['squad'])
+            free_transfers = min(free_transfers - gameweek_plan['free_transfers_used'] + 1, MAX_FREE_TRANSFERS)
+
+        offset += step
+
+    return plan
+
+def extract_gameweek_plan(vars, candidates, gameweek, previous_squad, free_transfers, penalty_points):
+    """
+    Read one gameweek of a solved window.
+
+    Free transfers used and the paid count are recomputed from the number of purchases,
+    so the free transfer bank carried to the next window follows the FPL rule exactly.
+
+    Returns:
+        dict: gameweek, squad, starting, bench, captain (df_players indices), transfers_in,
+              transfers_out, free_transfers (available), free_transfers_used, paid_transfers, hit
+    """
+    def selected(name):
+        return [idx for idx in candidates if (vars[name][(idx, gameweek)].value() or 0) > 0.5]
+
+    squad = selected('squad')
+    starting = selected('start')
+    transfers_in = sorted(set(squad) - set(previous_squad))
+    transfers_out = sorted(set(previous_squad) - set(squad))
+    free_used = min(len(transfers_in), free_transfers)
+    paid = len(transfers_in) - free_used
+
+    return {
+        'gameweek': gameweek,
+        'squad': squad,
+        'starting': starting,
+        'bench': [idx for idx in squad if idx not in starting],
+        'captain': selected('captain')[0],
+        'transfers_in': transfers_in,
+        'transfers_out': transfers_out,
+        'free_transfers': free_transfers,
+        'free_transfers_used': free_used,
+        'paid_transfers': paid,
+        'hit': paid * penalty_points,
+    }
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def plan_to_dataframe(plan, df_players):
+    """
+    One row per planned gameweek with transfers, captain, free transfers and expected points.
+
+    Returns:
+        pd.DataFrame: Plan timetable
+    """
+    names = df_players['name']
+    rows = []
+    for gameweek_plan in plan['gameweeks']:
+        rows.append({
+            'gameweek': gameweek_plan['gameweek'],
+            'free_transfers': gameweek_plan['free_transfers'],
+            'transfers': len(gameweek_plan['transfers_in']),
+            'paid_transfers': gameweek_plan['paid_transfers'],
+            'hit': gameweek_plan['hit'],
+            'transfers_in': ', '.join(names[idx] for idx in gameweek_plan['transfers_in']),
+            'transfers_out': ', '.join(names[idx] for idx in gameweek_plan['transfers_out']),
+            'captain': names[gameweek_plan['captain']],
+            'starting_xi': ', '.join(names[idx] for idx in gameweek_plan['starting']),
+            'bench': ', '.join(names[idx] for idx in gameweek_plan['bench']),
+            'expected_points': round(gameweek_plan['expected_points'], 2),
+        })
+    return pd.DataFrame(rows)
+
+def print_plan(plan, df_players):
+    """Print the plan one gameweek per block, followed by solve statistics."""
+    names = df_players['name']
+    print("\n" + "=" * 60)
+    print("MULTI-GAMEWEEK TRANSFER PLAN")
+    print("=" * 60)
+    for gameweek_plan in plan['gameweeks']:
+        transfers = len(gameweek_plan['transfers_in'])
+        print(f"GW{gameweek_plan['gameweek']}: {transfers} transfer(s), "
+              f"{gameweek_plan['free_transfers']} free available, hit -{gameweek_plan['hit']} pts, "
+              f"xP {gameweek_plan['expected_points']:.1f}")
+        for idx_out, idx_in in zip(gameweek_plan['transfers_out'], gameweek_plan['transfers_in']):
+            print(f"  {names[idx_out]} -> {names[idx_in]}")
+        print(f"  Captain: {names[gameweek_plan['captain']]}")
+    print(f"Total expected points: {plan['expected_points']:.1f}")
+    print(f"{len(plan['windows'])} window(s), build {plan['build_seconds']:.2f}s, solve {plan['solve_seconds']:.2f}s")
+    print("=" * 60)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan transfers over several gameweeks")
+    parser.add_argument('--csv', default='data/fpl_players_gw_9.csv', help="Gameweek player CSV")
+    parser.add_argument('--team-id', type=int, default=2562804, help="FPL team ID for the current squad")
+    parser.add_argument('--timetable', default=DEFAULT_TIMETABLE, help="Fixture timetable (Parquet or CSV)")
+    parser.add_argument('--synthetic-players', type=int, default=None,
+                        help="Use a synthetic pool, squad and timetable instead of --csv, --team-id and --timetable")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start-gameweek', type=int, default=None)
+    parser.add_argument('--horizon', type=int, default=8)
+    parser.add_argument('--window', type=int, default=4)
+    parser.add_argument('--step', type=int, default=1)
+    parser.add_argument('--penalty-points', type=float, default=4)
+    parser.add_argument('--decay', type=float, default=0.9)
+    parser.add_argument('--candidates-per-position', type=int, default=None)
+    parser.add_argument('--output', default='transfer_plan.csv', help="Plan timetable CSV")
+    add_solver_arguments(parser)
+    args = parser.parse_args()
+
+    if args.synthetic_players:
+        from synthetic_instances import generate_instance, generate_timetable
+        df_players, my_team = generate_instance(args.synthetic_players, seed=args.seed)
+        timetable = generate_timetable(df_players, args.horizon, seed=args.seed, blank_rate=0.1, double_rate=0.1)
+    else:
+        from team_class import Team
+        df_players = read_player_data(args.csv)
+        my_team = Team(team_id=args.team_id)
+        timetable = load_timetable(args.timetable)
+
+    plan = plan_transfers(
+        df_players, my_team, timetable,
+        start_gameweek=args.start_gameweek,
+        horizon=args.horizon,
+        window=args.window,
+        step=args.step,
+        penalty_points=args.penalty_points,
+        decay=args.decay,
+        candidates_per_position=args.candidates_per_position,
+        solver_config=solver_config_from_args(args)
+    )
+    print_plan(plan, df_players)
+    plan_to_dataframe(plan, df_players).to_csv(args.output, index=False)
+    print(f"Plan written to {args.output}")
+
+if __name__ == "__main__":
+    main()
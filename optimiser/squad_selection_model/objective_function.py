@@ -1,14 +1,91 @@
 # objective_function.py
 # Function to add the objective function to the optimization problem
 
-from pulp import lpSum, LpVariable
+import numpy as np
+from pulp import lpSum, LpAffineExpression
 from opposing_teams import add_opposing_teams_penalty_to_objective
-from fdr import add_fdr_penalty_to_objective
+from fdr import get_fdr_coefficients
+from player_arrays import extract_player_arrays, build_linear_expression
 
-def add_objective_function(prob, df_players, vars, penalty_points, base_opposing_penalty=1.0, fdr_calculator=None, fdr_penalty_weight=0.5):
+# Chips change how one gameweek is scored (see chip_planner.py for choosing when to play them)
+CHIPS = ['wildcard', 'free_hit', 'bench_boost', 'triple_captain']
+
+# Chips under which every transfer is free
+UNLIMITED_TRANSFER_CHIPS = ['wildcard', 'free_hit']
+
+def compute_objective_coefficients(arrays, penalty_points, fdr_coefficients=None, chip=None):
+    """
+    Compute objective coefficient vectors for each decision variable type.
+
+    Chips are variants of the same objective: wildcard and free hit drop the paid
+    transfer hit, bench boost scores the bench like the starting XI, and triple captain
+    adds the captain's expected points twice instead of once.
+
+    Args:
+        arrays: Player arrays from extract_player_arrays
+        penalty_points: Points penalty for paid transfers
+        fdr_coefficients: Per-player FDR bonus/penalty for starters (optional)
+        chip: Chip played this gameweek, one of CHIPS (optional)
+
+    Returns:
+        dict: Mapping of variable type to coefficient array aligned with arrays['index']
+    """
+    if chip is not None and chip not in CHIPS:
+        raise ValueError(f"Unknown chip '{chip}', expected one of {CHIPS}")
+
+    expected_points = arrays['expected_points']
+    fdr = fdr_coefficients if fdr_coefficients is not None else np.zeros_like(expected_points)
+    if chip in UNLIMITED_TRANSFER_CHIPS:
+        penalty_points = 0
+
+    coefficients = {
+        # Starters score expected points plus the FDR adjustment
+        'stay_starting': expected_points + fdr,
+        'bench_to_starting': expected_points + fdr,
+        'in_to_starting_free': expected_points + fdr,
+        # Paid transfers into starting XI (expected points minus the hit)
+        'in_to_starting_paid': expected_points - penalty_points + fdr,
+        # Captain bonus (adds expected points again for the captain, i.e. double)
+        'captain': expected_points.copy(),
+        # Paid transfers into the bench only carry the hit
+        'in_to_bench_paid': np.full_like(expected_points, -float(penalty_points)),
+    }
+
+    if chip == 'bench_boost':
+        coefficients['stay_bench'] = expected_points + fdr
+        coefficients['starting_to_bench'] = expected_points + fdr
+        coefficients['in_to_bench_free'] = expected_points + fdr
+        coefficients['in_to_bench_paid'] = expected_points - penalty_points + fdr
+    elif chip == 'triple_captain':
+        coefficients['captain'] = 2 * expected_points
+
+    return coefficients
+
+def build_objective_expression(vars, arrays, coefficients):
+    """
+    Build the linear part of the objective from coefficient vectors.
+
+    Args:
+        vars: Dictionary of decision variables
+        arrays: Player arrays from extract_player_arrays
+        coefficients: Output of compute_objective_coefficients
+
+    Returns:
+        LpAffineExpression: Objective expression
+    """
+    objective = LpAffineExpression()
+    for var_type, var_coefficients in coefficients.items():
+        objective.addInPlace(build_linear_expression(vars[var_type], arrays['index'], var_coefficients))
+    return objective
+
+def add_objective_function(prob, df_players, vars, penalty_points, base_opposing_penalty=1.0, fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                           chip=None):
     """
     Objective: maximize expected points with transfer penalties, captain bonus, position-weighted opposing teams penalty, and FDR-based penalties.
 
+    Player data is extracted once into arrays and each variable type receives a single
+    coefficient vector, so the build does not touch df_players row by row.
+
     Args:
         prob: PuLP problem instance
         df_players: DataFrame with player data
@@ -17,58 +94,26 @@ def add_objective_function(prob, df_players, vars, penalty_points, base_opposing
         base_opposing_penalty: Base penalty for opposing teams
         fdr_calculator: FDR calculator instance (optional)
         fdr_penalty_weight: Weight for FDR penalties (default: 0.5)
+        opposing_formulation: Opposing teams penalty formulation, 'pairwise' or 'fixture'
+        chip: Chip played this gameweek, one of CHIPS (optional)
     """
-    # Regular points from players who are starting (stay, swap from bench, free transfer in)
-    regular_points = lpSum([
-        df_players.loc[idx, 'expected_points'] * (
-            vars['stay_starting'].get(idx, 0) +
-            vars['bench_to_starting'].get(idx, 0) +
-            vars['in_to_starting_free'].get(idx, 0)
-        )
-        for idx in df_players.index
-    ])
-
-    # Paid transfers into starting XI (expected points minus 4 hit)
-    paid_transfer_points = lpSum([
-        (df_players.loc[idx, 'expected_points'] - penalty_points) * vars['in_to_starting_paid'].get(idx, 0)
-        for idx in df_players.index
-    ])
-
-    # Captain bonus (adds expected points again for the captain, i.e. double)
-    captain_bonus = lpSum([
-        df_players.loc[idx, 'expected_points'] * vars['captain'].get(idx, 0)
-        for idx in df_players.index
-    ])
-
-    # Penalty for paid transfers into the bench (-penalty_points)
-    bench_transfer_penalty = lpSum([
-        penalty_points * vars['in_to_bench_paid'].get(idx, 0)
-        for idx in df_players.index
-    ])
+    arrays = extract_player_arrays(df_players)
+
+    # FDR-based penalties/bonuses for starters
+    fdr_coefficients = None
+    if fdr_calculator is not None:
+        fdr_coefficients = get_fdr_coefficients(df_players, fdr_calculator, fdr_penalty_weight)
+
+    coefficients = compute_objective_coefficients(arrays, penalty_points, fdr_coefficients, chip=chip)
+    objective = build_objective_expression(vars, arrays, coefficients)
 
     # Position-weighted opposing teams penalty (using consolidated module)
     opposing_penalty_terms = add_opposing_teams_penalty_to_objective(
-        prob, df_players, vars, base_opposing_penalty
+        prob, df_players, vars, base_opposing_penalty, formulation=opposing_formulation
     )
+    if opposing_penalty_terms:
+        objective.subInPlace(lpSum(opposing_penalty_terms))
 
-    # FDR-based penalties/bonuses
-    fdr_penalty_terms = []
-    if fdr_calculator is not None:
-        fdr_penalty_terms = add_fdr_penalty_to_objective(
-            prob, df_players, vars, fdr_calculator, fdr_penalty_weight
-        )
-
-    # Combine all components
-    opposing_penalty = lpSum(opposing_penalty_terms) if opposing_penalty_terms else 0
-    fdr_bonus = lpSum(fdr_penalty_terms) if fdr_penalty_terms else 0
-    
-    prob += (
-        regular_points
-        + paid_transfer_points
-        + captain_bonus
-        - bench_transfer_penalty
-        - opposing_penalty
-        + fdr_bonus
-    ), "Total_Expected_Points_With_All_Penalties"
+    prob += objective, "Total_Expected_Points_With_All_Penalties"
 
     return prob
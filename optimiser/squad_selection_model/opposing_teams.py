@@ -2,6 +2,19 @@
 # Consolidated opposing teams penalty system for FPL optimization
 
 from pulp import lpSum, LpVariable
+from player_arrays import STARTING_VAR_TYPES
+
+OPPOSING_FORMULATIONS = ('pairwise', 'fixture')
+
+# Upper bounds on starters from one club / in one position, used to size fixture counters
+MAX_STARTERS_PER_TEAM = 3
+MAX_STARTERS_BY_POSITION = {'Goalkeeper': 1, 'Defender': 5, 'Midfielder': 5, 'Forward': 3}
+
+# Name prefixes of the rows that define the penalty variables (warm_start.py finds them by prefix)
+PAIR_BOTH_CONSTRAINT = 'pair_constraint_both_'
+FIXTURE_COUNT_LINK_CONSTRAINT = 'fixture_count_link_'
+FIXTURE_UNIT_SUM_CONSTRAINT = 'fixture_unit_sum_'
+FIXTURE_PENALTY_LINK_CONSTRAINT = 'fixture_penalty_link_'
 
 # ============================================================================
 # POSITION PENALTY MATRIX
@@ -49,11 +62,76 @@ def get_penalty_for_positions(pos_i, pos_j):
     matrix = get_position_penalty_matrix()
     return matrix.get(pos_pair, 1.0)  # Default to 1.0 if not found
 
+# ============================================================================
+# PAIR GENERATION
+# ============================================================================
+
+def find_fixture_sides(df_players):
+    """
+    Group players into the two sides of each fixture.
+    
+    Players are grouped by (team_id, opponent_id); a fixture exists where the mirrored
+    group (opponent_id, team_id) is also present. Each fixture is returned once.
+    
+    Args:
+        df_players: DataFrame with team_id and opponent_id columns
+        
+    Returns:
+        list: (team_id, opponent_id, side_indices, opponent_side_indices) per fixture
+    """
+    if 'team_id' not in df_players.columns or 'opponent_id' not in df_players.columns:
+        return []
+    
+    sides = df_players.groupby(['team_id', 'opponent_id'], sort=False).groups
+    fixtures = []
+    
+    for (team_id, opponent_id), side in sides.items():
+        other_side = sides.get((opponent_id, team_id))
+        
+        # Visit each fixture once, from the side with the smaller key
+        if other_side is None or (team_id, opponent_id) > (opponent_id, team_id):
+            continue
+        fixtures.append((team_id, opponent_id, side, other_side))
+    
+    return fixtures
+
+def find_opposing_pairs(df_players):
+    """
+    Find all pairs of players whose teams face each other.
+    
+    Only the two sides of each fixture are joined, so the cost scales with the number
+    of real opposing pairs rather than with the square of the player pool.
+    
+    Args:
+        df_players: DataFrame with team_id, opponent_id and opponent columns
+        
+    Returns:
+        list: Sorted (i, j) index pairs with i < j
+    """
+    if 'opponent' in df_players.columns:
+        has_fixture = dict(zip(df_players.index, df_players['opponent'] != 'No fixture'))
+    else:
+        has_fixture = dict.fromkeys(df_players.index, True)
+    
+    pairs = []
+    for team_id, opponent_id, side, other_side in find_fixture_sides(df_players):
+        for i in side:
+            for j in other_side:
+                if i == j or (team_id == opponent_id and i > j):
+                    continue
+                low, high = (i, j) if i < j else (j, i)
+                if has_fixture[low]:
+                    pairs.append((low, high))
+    
+    pairs.sort()
+    return pairs
+
 # ============================================================================
 # OBJECTIVE FUNCTION INTEGRATION
 # ============================================================================
 
-def add_opposing_teams_penalty_to_objective(prob, df_players, vars, base_opposing_penalty=1.0):
+def add_opposing_teams_penalty_to_objective(prob, df_players, vars, base_opposing_penalty=1.0, formulation='pairwise',
+                                            starting_var_types=STARTING_VAR_TYPES):
     """
     Add position-weighted opposing teams penalty to the objective function.
     
@@ -64,80 +142,69 @@ def add_opposing_teams_penalty_to_objective(prob, df_players, vars, base_opposin
         df_players: DataFrame with player data including opponent information
         vars: Decision variables dictionary
         base_opposing_penalty: Base penalty value (multiplied by position weights)
+        formulation: 'pairwise' (one binary per opposing pair) or 'fixture'
+                     (integer counters per fixture side and position)
+        starting_var_types: Keys of vars whose variables place a player in the starting XI
         
     Returns:
         list: Penalty terms to subtract from objective function
     """
+    if formulation not in OPPOSING_FORMULATIONS:
+        raise ValueError(f"Unknown opposing teams formulation: {formulation}")
+    
     opposing_penalty_terms = []
     
     if base_opposing_penalty <= 0:
         return opposing_penalty_terms
     
+    if formulation == 'fixture':
+        return add_fixture_counter_penalty_to_objective(prob, df_players, vars, base_opposing_penalty, starting_var_types)
+    
     print(f"Adding position-weighted opposing teams penalty (base: {base_opposing_penalty} pts)")
     
-    player_indices = df_players.index.tolist()
+    positions = df_players['position'].to_dict()
+    starting_terms = {}  # Starting XI expression per player, built once
     pair_count = 0
     penalty_breakdown = {}  # Track penalties by position combination
     
-    for i in player_indices:
-        for j in player_indices:
-            if i >= j:  # Avoid duplicate pairs
-                continue
-                
-            player_i = df_players.loc[i]
-            player_j = df_players.loc[j]
-            
-            # Check if these players are from opposing teams
-            if (player_i.get('opponent_id') == player_j.get('team_id') and 
-                player_j.get('opponent_id') == player_i.get('team_id') and
-                player_i.get('opponent') != 'No fixture'):
-                
-                # Get positions
-                pos_i = player_i['position']
-                pos_j = player_j['position']
-                
-                # Get penalty multiplier using centralized function
-                penalty_multiplier = get_penalty_for_positions(pos_i, pos_j)
-                
-                # Skip if this combination should be ignored (e.g., GK vs GK)
-                if penalty_multiplier is None:
-                    continue
-                
-                actual_penalty = base_opposing_penalty * penalty_multiplier
-                
-                # Track penalty breakdown
-                pos_pair = tuple(sorted([pos_i, pos_j]))
-                if pos_pair not in penalty_breakdown:
-                    penalty_breakdown[pos_pair] = {'count': 0, 'total_penalty': 0}
-                penalty_breakdown[pos_pair]['count'] += 1
-                penalty_breakdown[pos_pair]['total_penalty'] += actual_penalty
-                
-                # Create binary indicator variable for this opposing pair
-                pair_indicator = LpVariable(f"opposing_pair_{i}_{j}", cat='Binary')
-                
-                # Calculate when each player is in starting XI
-                player_i_starting = (
-                    vars['stay_starting'].get(i, 0) +
-                    vars['bench_to_starting'].get(i, 0) +
-                    vars['in_to_starting_free'].get(i, 0) +
-                    vars['in_to_starting_paid'].get(i, 0)
-                )
-                
-                player_j_starting = (
-                    vars['stay_starting'].get(j, 0) +
-                    vars['bench_to_starting'].get(j, 0) +
-                    vars['in_to_starting_free'].get(j, 0) +
-                    vars['in_to_starting_paid'].get(j, 0)
-                )
-                
-                # Add constraints to link indicator to player selections
-                prob += pair_indicator <= player_i_starting, f"pair_constraint_i_{i}_{j}"
-                prob += pair_indicator <= player_j_starting, f"pair_constraint_j_{i}_{j}"
-                prob += pair_indicator >= player_i_starting + player_j_starting - 1, f"pair_constraint_both_{i}_{j}"
-                
-                # Add position-weighted penalty term
-                opposing_penalty_terms.append(actual_penalty * pair_indicator)
-                pair_count += 1
+    for i, j in find_opposing_pairs(df_players):
+        pos_i = positions[i]
+        pos_j = positions[j]
+        
+        # Get penalty multiplier using centralized function
+        penalty_multiplier = get_penalty_for_positions(pos_i, pos_j)
+        
+        # Skip if this combination should be ignored (e.g., GK vs GK)
+        if penalty_multiplier is None:
+            continue
+        
+        actual_penalty = base_opposing_penalty * penalty_multiplier
+        
+        # Track penalty breakdown
+        pos_pair = tuple(sorted([pos_i, pos_j]))
+        if pos_pair not in penalty_breakdown:
+            penalty_breakdown[pos_pair] = {'count': 0, 'total_penalty': 0}
+        penalty_breakdown[pos_pair]['count'] += 1
+        penalty_breakdown[pos_pair]['total_penalty'] += actual_penalty
+        
+        # Create binary indicator variable for this opposing pair
+        pair_indicator = LpVariable(f"opposing_pair_{i}_{j}", cat='Binary')
+        
+        # Calculate when each player is in starting XI
+        for idx in (i, j):
+            if idx not in starting_terms:
+                starting_terms[idx] = lpSum(vars[var_type].get(idx, 0) for var_type in starting_var_types)
+        player_i_starting = starting_terms[i]
+        player_j_starting = starting_terms[j]
+        
+        # Add constraints to link indicator to player selections
+        prob += pair_indicator <= player_i_starting, f"pair_constraint_i_{i}_{j}"
+        prob += pair_indicator <= player_j_starting, f"pair_constraint_j_{i}_{j}"
+        prob += pair_indicator >= player_i_starting + player_j_starting - 1, f"{PAIR_BOTH_CONSTRAINT}{i}_{j}"
+        
+        # Add position-weighted penalty term
+        opposing_penalty_terms.append(actual_penalty * pair_indicator)
+        pair_count += 1
     
     print(f"  Found {pair_count} potential opposing pairs")
     
@@ -150,6 +217,95 @@ def add_opposing_teams_penalty_to_objective(prob, df_players, vars, base_opposin
     
     return opposing_penalty_terms
 
+def add_fixture_counter_penalty_to_objective(prob, df_players, vars, base_opposing_penalty=1.0,
+                                             starting_var_types=STARTING_VAR_TYPES):
+    """
+    Compact opposing teams penalty using fixture-level counters instead of per-pair binaries.
+    
+    For each fixture, starters are aggregated into integer counters per (side, position).
+    The pairwise penalty sum equals, for each position p on one side,
+    count[p] * sum_q(weight[p, q] * opponent_count[q]). Each product is linearised by
+    writing count[p] in unary binaries u_k and bounding z_k >= interaction - M * (1 - u_k),
+    so the model gains a handful of variables per fixture rather than one per pair.
+    
+    Args:
+        prob: The optimization problem
+        df_players: DataFrame with player data including opponent information
+        vars: Decision variables dictionary
+        base_opposing_penalty: Base penalty value (multiplied by position weights)
+        starting_var_types: Keys of vars whose variables place a player in the starting XI
+        
+    Returns:
+        list: Penalty terms to subtract from objective function
+    """
+    print(f"Adding fixture-counter opposing teams penalty (base: {base_opposing_penalty} pts)")
+    
+    positions = df_players['position'].to_dict()
+    if 'opponent' in df_players.columns:
+        has_fixture = df_players['opponent'].ne('No fixture').to_dict()
+    else:
+        has_fixture = dict.fromkeys(df_players.index, True)
+    
+    opposing_penalty_terms = []
+    fixture_count = 0
+    counter_count = 0
+    
+    for team_id, opponent_id, side, other_side in find_fixture_sides(df_players):
+        if team_id == opponent_id:
+            continue
+        
+        # Group each side's players by position and create one counter per group
+        counters = []
+        bounds = []
+        for side_name, members in (('h', side), ('a', other_side)):
+            by_position = {}
+            for idx in members:
+                if has_fixture[idx]:
+                    by_position.setdefault(positions[idx], []).append(idx)
+            
+            side_counters = {}
+            side_bounds = {}
+            for position, indices in by_position.items():
+                upper = min(len(indices), MAX_STARTERS_PER_TEAM, MAX_STARTERS_BY_POSITION.get(position, MAX_STARTERS_PER_TEAM))
+                counter = LpVariable(f"fixture_count_{team_id}_{opponent_id}_{side_name}_{position}", 0, upper, cat='Integer')
+                starters = lpSum(vars[var_type].get(idx, 0) for idx in indices for var_type in starting_var_types)
+                prob += counter == starters, f"{FIXTURE_COUNT_LINK_CONSTRAINT}{team_id}_{opponent_id}_{side_name}_{position}"
+                side_counters[position] = counter
+                side_bounds[position] = upper
+            counters.append(side_counters)
+            bounds.append(side_bounds)
+        
+        # Expand the side with fewer possible starters into unary binaries
+        expand, other = (0, 1) if sum(bounds[0].values()) <= sum(bounds[1].values()) else (1, 0)
+        
+        for position, counter in counters[expand].items():
+            weights = {
+                other_position: get_penalty_for_positions(position, other_position) or 0
+                for other_position in counters[other]
+            }
+            big_m = sum(weights[q] * bounds[other][q] for q in weights)
+            if big_m == 0:
+                continue
+            
+            interaction = lpSum(weights[q] * counters[other][q] for q in weights if weights[q])
+            name = f"{team_id}_{opponent_id}_{position}"
+            units = [LpVariable(f"fixture_unit_{name}_{k}", cat='Binary') for k in range(bounds[expand][position])]
+            prob += counter == lpSum(units), f"{FIXTURE_UNIT_SUM_CONSTRAINT}{name}"
+            
+            for k, unit in enumerate(units):
+                if k > 0:
+                    prob += unit <= units[k - 1], f"fixture_unit_order_{name}_{k}"
+                penalty = LpVariable(f"fixture_penalty_{name}_{k}", lowBound=0)
+                prob += penalty >= interaction - big_m * (1 - unit), f"{FIXTURE_PENALTY_LINK_CONSTRAINT}{name}_{k}"
+                opposing_penalty_terms.append(base_opposing_penalty * penalty)
+        
+        fixture_count += 1
+        counter_count += sum(len(c) for c in counters)
+    
+    print(f"  Found {fixture_count} fixtures, {counter_count} side/position counters")
+    
+    return opposing_penalty_terms
+
 # ============================================================================
 # ANALYSIS AND REPORTING
 # ============================================================================
@@ -164,29 +320,24 @@ def analyze_opposing_pairs_in_squad(df_players, squad, base_penalty=1.0):
     starting_players = squad['starting_df']
     opposing_pairs = []
     
-    for i, player_i in starting_players.iterrows():
-        for j, player_j in starting_players.iterrows():
-            if i >= j:
-                continue
-                
-            if (player_i.get('opponent_id') == player_j.get('team_id') and 
-                player_j.get('opponent_id') == player_i.get('team_id') and
-                player_i.get('opponent') != 'No fixture'):
-                
-                # Get positions and calculate position-weighted penalty using centralized function
-                pos_i = player_i['position']
-                pos_j = player_j['position']
-                
-                penalty_multiplier = get_penalty_for_positions(pos_i, pos_j)
-                
-                # Skip if this combination should be ignored (e.g., GK vs GK)
-                if penalty_multiplier is None:
-                    continue
-                    
-                actual_penalty = base_penalty * penalty_multiplier
-                pos_pair = tuple(sorted([pos_i, pos_j]))
-                
-                opposing_pairs.append((player_i, player_j, pos_pair, actual_penalty))
+    for i, j in find_opposing_pairs(starting_players):
+        player_i = starting_players.loc[i]
+        player_j = starting_players.loc[j]
+        
+        # Get positions and calculate position-weighted penalty using centralized function
+        pos_i = player_i['position']
+        pos_j = player_j['position']
+        
+        penalty_multiplier = get_penalty_for_positions(pos_i, pos_j)
+        
+        # Skip if this combination should be ignored (e.g., GK vs GK)
+        if penalty_multiplier is None:
+            continue
+            
+        actual_penalty = base_penalty * penalty_multiplier
+        pos_pair = tuple(sorted([pos_i, pos_j]))
+        
+        opposing_pairs.append((player_i, player_j, pos_pair, actual_penalty))
     
     print("\n" + "="*60)
     print("POSITION-WEIGHTED OPPOSING TEAMS ANALYSIS")
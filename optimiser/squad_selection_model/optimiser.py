@@ -2,16 +2,29 @@ import sys
 import io
 import os
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-import pandas as pd
-from pulp import LpProblem, LpMaximize, PULP_CBC_CMD
-from decision_variables import create_decision_variables
-from objective_function import add_objective_function
+from model_builder import build_optimisation_problem
+from objective_function import UNLIMITED_TRANSFER_CHIPS
+from candidate_pool import prune_candidate_pool, print_pool_report
+from warm_start import set_current_squad_warm_start
+from solver_config import SolverConfig, solve_problem, print_solve_stats
+from sparse_backend import SparseSquadModel
+from instrumentation import RunProfiler
+from top_k_plans import enumerate_top_plans, print_top_plans
+from solution_cache import SolutionCache, compute_cache_key, cached_problem, make_cache_entry, should_cache
 from constraints import *
 from squad_creator import *
 from team_class import Team
 from output_window import display_in_window
 from fdr import *
 
+from fpl_data.storage import read_player_data
+
+# Time each stage of the run; the report is written to run_profile.json. profile_memory also
+# records peak memory per stage, but tracemalloc slows the model build and skews the times
+profile_memory = False
+profiler = RunProfiler('optimiser', track_memory=profile_memory)
+profile_path = 'run_profile.json'
+
 # Check for manual team override file
 manual_team_ids = None
 override_file = os.path.join(os.path.dirname(__file__), '..', 'my_team_override.txt')
@@ -27,45 +40,32 @@ if os.path.exists(override_file):
                 manual_team_ids = None
 
 # Initialize team
-my_team = Team(team_id=2562804, budget=1.5, free_transfers=1, manual_player_ids=None)
+with profiler.span('fetch_team'):
+    my_team = Team(team_id=2562804, budget=1.5, free_transfers=1, manual_player_ids=None)
 
-df_players = pd.read_csv('data/fpl_players_gw_9.csv')
+with profiler.span('load_csv'):
+    df_players = read_player_data('data/fpl_players_gw_9.csv')
 
 # Initialize FDR calculator
-fdr_calculator = CSVFDRCalculator('data/fpl_players_gw_9.csv')
+with profiler.span('fdr_calculator'):
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
 print(f"📊 FDR Calculator initialized with {len(fdr_calculator.team_fdr_ratings)} teams")   
 
-# Create optimization problem
-prob = LpProblem("FPL_Transfer_Optimisation", LpMaximize)
+fdr_penalty_weight = 0.5  # Adjust this to control FDR impact
 
-# Create decision variables
-vars = create_decision_variables(df_players)
+# Number of distinct transfer plans to list (1 = best plan only); the alternatives come from
+# re-solving the 'pulp' backend model with no-good cuts (top_k_plans.py)
+top_k_plans = 1
 
-# Add objective function with FDR penalties
+# Objective and constraint settings (all of them go into the solution cache key)
 penalty_points = 4  # Store penalty points for later use
-prob = add_objective_function(
-    prob, df_players, vars, 
-    penalty_points=penalty_points, 
-    base_opposing_penalty=1,
-    fdr_calculator=fdr_calculator,
-    fdr_penalty_weight=0.5 # Adjust this to control FDR impact
-)
+base_opposing_penalty = 1
+opposing_formulation = 'pairwise'  # 'fixture' uses compact fixture-level counters
+bench_criteria = None
 
-# Add constraints
-prob = add_squad_size_constraints(prob, vars, df_players)
-prob = add_captain_constraints(prob, vars, df_players)
-prob = add_equal_flow_constraints(prob, vars, df_players)
-prob = add_status_constraints(prob, vars, df_players, my_team)
-prob = add_positional_constraints(prob, vars, df_players)
-prob = add_free_transfer_limit_constraint(prob, vars, df_players, my_team)
-prob = add_availability_constraints(prob, vars, df_players, my_team)
-prob = add_budget_constraint(prob, vars, df_players, my_team.current_team)
-prob = add_team_constraints(prob, vars, df_players)
-
-# Example usage with custom parameters:
+# Example bench criteria (passed to add_bench_selection_constraints by build_optimisation_problem):
 '''
-prob = add_bench_selection_constraints(
-    prob, vars, df_players,         
+bench_criteria = dict(
     min_minutes=0,           # Lower minutes requirement
     min_price=0,           # Minimum £4.0m
     max_price=100,           # Maximum £5.5m (tighter budget)
@@ -77,25 +77,132 @@ prob = add_bench_selection_constraints(
     min_form=0             # Require some form
 )
 '''
-# Solve the problem
-prob.solve(PULP_CBC_CMD(msg=False))
+
+# Drop unavailable, zero-minute and dominated players before building the model (opt-in: the
+# zero-minute rule is a heuristic, and with an opposing teams penalty few players are dominated)
+prune_pool = False
+if prune_pool:
+    with profiler.span('prune_pool'):
+        df_players, pool_report = prune_candidate_pool(df_players, my_team, fdr_calculator, fdr_penalty_weight,
+                                                       top_k=top_k_plans, base_opposing_penalty=base_opposing_penalty,
+                                                       bench_criteria=bench_criteria)
+    print_pool_report(pool_report)
+
+# Solver choice and limits: 'cbc' or 'highs', threads=None uses the solver default,
+# time_limit in seconds, gap_rel as a fraction (e.g. 0.01 stops within 1% of optimal)
+solver_config = SolverConfig(solver='cbc', threads=None, time_limit=None, gap_rel=None)
+
+# Model backend: 'pulp' builds the 13-variable PuLP model and solves it with solver_config;
+# 'sparse' builds the compact model as SciPy sparse arrays and solves it with scipy.optimize.milp
+model_backend = 'pulp'
+
+# Seed CBC with the current squad; the setup costs about what it saves, so it is off by default
+# (python benchmarks.py warmstart compares end-to-end times)
+use_warm_start = False
+
+# Chip played this gameweek: None, 'wildcard', 'free_hit', 'bench_boost' or 'triple_captain'
+# (modelled by the 'pulp' backend only; chip_planner.py suggests when to play each chip)
+chip = None
+if chip is not None and model_backend != 'pulp':
+    raise ValueError(f"Chips are only modelled by the 'pulp' backend, not '{model_backend}'")
+
+# Identical runs (same players, team and settings) reuse the stored squad instead of re-solving.
+# Alternative plans (top_k_plans > 1) are enumerated from the solved model, so those runs
+# neither read nor write the cache
+use_solution_cache = True
+cache_enabled = use_solution_cache and top_k_plans == 1
+solution_cache = SolutionCache()
+
+with profiler.span('cache_lookup'):
+    cache_key = compute_cache_key(df_players, my_team, {
+        'penalty_points': penalty_points,
+        'base_opposing_penalty': base_opposing_penalty,
+        'fdr_penalty_weight': fdr_penalty_weight,
+        'fdr_ratings': fdr_calculator.team_fdr_ratings,
+        'opposing_formulation': opposing_formulation,
+        'bench_criteria': bench_criteria,
+        'solver_config': repr(solver_config),
+        'model_backend': model_backend,
+        'chip': chip,
+    })
+    cached = solution_cache.get(cache_key) if cache_enabled else None
+
+if cached is not None:
+    print(f"♻️  Using cached solution {cache_key[:12]} (objective {cached['objective']:.2f}), skipping build and solve")
+    prob, vars = cached_problem(cached), None
+    squad = cached['squad']
+elif model_backend == 'sparse':
+    with profiler.span('build_model'):
+        sparse_model = SparseSquadModel(
+            df_players, my_team,
+            penalty_points=penalty_points,
+            base_opposing_penalty=base_opposing_penalty,
+            fdr_calculator=fdr_calculator,
+            fdr_penalty_weight=fdr_penalty_weight,
+            opposing_formulation=opposing_formulation,
+            bench_criteria=bench_criteria,
+            profiler=profiler
+        )
+
+    with profiler.span('solve') as solve_span:
+        solve_stats = sparse_model.solve(solver_config)
+    solve_span.update({key: solve_stats[key] for key in ('solver', 'status', 'nodes', 'gap')})
+    print_solve_stats(solve_stats)
+
+    with profiler.span('extract_results'):
+        squad = sparse_model.process_results()
+    prob, vars = sparse_model.problem_status(), None
+
+else:
+    # Build optimization problem with FDR penalties
+    with profiler.span('build_model'):
+        prob, vars = build_optimisation_problem(
+            df_players, my_team,
+            penalty_points=penalty_points,
+            base_opposing_penalty=base_opposing_penalty,
+            fdr_calculator=fdr_calculator,
+            fdr_penalty_weight=fdr_penalty_weight,
+            opposing_formulation=opposing_formulation,
+            bench_criteria=bench_criteria,
+            chip=chip,
+            profiler=profiler
+        )
+
+    # Seed CBC with the current squad (falls back to a cold start if it is infeasible)
+    warm_start = False
+    if use_warm_start and solver_config.solver == 'cbc':
+        with profiler.span('warm_start'):
+            warm_start = set_current_squad_warm_start(prob, vars, df_players, my_team)
+        if warm_start:
+            print("Warm start: current squad set as initial solution")
+
+    # Solve the problem
+    with profiler.span('solve') as solve_span:
+        solve_stats = solve_problem(prob, solver_config, warm_start=warm_start)
+    solve_span.update({key: solve_stats[key] for key in ('solver', 'status', 'nodes', 'gap')})
+    print_solve_stats(solve_stats)
+
+    with profiler.span('extract_results'):
+        squad = process_optimization_results(vars, df_players, prob)
+
+    # Alternative plans; the best solution is restored afterwards
+    if top_k_plans > 1:
+        with profiler.span('top_k_plans'):
+            top_plans = enumerate_top_plans(prob, vars, df_players, my_team, k=top_k_plans,
+                                            solver_config=solver_config, solved=True)
+        print_top_plans(top_plans)
+
+if cached is None and cache_enabled and should_cache(solve_stats):
+    solution_cache.put(cache_key, make_cache_entry(squad, prob, solve_stats))
 
 # Count paid transfers
-def count_paid_transfers(vars, df_players):
+def count_paid_transfers(decision_results):
     """Count the number of paid transfers made"""
-    paid_transfer_count = 0
-    
-    for idx in df_players.index:
-        if vars['in_to_starting_paid'][idx].value() > 0:
-            paid_transfer_count += vars['in_to_starting_paid'][idx].value()
-        if vars['in_to_bench_paid'][idx].value() > 0:
-            paid_transfer_count += vars['in_to_bench_paid'][idx].value()
-    
-    return int(paid_transfer_count)
+    return sum(len(decision_results.get(var_type, [])) for var_type in ['in_to_starting_paid', 'in_to_bench_paid'])
 
 # Count paid transfers
-paid_transfers = count_paid_transfers(vars, df_players)
-transfer_penalty = paid_transfers * penalty_points
+paid_transfers = count_paid_transfers(squad['decision_results'])
+transfer_penalty = 0 if chip in UNLIMITED_TRANSFER_CHIPS else paid_transfers * penalty_points
 
 print(f"Paid transfers made: {paid_transfers}")
 print(f"Transfer penalty: {transfer_penalty} points")
@@ -114,29 +221,34 @@ transfer_types = [
 
 for idx in df_players.index:
     for var_name, action, location in transfer_types:
-        if vars[var_name][idx].value() > 0:
+        if idx in squad['decision_results'].get(var_name, []):
             player = df_players.loc[idx]
             print(f"{action}: {player['name']}{location} for £{player['price']}m ({var_name})")
 
 print(f"Initial bank: £{0}m")
 
-squad = process_optimization_results(vars, df_players, prob)
-
 # Capture analysis data
-fdr_lines, fdr_summary = capture_fdr_analysis(squad, fdr_calculator)
-
-# Create transfer analysis data
-transfer_analysis = {
-    'paid_transfers': paid_transfers,
-    'penalty_points': penalty_points,
-    'transfer_penalty': transfer_penalty
-}
-
-analysis_data = {
-    'opposing_teams': capture_opposing_teams_analysis(df_players, squad, base_penalty=1.0),
-    'fdr_analysis': fdr_lines,
-    'fdr_summary': fdr_summary,
-    'transfers': transfer_analysis
-}
-
-display_in_window(prob, squad, vars, df_players, my_team, analysis_data)
\ No newline at end of file
+with profiler.span('analysis'):
+    fdr_lines, fdr_summary = capture_fdr_analysis(squad, fdr_calculator)
+
+    # Create transfer analysis data
+    transfer_analysis = {
+        'paid_transfers': paid_transfers,
+        'penalty_points': penalty_points,
+        'transfer_penalty': transfer_penalty
+    }
+
+    analysis_data = {
+        'opposing_teams': capture_opposing_teams_analysis(df_players, squad, base_penalty=1.0),
+        'fdr_analysis': fdr_lines,
+        'fdr_summary': fdr_summary,
+        'transfers': transfer_analysis
+    }
+
+with profiler.span('render'):
+    results_window = display_in_window(prob, squad, vars, df_players, my_team, analysis_data, block=False)
+
+profiler.print_summary()
+print(f"Run profile written to {profiler.write_json(profile_path)}")
+
+results_window.mainloop()
\ No newline at end of file
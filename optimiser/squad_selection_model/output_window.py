@@ -8,9 +8,12 @@ from pulp import LpStatus, value
 from tabulate import tabulate
 import os
 
-def display_in_window(prob, squad, vars=None, df_players=None, my_team=None, analysis_data=None):
+def display_in_window(prob, squad, vars=None, df_players=None, my_team=None, analysis_data=None, block=True):
     """
     Display squad results in a tkinter window with transfer information using tabulate for perfect alignment
+    
+    With block=False the window is built but the event loop is not started; the caller
+    runs root.mainloop() (used to time rendering separately from the time the window is open).
     """
     # Create window
     root = tk.Tk()
@@ -386,6 +389,8 @@ def display_in_window(prob, squad, vars=None, df_players=None, my_team=None, ana
     close_btn = ttk.Button(root, text="Close", command=root.destroy)
     close_btn.pack(pady=5)
     
+    if not block:
+        return root
     root.mainloop()
 
 
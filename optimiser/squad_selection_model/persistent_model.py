@@ -0,0 +1,171 @@
+# persistent_model.py
+# Long-lived squad selection model for fast what-if re-solves
+
+import time
+from pulp import LpProblem, LpMaximize, LpAffineExpression
+from decision_variables import create_decision_variables
+from objective_function import compute_objective_coefficients, build_objective_expression
+from opposing_teams import add_opposing_teams_penalty_to_objective
+from fdr import get_fdr_coefficients
+from player_arrays import extract_player_arrays
+from model_builder import add_model_constraints
+from warm_start import find_violated_constraints, set_current_squad_warm_start
+from constraints import add_bench_selection_constraints, set_free_transfer_limit
+from solver_config import solve_problem
+
+class PersistentSquadModel:
+    """
+    Squad selection model built once and updated in place between solves.
+
+    Variables, constraints and the opposing teams penalty structure are built a single
+    time. Penalty points, FDR weight and opposing penalty only change objective
+    coefficients (the opposing penalty and FDR are both linear in their weights, so they
+    are cached at weight 1 and rescaled), and free transfers only change the right-hand
+    side of the free transfer constraint.
+
+    Example:
+        model = PersistentSquadModel(df_players, my_team, fdr_calculator=fdr_calculator)
+        model.solve()
+        model.update(penalty_points=8, free_transfers=2)
+        model.solve()
+        squad = process_optimization_results(model.vars, model.df_players, model.prob)
+    """
+
+    def __init__(self, df_players, my_team, penalty_points=4, base_opposing_penalty=1,
+                 fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                 bench_criteria=None):
+        """
+        Build the model structure and set the initial parameters.
+
+        Args:
+            df_players: DataFrame with player data
+            my_team: Team instance with the current squad
+            penalty_points: Points penalty for paid transfers
+            base_opposing_penalty: Base penalty for opposing teams
+            fdr_calculator: FDR calculator instance (optional)
+            fdr_penalty_weight: Weight for FDR penalties
+            opposing_formulation: Opposing teams penalty formulation, 'pairwise' or 'fixture'
+            bench_criteria: Keyword arguments for add_bench_selection_constraints (optional)
+        """
+        start = time.perf_counter()
+
+        self.df_players = df_players
+        self.my_team = my_team
+        self.prob = LpProblem("FPL_Transfer_Optimisation", LpMaximize)
+
+        self.vars = create_decision_variables(df_players, my_team)
+        if bench_criteria is not None:
+            self.prob = add_bench_selection_constraints(self.prob, self.vars, df_players, **bench_criteria)
+
+        # Cache everything the objective is rebuilt from
+        self.arrays = extract_player_arrays(df_players)
+        self.unit_fdr_coefficients = None
+        if fdr_calculator is not None:
+            self.unit_fdr_coefficients = get_fdr_coefficients(df_players, fdr_calculator, 1.0)
+
+        # Opposing penalty structure at base penalty 1, rescaled on update
+        opposing_penalty_terms = add_opposing_teams_penalty_to_objective(
+            self.prob, df_players, self.vars, 1.0, formulation=opposing_formulation
+        )
+        self.unit_opposing_penalty = []
+        for term in opposing_penalty_terms:
+            self.unit_opposing_penalty.extend(term.items())
+
+        self.prob = add_model_constraints(self.prob, self.vars, df_players, my_team)
+
+        self.penalty_points = None
+        self.fdr_penalty_weight = None
+        self.base_opposing_penalty = None
+        self.free_transfers = my_team.free_transfers
+        self.solved = False
+        self.last_solve_seconds = None
+        self.last_solve_stats = None
+
+        self.update(penalty_points, fdr_penalty_weight, base_opposing_penalty)
+        self.build_seconds = time.perf_counter() - start
+
+    def update(self, penalty_points=None, fdr_penalty_weight=None, base_opposing_penalty=None, free_transfers=None):
+        """
+        Change model parameters in place; arguments left as None keep their current value.
+
+        Args:
+            penalty_points: Points penalty for paid transfers
+            fdr_penalty_weight: Weight for FDR penalties
+            base_opposing_penalty: Base penalty for opposing teams
+            free_transfers: Number of free transfers available
+
+        Returns:
+            float: Seconds spent updating the model
+        """
+        start = time.perf_counter()
+
+        objective_changed = False
+        if penalty_points is not None and penalty_points != self.penalty_points:
+            self.penalty_points = penalty_points
+            objective_changed = True
+        if fdr_penalty_weight is not None and fdr_penalty_weight != self.fdr_penalty_weight:
+            self.fdr_penalty_weight = fdr_penalty_weight
+            objective_changed = True
+        if base_opposing_penalty is not None and base_opposing_penalty != self.base_opposing_penalty:
+            self.base_opposing_penalty = base_opposing_penalty
+            objective_changed = True
+
+        if objective_changed:
+            self.prob.setObjective(self.build_objective())
+            self.prob.objective.name = "Total_Expected_Points_With_All_Penalties"
+
+        if free_transfers is not None and free_transfers != self.free_transfers:
+            self.free_transfers = free_transfers
+            set_free_transfer_limit(self.prob, free_transfers)
+
+        return time.perf_counter() - start
+
+    def build_objective(self):
+        """
+        Build the objective for the current parameters from the cached arrays.
+
+        Returns:
+            LpAffineExpression: Objective expression
+        """
+        fdr_coefficients = None
+        if self.unit_fdr_coefficients is not None:
+            fdr_coefficients = self.unit_fdr_coefficients * self.fdr_penalty_weight
+
+        coefficients = compute_objective_coefficients(self.arrays, self.penalty_points, fdr_coefficients)
+        objective = build_objective_expression(self.vars, self.arrays, coefficients)
+
+        if self.base_opposing_penalty > 0 and self.unit_opposing_penalty:
+            objective.subInPlace(LpAffineExpression(
+                (var, self.base_opposing_penalty * coefficient) for var, coefficient in self.unit_opposing_penalty
+            ))
+
+        return objective
+
+    def solve(self, solver_config=None, warm_start=True):
+        """
+        Solve the model.
+
+        With CBC, the first solve is warm-started from the current squad; later solves
+        reuse the previous solution when it is still feasible (e.g. after objective-only
+        changes).
+
+        Args:
+            solver_config: SolverConfig instance (default: CBC without limits)
+            warm_start: Whether to pass an initial solution to the solver
+
+        Returns:
+            dict: Solve statistics from solve_problem
+        """
+        if warm_start and (solver_config is None or solver_config.solver == 'cbc'):
+            if not self.solved:
+                warm_start = set_current_squad_warm_start(self.prob, self.vars, self.df_players, self.my_team)
+            else:
+                warm_start = not find_violated_constraints(self.prob)
+        else:
+            warm_start = False
+
+        self.last_solve_stats = solve_problem(self.prob, solver_config, warm_start=warm_start)
+        self.last_solve_seconds = self.last_solve_stats['wall_seconds']
+        self.solved = True
+
+        return self.last_solve_stats
@@ -0,0 +1,50 @@
+# player_arrays.py
+# Column extraction and coefficient-vector helpers for building model expressions without per-row pandas access
+
+import numpy as np
+from pulp import LpAffineExpression
+
+# Decision variable types that place a player in the starting XI / on the bench
+STARTING_VAR_TYPES = ['stay_starting', 'bench_to_starting', 'in_to_starting_free', 'in_to_starting_paid']
+BENCH_VAR_TYPES = ['stay_bench', 'starting_to_bench', 'in_to_bench_free', 'in_to_bench_paid']
+
+
+def extract_player_arrays(df_players):
+    """
+    Extract the player columns used by the model once as NumPy arrays.
+
+    Args:
+        df_players: DataFrame with player data
+
+    Returns:
+        dict: Arrays aligned with df_players.index ('index', 'expected_points', 'price', 'team_id', 'position')
+    """
+    return {
+        'index': df_players.index.to_numpy(),
+        'expected_points': df_players['expected_points'].to_numpy(dtype=float),
+        'price': df_players['price'].to_numpy(dtype=float),
+        'team_id': df_players['team_id'].to_numpy(),
+        'position': df_players['position'].to_numpy(dtype=object),
+    }
+
+
+def build_linear_expression(var_dict, index, coefficients):
+    """
+    Build a linear expression from a coefficient vector in a single pass.
+
+    Zero coefficients and indices without a variable are skipped, so sparse variable
+    dictionaries can be passed directly.
+
+    Args:
+        var_dict: Mapping of player index to LpVariable
+        index: Array of player indices
+        coefficients: Array of coefficients aligned with index
+
+    Returns:
+        LpAffineExpression: sum(coefficient * variable)
+    """
+    return LpAffineExpression(
+        (var_dict[idx], coef)
+        for idx, coef in zip(np.asarray(index).tolist(), np.asarray(coefficients, dtype=float).tolist())
+        if coef != 0 and idx in var_dict
+    )
@@ -0,0 +1,191 @@
+# solution_cache.py
+# On-disk cache of solved squads keyed on a hash of the player data, team state and parameters
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from types import SimpleNamespace
+import pandas as pd
+from pulp import value
+
+# Bump when the model changes in a way that changes solutions for the same inputs
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.solution_cache')
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+def hash_dataframe(df, hasher):
+    """Add a DataFrame's columns, dtypes, index and values to a hashlib hasher."""
+    hasher.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+def compute_cache_key(df_players, my_team, parameters):
+    """
+    Hash everything that determines the optimisation result.
+
+    Args:
+        df_players: DataFrame with player data, as passed to the model
+        my_team: Team instance with the current squad
+        parameters: Dict of objective, constraint and solver parameters (JSON-serialisable,
+            anything else is hashed by repr)
+
+    Returns:
+        str: Hex digest
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f"solution-cache-v{CACHE_VERSION}".encode())
+
+    hash_dataframe(df_players, hasher)
+
+    team_state = {
+        'starting_ids': sorted(int(pid) for pid in my_team.starting_ids),
+        'bench_ids': sorted(int(pid) for pid in my_team.bench_ids),
+        'budget': my_team.budget,
+        'free_transfers': my_team.free_transfers,
+    }
+    hasher.update(json.dumps(team_state, sort_keys=True).encode())
+    hash_dataframe(my_team.current_team.reset_index(drop=True), hasher)
+
+    hasher.update(json.dumps(parameters, sort_keys=True, default=repr).encode())
+
+    return hasher.hexdigest()
+
+class SolutionCache:
+    """
+    Size-bounded on-disk cache of optimisation results.
+
+    Each entry is one pickle file named by its key. Reads refresh the file's modification
+    time, and writes evict the least recently used entries once the directory exceeds
+    max_bytes. Files are written to a temporary name and renamed, so concurrent runs
+    never see a partial entry.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Directory for cache entries (created if missing)
+            max_bytes: Maximum total size of the cache directory
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Look up a cached result.
+
+        Returns:
+            dict: Cached entry, or None on a miss (unreadable entries are removed)
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Discarding unreadable cache entry {key[:12]}: {e}")
+            self._remove(path)
+            return None
+
+        os.utime(path)
+        return entry
+
+    def put(self, key, entry):
+        """Store an entry and evict old entries if the cache is over its size limit."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.cache_dir, name))
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Remove every cache entry."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl') or name.endswith('.tmp'):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def make_cache_entry(squad, prob, solve_stats=None):
+    """
+    Build the entry stored for a solved problem.
+
+    Returns:
+        dict: squad, status, objective, solve statistics and creation time
+    """
+    return {
+        'squad': squad,
+        'status': prob.status,
+        'objective': squad_objective(prob),
+        'solve_stats': solve_stats,
+        'created_at': time.time(),
+    }
+
+def squad_objective(prob):
+    """Objective value of a solved problem (an LpProblem or a cached_problem stand-in)."""
+    return value(prob.objective) if prob.objective is not None else None
+
+def should_cache(solve_stats):
+    """
+    Only proven-optimal solves are cached.
+
+    Infeasible and failed solves, and squads returned at a time limit or gap tolerance, are
+    solved again next time rather than replayed.
+
+    Args:
+        solve_stats: Statistics from solve_problem or SparseSquadModel.solve
+    """
+    return bool(solve_stats and solve_stats.get('proven_optimal'))
+
+def cached_problem(entry):
+    """
+    Stand-in for the solved LpProblem on a cache hit.
+
+    Provides the status and objective read by display_in_window and
+    process_optimization_results (pulp.value returns plain numbers unchanged).
+    """
+    return SimpleNamespace(status=entry['status'], objective=entry['objective'])
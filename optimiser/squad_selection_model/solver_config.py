@@ -0,0 +1,190 @@
+# solver_config.py
+# Solver selection (CBC or HiGHS), limits and solve statistics
+
+import os
+import re
+import tempfile
+import time
+from pulp import PULP_CBC_CMD, HiGHS, LpStatus, LpSolution, LpSolutionOptimal, value
+
+SOLVERS = ('cbc', 'highs')
+
+# Lines in the CBC log that carry solve statistics
+CBC_RESULT_PATTERN = re.compile(r"^Result - (.+)$", re.MULTILINE)
+CBC_NODES_PATTERN = re.compile(r"^Enumerated nodes:\s+(\d+)", re.MULTILINE)
+CBC_GAP_PATTERN = re.compile(r"^Gap:\s+(-?[\d.]+)", re.MULTILINE)
+
+# Largest relative gap still counted as proven optimal (HiGHS's default mip_rel_gap)
+OPTIMAL_GAP_TOLERANCE = 1e-4
+
+class SolverConfig:
+    """
+    Solver choice and limits for the squad selection model.
+
+    Both solvers come from pip wheels: CBC is bundled with PuLP and HiGHS with highspy.
+    """
+
+    def __init__(self, solver='cbc', threads=None, time_limit=None, gap_rel=None, msg=False):
+        """
+        Args:
+            solver: 'cbc' or 'highs'
+            threads: Number of solver threads (solver default when None)
+            time_limit: Time limit in seconds (no limit when None)
+            gap_rel: Relative MIP gap at which to stop, e.g. 0.01 for 1% (solver default when None)
+            msg: Whether to show solver output
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver: {solver} (expected one of {', '.join(SOLVERS)})")
+        if solver == 'highs' and not HiGHS().available():
+            raise ValueError("HiGHS solver requested but highspy is not installed (pip install highspy)")
+
+        self.solver = solver
+        self.threads = threads
+        self.time_limit = time_limit
+        self.gap_rel = gap_rel
+        self.msg = msg
+
+    def create_solver(self, warm_start=False, log_path=None):
+        """
+        Create the PuLP solver object.
+
+        Args:
+            warm_start: Whether to pass variable initial values to the solver (CBC only;
+                PuLP's HiGHS interface does not support MIP starts, so it is ignored)
+            log_path: File for the CBC log (optional)
+
+        Returns:
+            PuLP solver instance
+        """
+        if self.solver == 'highs':
+            return HiGHS(msg=self.msg, threads=self.threads, timeLimit=self.time_limit, gapRel=self.gap_rel)
+
+        return PULP_CBC_CMD(
+            msg=self.msg,
+            threads=self.threads,
+            timeLimit=self.time_limit,
+            gapRel=self.gap_rel,
+            warmStart=warm_start,
+            logPath=log_path
+        )
+
+    def __repr__(self):
+        return (f"SolverConfig(solver={self.solver!r}, threads={self.threads}, "
+                f"time_limit={self.time_limit}, gap_rel={self.gap_rel})")
+
+def add_solver_arguments(parser):
+    """Add --solver, --threads, --time-limit and --gap-rel options to an argparse parser."""
+    parser.add_argument('--solver', choices=SOLVERS, default='cbc')
+    parser.add_argument('--threads', type=int, default=None, help="Solver threads (solver default if omitted)")
+    parser.add_argument('--time-limit', type=float, default=None, help="Solver time limit in seconds")
+    parser.add_argument('--gap-rel', type=float, default=None, help="Relative MIP gap to stop at, e.g. 0.01")
+    return parser
+
+def solver_config_from_args(args, **overrides):
+    """Create a SolverConfig from options added by add_solver_arguments."""
+    settings = {
+        'solver': args.solver,
+        'threads': args.threads,
+        'time_limit': args.time_limit,
+        'gap_rel': args.gap_rel,
+    }
+    settings.update(overrides)
+    return SolverConfig(**settings)
+
+def parse_cbc_log(log_text):
+    """
+    Extract result, node count and gap from a CBC log.
+
+    Returns:
+        dict: 'result', 'nodes' and 'gap' (None when not in the log)
+    """
+    result = CBC_RESULT_PATTERN.search(log_text)
+    nodes = CBC_NODES_PATTERN.search(log_text)
+    gap = CBC_GAP_PATTERN.search(log_text)
+
+    return {
+        'result': result.group(1).strip() if result else None,
+        'nodes': int(nodes.group(1)) if nodes else None,
+        # CBC reports the gap with the sign of the minimisation it solved
+        'gap': abs(float(gap.group(1))) if gap else None,
+    }
+
+def solve_problem(prob, solver_config=None, warm_start=False):
+    """
+    Solve a problem with the configured solver and collect solve statistics.
+
+    Args:
+        prob: PuLP problem
+        solver_config: SolverConfig instance (default: CBC without limits)
+        warm_start: Whether to use variable initial values as a MIP start (CBC only)
+
+    Returns:
+        dict: solver, status, solution_status, proven_optimal, objective, wall_seconds, nodes
+              and gap (nodes and gap are None when the solver does not report them)
+    """
+    solver_config = solver_config or SolverConfig()
+
+    stats = {'nodes': None, 'gap': None}
+
+    if solver_config.solver == 'cbc':
+        log_file = tempfile.NamedTemporaryFile(suffix='-cbc.log', delete=False)
+        log_file.close()
+        try:
+            start = time.perf_counter()
+            prob.solve(solver_config.create_solver(warm_start=warm_start, log_path=log_file.name))
+            wall_seconds = time.perf_counter() - start
+
+            with open(log_file.name, 'r', errors='replace') as f:
+                log_stats = parse_cbc_log(f.read())
+        finally:
+            os.remove(log_file.name)
+
+        stats['nodes'] = log_stats['nodes']
+        stats['gap'] = log_stats['gap']
+        # CBC omits the gap line when it proves optimality
+        if stats['gap'] is None and log_stats['result'] and log_stats['result'].startswith('Optimal'):
+            stats['gap'] = 0.0
+    else:
+        start = time.perf_counter()
+        prob.solve(solver_config.create_solver())
+        wall_seconds = time.perf_counter() - start
+
+        info = prob.solverModel.getInfo()
+        stats['nodes'] = int(info.mip_node_count)
+        if info.mip_gap != float('inf'):
+            stats['gap'] = float(info.mip_gap)
+
+    objective = value(prob.objective) if prob.sol_status > 0 else None
+
+    return {
+        'solver': solver_config.solver,
+        'status': LpStatus[prob.status],
+        'solution_status': LpSolution[prob.sol_status],
+        'proven_optimal': is_proven_optimal(prob.sol_status == LpSolutionOptimal, stats['gap']),
+        'objective': objective,
+        'wall_seconds': wall_seconds,
+        **stats,
+    }
+
+def is_proven_optimal(solved_to_optimality, gap):
+    """
+    Whether a solve proved its solution optimal.
+
+    PuLP reports LpStatusOptimal for a squad found before a time limit and for one accepted
+    at the --gap-rel tolerance, so the solution status and the final gap are checked too.
+
+    Args:
+        solved_to_optimality: Whether the solver reported an optimal (not just feasible) solution
+        gap: Final relative MIP gap (None when unknown)
+
+    Returns:
+        bool: True for an optimal solution with a gap within OPTIMAL_GAP_TOLERANCE
+    """
+    return bool(solved_to_optimality) and gap is not None and gap <= OPTIMAL_GAP_TOLERANCE
+
+def print_solve_stats(stats):
+    """Print a one-line summary of solve_problem statistics."""
+    gap = f"{stats['gap']:.2%}" if stats['gap'] is not None else "n/a"
+    nodes = stats['nodes'] if stats['nodes'] is not None else "n/a"
+    print(f"Solved with {stats['solver'].upper()}: {stats['status']} ({stats['solution_status']}) "
+          f"in {stats['wall_seconds']:.2f}s, nodes: {nodes}, gap: {gap}")
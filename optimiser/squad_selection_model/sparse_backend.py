@@ -0,0 +1,450 @@
+# sparse_backend.py
+# Compact squad selection model assembled as SciPy sparse arrays and solved with scipy.optimize.milp
+
+import time
+from types import SimpleNamespace
+import numpy as np
+from scipy.optimize import milp, LinearConstraint, Bounds
+from scipy.sparse import csr_array
+from pulp import LpStatus, LpStatusOptimal, LpStatusNotSolved, LpStatusInfeasible, LpStatusUnbounded, LpStatusUndefined
+from compact_formulation import (
+    get_current_roles, map_selection_to_transitions,
+    SQUAD_SIZE, STARTING_SIZE, MAX_PLAYERS_PER_TEAM, MAX_SQUAD_COST, SQUAD_BY_POSITION, STARTING_BY_POSITION
+)
+from constraints.bench_selection_constraints import get_bench_eligibility_mask
+from opposing_teams import (
+    OPPOSING_FORMULATIONS, MAX_STARTERS_PER_TEAM, MAX_STARTERS_BY_POSITION,
+    find_fixture_sides, find_opposing_pairs, get_penalty_for_positions
+)
+from fdr import get_fdr_coefficients
+from squad_creator import create_squad_output
+from instrumentation import profile_span
+from solver_config import is_proven_optimal
+
+# scipy.optimize.milp result status -> PuLP status (1 = time/iteration limit)
+MILP_STATUS = {
+    0: LpStatusOptimal,
+    1: LpStatusNotSolved,
+    2: LpStatusInfeasible,
+    3: LpStatusUnbounded,
+    4: LpStatusUndefined,
+}
+
+# ============================================================================
+# MATRIX ASSEMBLY
+# ============================================================================
+
+class MatrixBuilder:
+    """
+    Collect variables and constraint rows in coordinate form.
+
+    Variables are added in blocks and referred to by column number; constraint rows are
+    two-sided (lower <= row <= upper) and can be added one at a time or as a block of
+    rows with the same number of entries.
+    """
+
+    def __init__(self):
+        self.objective = []
+        self.lower = []
+        self.upper = []
+        self.integrality = []
+        self.rows, self.cols, self.values = [], [], []
+        self.row_lower, self.row_upper = [], []
+        self.num_variables = 0
+        self.num_constraints = 0
+
+    def add_variables(self, count, lower=0, upper=1, integer=True, objective=0.0):
+        """
+        Add a block of variables.
+
+        Returns:
+            np.ndarray: Column numbers of the new variables
+        """
+        columns = np.arange(self.num_variables, self.num_variables + count)
+        self.objective.append(np.broadcast_to(np.asarray(objective, dtype=float), count))
+        self.lower.append(np.broadcast_to(np.asarray(lower, dtype=float), count))
+        self.upper.append(np.broadcast_to(np.asarray(upper, dtype=float), count))
+        self.integrality.append(np.full(count, 1 if integer else 0))
+        self.num_variables += count
+        return columns
+
+    def add_row(self, columns, coefficients, lower=-np.inf, upper=np.inf):
+        """Add one constraint row: lower <= sum(coefficients * x[columns]) <= upper."""
+        columns = np.asarray(columns, dtype=np.int64)
+        self.rows.append(np.full(len(columns), self.num_constraints))
+        self.cols.append(columns)
+        self.values.append(np.broadcast_to(np.asarray(coefficients, dtype=float), len(columns)))
+        self.row_lower.append(np.array([lower], dtype=float))
+        self.row_upper.append(np.array([upper], dtype=float))
+        self.num_constraints += 1
+
+    def add_rows(self, columns, coefficients, lower=-np.inf, upper=np.inf):
+        """
+        Add one row per line of a (rows x entries) column array, e.g. x[a] - x[b] <= 0 for
+        many (a, b) pairs at once. Coefficients broadcast against columns.
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        count, width = columns.shape
+        if count == 0:
+            return
+        row_numbers = np.arange(self.num_constraints, self.num_constraints + count)
+        self.rows.append(np.repeat(row_numbers, width))
+        self.cols.append(columns.ravel())
+        self.values.append(np.broadcast_to(np.asarray(coefficients, dtype=float), columns.shape).ravel())
+        self.row_lower.append(np.broadcast_to(np.asarray(lower, dtype=float), count))
+        self.row_upper.append(np.broadcast_to(np.asarray(upper, dtype=float), count))
+        self.num_constraints += count
+
+    def build(self):
+        """
+        Assemble the objective vector, CSR constraint matrix and bounds.
+
+        Returns:
+            dict: c, A, row_lower, row_upper, lower, upper, integrality
+        """
+        A = csr_array(
+            (np.concatenate(self.values), (np.concatenate(self.rows), np.concatenate(self.cols))),
+            shape=(self.num_constraints, self.num_variables)
+        )
+        return {
+            'c': np.concatenate(self.objective),
+            'A': A,
+            'row_lower': np.concatenate(self.row_lower),
+            'row_upper': np.concatenate(self.row_upper),
+            'lower': np.concatenate(self.lower),
+            'upper': np.concatenate(self.upper),
+            'integrality': np.concatenate(self.integrality),
+        }
+
+# ============================================================================
+# OPPOSING TEAMS PENALTY
+# ============================================================================
+
+def add_pairwise_penalty_rows(builder, df_players, start_column, base_opposing_penalty):
+    """
+    One continuous indicator per opposing pair of selectable players, with
+    pair >= start_i + start_j - 1. The indicator carries a negative objective
+    coefficient, so it is 0 or 1 at any optimum without an integrality restriction.
+
+    Returns:
+        int: Number of pair indicators added
+    """
+    positions = df_players['position'].to_dict()
+    pairs, weights = [], []
+    for i, j in find_opposing_pairs(df_players):
+        if i not in start_column or j not in start_column:
+            continue
+        multiplier = get_penalty_for_positions(positions[i], positions[j])
+        if multiplier is None:
+            continue
+        pairs.append((start_column[i], start_column[j]))
+        weights.append(multiplier)
+
+    if not pairs:
+        return 0
+
+    pair_columns = builder.add_variables(
+        len(pairs), upper=1, integer=False, objective=-base_opposing_penalty * np.array(weights)
+    )
+    pairs = np.array(pairs)
+    builder.add_rows(np.column_stack([pair_columns, pairs]), [1, -1, -1], lower=-1)
+    return len(pairs)
+
+def add_fixture_penalty_rows(builder, df_players, start_column, base_opposing_penalty):
+    """
+    Fixture-counter penalty of add_fixture_counter_penalty_to_objective: integer
+    starters counters per fixture side and position, the smaller side expanded into
+    ordered unary binaries, and one penalty variable per unary step.
+
+    Returns:
+        int: Number of fixtures penalised
+    """
+    positions = df_players['position'].to_dict()
+    if 'opponent' in df_players.columns:
+        has_fixture = df_players['opponent'].ne('No fixture').to_dict()
+    else:
+        has_fixture = dict.fromkeys(df_players.index, True)
+
+    fixture_count = 0
+    for team_id, opponent_id, side, other_side in find_fixture_sides(df_players):
+        if team_id == opponent_id:
+            continue
+
+        counters = []
+        bounds = []
+        for members in (side, other_side):
+            by_position = {}
+            for idx in members:
+                if has_fixture[idx]:
+                    by_position.setdefault(positions[idx], []).append(idx)
+
+            side_counters = {}
+            side_bounds = {}
+            for position, indices in by_position.items():
+                upper = min(len(indices), MAX_STARTERS_PER_TEAM, MAX_STARTERS_BY_POSITION.get(position, MAX_STARTERS_PER_TEAM))
+                counter = builder.add_variables(1, upper=upper)[0]
+                starts = [start_column[idx] for idx in indices if idx in start_column]
+                builder.add_row([counter] + starts, [1.0] + [-1.0] * len(starts), lower=0, upper=0)
+                side_counters[position] = counter
+                side_bounds[position] = upper
+            counters.append(side_counters)
+            bounds.append(side_bounds)
+
+        expand, other = (0, 1) if sum(bounds[0].values()) <= sum(bounds[1].values()) else (1, 0)
+
+        for position, counter in counters[expand].items():
+            weights = {
+                other_position: get_penalty_for_positions(position, other_position) or 0
+                for other_position in counters[other]
+            }
+            big_m = sum(weights[q] * bounds[other][q] for q in weights)
+            if big_m == 0:
+                continue
+
+            interaction_columns = [counters[other][q] for q in weights if weights[q]]
+            interaction_weights = [weights[q] for q in weights if weights[q]]
+
+            steps = bounds[expand][position]
+            units = builder.add_variables(steps)
+            penalties = builder.add_variables(steps, upper=np.inf, integer=False, objective=-base_opposing_penalty)
+
+            # counter == sum(units), units ordered
+            builder.add_row(np.concatenate([[counter], units]), [1.0] + [-1.0] * steps, lower=0, upper=0)
+            if steps > 1:
+                builder.add_rows(np.column_stack([units[1:], units[:-1]]), [1, -1], upper=0)
+
+            # penalty_k >= interaction - M * (1 - unit_k)
+            width = len(interaction_columns)
+            columns = np.column_stack([penalties, units, np.tile(interaction_columns, (steps, 1))])
+            coefficients = np.concatenate([[1.0, -big_m], -np.array(interaction_weights, dtype=float)])
+            builder.add_rows(columns.reshape(steps, width + 2), coefficients, lower=-big_m)
+
+        fixture_count += 1
+
+    return fixture_count
+
+# ============================================================================
+# MODEL
+# ============================================================================
+
+class SparseSquadModel:
+    """
+    The compact squad/start/captain model assembled directly as sparse arrays.
+
+    Columns are numbered blocks (squad, start and captain per selectable player, the paid
+    transfer count, then opposing teams penalty variables), and every constraint family is
+    added as a block of rows from NumPy index arrays, so no per-variable Python objects,
+    names or model files are created. Solved with scipy.optimize.milp (HiGHS).
+
+    Players are identified by df_players index labels (any unique index), which are
+    mapped to row positions wherever a column is read as an array.
+
+    Example:
+        model = SparseSquadModel(df_players, my_team, fdr_calculator=fdr_calculator)
+        stats = model.solve()
+        squad = model.process_results()
+    """
+
+    def __init__(self, df_players, my_team, penalty_points=4, base_opposing_penalty=1,
+                 fdr_calculator=None, fdr_penalty_weight=0.5, opposing_formulation='pairwise',
+                 bench_criteria=None, profiler=None):
+        """
+        Args:
+            Same as build_optimisation_problem.
+        """
+        if opposing_formulation not in OPPOSING_FORMULATIONS:
+            raise ValueError(f"Unknown opposing teams formulation: {opposing_formulation}")
+
+        self.df_players = df_players
+        self.free_transfers = my_team.free_transfers
+        self.starters, self.bench, self.new = get_current_roles(df_players, my_team)
+        self.players = np.array(self.starters + self.bench + self.new, dtype=np.int64)
+        # Row positions of those index labels, for indexing column arrays
+        self.player_rows = df_players.index.get_indexer(self.players)
+        self.solution = None
+        self.status = LpStatusNotSolved
+        self.objective = None
+
+        builder = MatrixBuilder()
+        with profile_span(profiler, 'variables'):
+            self._add_player_variables(builder, df_players, penalty_points, fdr_calculator, fdr_penalty_weight)
+        with profile_span(profiler, 'constraints'):
+            self._add_constraints(builder, df_players, bench_criteria)
+        with profile_span(profiler, 'opposing_teams'):
+            start_column = dict(zip(self.players.tolist(), self.start_columns.tolist()))
+            if base_opposing_penalty > 0:
+                if opposing_formulation == 'fixture':
+                    add_fixture_penalty_rows(builder, df_players, start_column, base_opposing_penalty)
+                else:
+                    add_pairwise_penalty_rows(builder, df_players, start_column, base_opposing_penalty)
+        with profile_span(profiler, 'extensions'):
+            self._add_extensions(builder, df_players)
+        with profile_span(profiler, 'assemble'):
+            self.arrays = builder.build()
+
+        self.num_variables = builder.num_variables
+        self.num_constraints = builder.num_constraints
+
+    def _add_player_variables(self, builder, df_players, penalty_points, fdr_calculator, fdr_penalty_weight):
+        """Squad, start and captain columns per selectable player and the paid transfer count."""
+        n = len(self.players)
+        expected_points = df_players['expected_points'].to_numpy(dtype=float)[self.player_rows]
+
+        starting_points = expected_points
+        if fdr_calculator is not None:
+            fdr_coefficients = get_fdr_coefficients(df_players, fdr_calculator, fdr_penalty_weight)
+            if fdr_coefficients is not None:
+                starting_points = expected_points + fdr_coefficients[self.player_rows]
+
+        self.squad_columns = builder.add_variables(n)
+        self.start_columns = builder.add_variables(n, objective=starting_points)
+        self.captain_columns = builder.add_variables(n, objective=expected_points)
+        self.paid_column = builder.add_variables(1, upper=SQUAD_SIZE, objective=-float(penalty_points))[0]
+
+    def _add_constraints(self, builder, df_players, bench_criteria):
+        """Squad, transfer, position, club, budget and bench rules of add_compact_constraints."""
+        n_starters, n_bench = len(self.starters), len(self.bench)
+        squad, start, captain = self.squad_columns, self.start_columns, self.captain_columns
+        ones = np.ones(len(self.players))
+
+        # start <= squad, captain <= start
+        builder.add_rows(np.column_stack([start, squad]), [1, -1], upper=0)
+        builder.add_rows(np.column_stack([captain, start]), [1, -1], upper=0)
+
+        builder.add_row(squad, ones, SQUAD_SIZE, SQUAD_SIZE)
+        builder.add_row(start, ones, STARTING_SIZE, STARTING_SIZE)
+        builder.add_row(captain, ones, 1, 1)
+
+        current_starters = slice(0, n_starters)
+        current_bench = slice(n_starters, n_starters + n_bench)
+        new = slice(n_starters + n_bench, len(self.players))
+
+        # Like-for-like transfers and balanced bench/XI swaps
+        builder.add_row(
+            np.concatenate([start[new], squad[current_starters]]), 1.0,
+            n_starters, n_starters
+        )
+        builder.add_row(
+            np.concatenate([squad[new], start[new], squad[current_bench]]),
+            np.concatenate([ones[new], -ones[new], ones[current_bench]]),
+            n_bench, n_bench
+        )
+        builder.add_row(
+            np.concatenate([squad[current_starters], start[current_starters], start[current_bench]]),
+            np.concatenate([ones[current_starters], -ones[current_starters], -ones[current_bench]]),
+            0, 0
+        )
+
+        # Purchases beyond the free transfers are paid (FPL cap 5)
+        builder.add_row(
+            np.append(squad[new], self.paid_column),
+            np.append(ones[new], -1.0),
+            upper=min(self.free_transfers, 5)
+        )
+
+        player_positions = df_players['position'].to_numpy(dtype=object)[self.player_rows]
+        for position, count in SQUAD_BY_POSITION.items():
+            in_position = player_positions == position
+            builder.add_row(squad[in_position], 1.0, count, count)
+            low, high = STARTING_BY_POSITION[position]
+            builder.add_row(start[in_position], 1.0, low, high)
+
+        club_codes, clubs = df_players['team'].factorize()
+        player_clubs = club_codes[self.player_rows]
+        for club in range(len(clubs)):
+            builder.add_row(squad[player_clubs == club], 1.0, upper=MAX_PLAYERS_PER_TEAM)
+
+        prices = df_players['price'].to_numpy(dtype=float)[self.player_rows]
+        builder.add_row(squad, prices, upper=MAX_SQUAD_COST)
+
+        # Ineligible bench and new players can only be in the squad as starters
+        if bench_criteria is not None:
+            eligible = get_bench_eligibility_mask(df_players, **bench_criteria).to_numpy()[self.player_rows]
+            restricted = ~eligible
+            restricted[current_starters] = False
+            builder.add_rows(np.column_stack([squad[restricted], start[restricted]]), [1, -1], upper=0)
+
+    def _add_extensions(self, builder, df_players):
+        """Hook for subclasses to add columns and rows before assembly (none by default)."""
+
+    # ------------------------------------------------------------------------
+    # Solving
+    # ------------------------------------------------------------------------
+
+    def solve(self, solver_config=None):
+        """
+        Solve with scipy.optimize.milp.
+
+        Only the time limit, relative gap and msg settings of solver_config apply; SciPy
+        always uses its bundled HiGHS and does not expose a thread count.
+
+        Returns:
+            dict: Solve statistics in the shape returned by solve_problem
+        """
+        options = {}
+        if solver_config is not None:
+            if solver_config.time_limit is not None:
+                options['time_limit'] = solver_config.time_limit
+            if solver_config.gap_rel is not None:
+                options['mip_rel_gap'] = solver_config.gap_rel
+            options['disp'] = solver_config.msg
+
+        arrays = self.arrays
+        start = time.perf_counter()
+        result = milp(
+            -arrays['c'],
+            constraints=LinearConstraint(arrays['A'], arrays['row_lower'], arrays['row_upper']),
+            integrality=arrays['integrality'],
+            bounds=Bounds(arrays['lower'], arrays['upper']),
+            options=options
+        )
+        wall_seconds = time.perf_counter() - start
+
+        self.solution = result.x
+        self.status = MILP_STATUS.get(result.status, LpStatusUndefined)
+        if result.status == 1 and result.x is not None:
+            # Stopped at a limit with a feasible squad, reported like PuLP reports CBC
+            self.status = LpStatusOptimal
+        self.objective = -result.fun if result.x is not None else None
+
+        gap = getattr(result, 'mip_gap', None)
+        nodes = getattr(result, 'mip_node_count', None)
+        return {
+            'solver': 'scipy-milp',
+            'status': LpStatus[self.status],
+            'solution_status': result.message,
+            'proven_optimal': is_proven_optimal(result.status == 0, gap),
+            'objective': self.objective,
+            'wall_seconds': wall_seconds,
+            'nodes': int(nodes) if nodes is not None else None,
+            'gap': float(gap) if gap is not None else None,
+        }
+
+    def selected(self, columns):
+        """Set of player indices whose variable in the given column block is 1."""
+        return set(self.players[self.solution[columns] > 0.5].tolist())
+
+    def selected_rows(self, columns):
+        """Sorted row positions of the players whose variable in the given column block is 1."""
+        return np.sort(self.player_rows[self.solution[columns] > 0.5])
+
+    def process_results(self):
+        """
+        Build the squad output of process_optimization_results from the solution.
+
+        Returns:
+            dict: Squad output with starting_df, bench_df, out_df, captain, formation and decision_results
+        """
+        if self.solution is None:
+            raise RuntimeError(f"No solution available (status: {LpStatus[self.status]})")
+
+        decision_results = map_selection_to_transitions(
+            self.starters, self.bench, self.new,
+            self.selected(self.squad_columns), self.selected(self.start_columns), self.selected(self.captain_columns),
+            self.free_transfers
+        )
+        return create_squad_output(decision_results, self.df_players, self.problem_status())
+
+    def problem_status(self):
+        """Stand-in for a solved LpProblem with the status and objective read by output code."""
+        return SimpleNamespace(status=self.status, objective=self.objective)
@@ -68,9 +68,9 @@ def create_output_dataframes(decision_results, df_players, prob):
     )
     
     # Create dataframes
-    starting_df = df_players.iloc[starting_indices].copy()
-    bench_df = df_players.iloc[bench_indices].copy()
-    out_df = df_players.iloc[out_indices].copy() 
+    starting_df = df_players.loc[starting_indices].copy()
+    bench_df = df_players.loc[bench_indices].copy()
+    out_df = df_players.loc[out_indices].copy() 
     
     # Add transfer type to dataframes
     starting_df['transfer_type'] = starting_df.index.map(transfer_type_map)
@@ -142,7 +142,7 @@ def select_vice_captain(starting_df, captain_idx, df_players):
         return None
     
     # Get captain's team
-    captain_team = df_players.iloc[captain_idx]['team']
+    captain_team = df_players.loc[captain_idx]['team']
     
     # Filter starting players from different teams
     eligible_vc = starting_df[starting_df['team'] != captain_team]
@@ -184,6 +184,15 @@ def process_optimization_results(vars, df_players, prob):
     # Step 1: Extract decision variable results using your preferred method
     decision_results = extract_decision_variable_results(vars)
 
+    return create_squad_output(decision_results, df_players, prob)
+
+def create_squad_output(decision_results, df_players, prob):
+    """
+    Build the squad output dictionary from active player indices per transition type.
+
+    Used directly by formulations whose variables are mapped back to the 13 transition
+    types instead of being read from the flat vars dictionary.
+    """
     # Create output dataframes and variables
     (starting_df, bench_df, out_df, captain_idx, vice_captain_idx, 
      formation, gameweek, optimization_status, total_cost) = create_output_dataframes(
@@ -0,0 +1,311 @@
+# stochastic_optimiser.py
+# Sample-average squad selection over correlated points scenarios, with an optional CVaR floor
+
+import argparse
+import numpy as np
+import pandas as pd
+from pulp import LpStatus, LpStatusOptimal
+from sparse_backend import SparseSquadModel
+from candidate_pool import prune_candidate_pool, print_pool_report
+from solver_config import add_solver_arguments, solver_config_from_args, print_solve_stats
+from opposing_teams import OPPOSING_FORMULATIONS
+
+from fpl_data.storage import read_player_data
+
+# Standard deviation of log points per position (attackers have the most upside)
+POSITION_VOLATILITY = {'Goalkeeper': 0.5, 'Defender': 0.6, 'Midfielder': 0.75, 'Forward': 0.85}
+
+# Share of a player's club factor that comes from their side's attack rather than its defence
+POSITION_ATTACK_SHARE = {'Goalkeeper': 0.0, 'Defender': 0.2, 'Midfielder': 0.7, 'Forward': 1.0}
+
+DEFAULT_SCENARIOS = 200
+DEFAULT_CVAR_ALPHA = 0.1
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def generate_scenarios(df_players, n_scenarios=DEFAULT_SCENARIOS, seed=0, club_correlation=0.4, dtype=np.float32):
+    """
+    Sample correlated gameweek points for every player.
+
+    Each club draws an attack and a defence strength per scenario. A side's attacking
+    performance is its attack against the opponent's defence and its defensive
+    performance the reverse, so team-mates move together and players facing each
+    other move in opposite directions. Each player's log points load on those club
+    factors (club_correlation, split by POSITION_ATTACK_SHARE) plus individual noise,
+    scaled by POSITION_VOLATILITY. The lognormal multiplier has mean 1, so every
+    player's scenario mean matches expected_points.
+
+    Args:
+        df_players: DataFrame with position, team_id, expected_points and (optionally)
+            opponent_id columns
+        n_scenarios: Number of scenarios (S)
+        seed: Random seed
+        club_correlation: Weight of the shared club factor in each player's log points (0-1)
+        dtype: Array dtype (float32 halves the memory of float64)
+
+    Returns:
+        np.ndarray: (players x S) points, one row per df_players row, in row order
+    """
+    rng = np.random.default_rng(seed)
+
+    team_ids = df_players['team_id'].to_numpy()
+    opponent_ids = df_players['opponent_id'].to_numpy() if 'opponent_id' in df_players.columns else np.full(len(df_players), np.nan)
+    codes, clubs = pd.factorize(pd.Series(np.concatenate([team_ids, opponent_ids])), use_na_sentinel=True)
+    club_codes, opponent_codes = codes[:len(df_players)], codes[len(df_players):]
+
+    # One extra all-zero row stands in for a missing opponent (code -1)
+    attack = np.vstack([rng.standard_normal((len(clubs), n_scenarios)), np.zeros((1, n_scenarios))])
+    defence = np.vstack([rng.standard_normal((len(clubs), n_scenarios)), np.zeros((1, n_scenarios))])
+    has_opponent = (opponent_codes >= 0)[:, None]
+    scale = np.where(has_opponent, np.sqrt(0.5), 1.0)
+    attacking = (attack[club_codes] - defence[opponent_codes]) * scale
+    defending = (defence[club_codes] - attack[opponent_codes]) * scale
+
+    positions = df_players['position']
+    share = positions.map(POSITION_ATTACK_SHARE).fillna(0.5).to_numpy()[:, None]
+    club_factor = (share * attacking + (1 - share) * defending) / np.sqrt(share ** 2 + (1 - share) ** 2)
+
+    noise = rng.standard_normal((len(df_players), n_scenarios))
+    z = club_correlation * club_factor + np.sqrt(1 - club_correlation ** 2) * noise
+
+    sigma = positions.map(POSITION_VOLATILITY).fillna(0.7).to_numpy()[:, None]
+    expected_points = df_players['expected_points'].to_numpy(dtype=float)[:, None]
+    return (expected_points * np.exp(sigma * z - sigma ** 2 / 2)).astype(dtype)
+
+def summarise_scores(scores, alpha=DEFAULT_CVAR_ALPHA):
+    """
+    Distribution of a squad's points over scenarios.
+
+    Returns:
+        dict: mean, std, cvar (mean of the worst alpha share of scenarios), p5 and p95
+    """
+    worst = np.sort(scores)[:max(1, int(np.ceil(alpha * len(scores))))]
+    return {
+        'mean': float(scores.mean()),
+        'std': float(scores.std()),
+        'cvar': float(worst.mean()),
+        'p5': float(np.percentile(scores, 5)),
+        'p95': float(np.percentile(scores, 95)),
+    }
+
+# ============================================================================
+# MODEL
+# ============================================================================
+
+class StochasticSquadModel(SparseSquadModel):
+    """
+    Sample-average version of the sparse compact model.
+
+    The objective is the mean over scenarios. It is linear, so it equals the
+    deterministic objective with each player's scenario mean as expected_points, and
+    needs no per-scenario columns. The scenarios enter only through the optional CVaR
+    floor on net points Z_s (starter and captain points minus the transfer hit): the
+    mean of the worst m = ceil(alpha * S) scenarios must be at least cvar_floor.
+
+    The floor uses the Rockafellar-Uryasev formulation: S + 1 continuous columns
+    and S + 1 rows,
+
+        eta - 1 / m * sum(u_s) >= cvar_floor
+        u_s >= eta - Z_s,  u_s >= 0
+
+    Each scenario row holds two entries per selectable player, so the matrix grows as
+    S x players. Pruning the pool first (prune_candidate_pool) keeps S in the hundreds
+    tractable. Lazily adding worst-case scenario sets as single cuts needs too many
+    MILP re-solves to converge on this model.
+
+    Example:
+        scenarios = generate_scenarios(df_players, 300)
+        model = StochasticSquadModel(df_players, my_team, scenarios, cvar_floor=40)
+        stats = model.solve()
+        summarise_scores(model.scenario_scores())
+    """
+
+    def __init__(self, df_players, my_team, scenarios, cvar_alpha=DEFAULT_CVAR_ALPHA, cvar_floor=None,
+                 penalty_points=4, **model_options):
+        """
+        Args:
+            df_players: DataFrame with player data (any unique index)
+            my_team: Team instance with the current squad
+            scenarios: (players x S) points array from generate_scenarios, rows in df_players order
+            cvar_alpha: Share of worst scenarios averaged by the CVaR constraint
+            cvar_floor: Minimum CVaR of net points (None for the plain mean objective)
+            penalty_points: Points penalty per paid transfer
+            **model_options: Other SparseSquadModel arguments (opposing penalty, FDR, bench criteria)
+        """
+        if scenarios.shape[0] != len(df_players):
+            raise ValueError(f"Scenarios have {scenarios.shape[0]} rows for {len(df_players)} players")
+
+        self.scenarios = scenarios
+        self.cvar_alpha = cvar_alpha
+        self.cvar_floor = cvar_floor
+        self.cvar_tail = max(1, int(np.ceil(cvar_alpha * scenarios.shape[1])))
+        self.penalty_points = penalty_points
+
+        mean_pool = df_players.copy()
+        mean_pool['expected_points'] = scenarios.mean(axis=1, dtype=float)
+        super().__init__(mean_pool, my_team, penalty_points=penalty_points, **model_options)
+
+    def _add_extensions(self, builder, df_players):
+        """CVaR columns and rows, when a floor is set."""
+        if self.cvar_floor is None:
+            return
+
+        n_scenarios = self.scenarios.shape[1]
+        eta = builder.add_variables(1, lower=-np.inf, upper=np.inf, integer=False)[0]
+        shortfall = builder.add_variables(n_scenarios, lower=0, upper=np.inf, integer=False)
+
+        # u_s + Z_s - eta >= 0, with Z_s = points of starters and captain - hit
+        player_points = self.scenarios[self.player_rows].T
+        width = 2 * len(self.players) + 3
+        columns = np.empty((n_scenarios, width), dtype=np.int64)
+        columns[:, :len(self.players)] = self.start_columns
+        columns[:, len(self.players):2 * len(self.players)] = self.captain_columns
+        columns[:, -3:] = [self.paid_column, eta, 0]
+        columns[:, -1] = shortfall
+        coefficients = np.empty((n_scenarios, width))
+        coefficients[:, :2 * len(self.players)] = np.hstack([player_points, player_points])
+        coefficients[:, -3:] = [-float(self.penalty_points), -1.0, 1.0]
+        builder.add_rows(columns, coefficients, lower=0)
+
+        builder.add_row(
+            np.append(eta, shortfall),
+            np.append(1.0, np.full(n_scenarios, -1.0 / self.cvar_tail)),
+            lower=self.cvar_floor
+        )
+
+    def scenario_scores(self, scenarios=None):
+        """
+        Net points of the solved squad in each scenario.
+
+        Args:
+            scenarios: (players x S') array to evaluate on, e.g. fresh out-of-sample
+                scenarios (default: the scenarios the model was built with)
+
+        Returns:
+            np.ndarray: Points per scenario
+        """
+        if self.solution is None:
+            raise RuntimeError(f"No solution available (status: {LpStatus[self.status]})")
+        scenarios = self.scenarios if scenarios is None else scenarios
+
+        starters = self.selected_rows(self.start_columns)
+        captain = self.selected_rows(self.captain_columns)
+        paid = round(self.solution[self.paid_column])
+        return (scenarios[starters].sum(axis=0, dtype=float) + scenarios[captain].sum(axis=0, dtype=float)
+                - self.penalty_points * paid)
+
+    @property
+    def matrix_entries(self):
+        """Non-zeros of the constraint matrix."""
+        return self.arrays['A'].nnz
+
+    @property
+    def matrix_bytes(self):
+        """Memory of the CSR constraint matrix."""
+        A = self.arrays['A']
+        return A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+
+def optimise_stochastic(df_players, my_team, n_scenarios=DEFAULT_SCENARIOS, seed=0, club_correlation=0.4,
+                        cvar_alpha=DEFAULT_CVAR_ALPHA, cvar_floor=None, solver_config=None, **model_options):
+    """
+    Generate scenarios, build the sample-average model and solve it.
+
+    Returns:
+        tuple: (StochasticSquadModel, solve statistics)
+    """
+    scenarios = generate_scenarios(df_players, n_scenarios, seed=seed, club_correlation=club_correlation)
+    model = StochasticSquadModel(df_players, my_team, scenarios, cvar_alpha=cvar_alpha, cvar_floor=cvar_floor,
+                                 **model_options)
+    return model, model.solve(solver_config)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def print_score_summary(label, summary, alpha):
+    """Print one line of scenario statistics."""
+    print(f"{label:<22} mean {summary['mean']:6.2f}  std {summary['std']:5.2f}  "
+          f"CVaR{alpha:.0%} {summary['cvar']:6.2f}  p5 {summary['p5']:6.2f}  p95 {summary['p95']:6.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Squad selection over sampled points scenarios")
+    parser.add_argument('--csv', default='data/fpl_players_gw_9.csv', help="Gameweek player CSV")
+    parser.add_argument('--team-id', type=int, default=2562804, help="FPL team ID for the current squad")
+    parser.add_argument('--synthetic-players', type=int, default=None,
+                        help="Use a synthetic pool and squad instead of --csv and --team-id")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scenarios', type=int, default=DEFAULT_SCENARIOS, help="Number of scenarios (S)")
+    parser.add_argument('--club-correlation', type=float, default=0.4)
+    parser.add_argument('--cvar-alpha', type=float, default=DEFAULT_CVAR_ALPHA)
+    parser.add_argument('--cvar-floor', type=float, default=None, help="Minimum CVaR of net points")
+    parser.add_argument('--cvar-margin', type=float, default=None,
+                        help="Set the floor this many points above the mean-optimal squad's CVaR")
+    parser.add_argument('--out-of-sample', type=int, default=1000, help="Fresh scenarios to evaluate the squads on")
+    parser.add_argument('--penalty-points', type=float, default=4)
+    parser.add_argument('--base-opposing-penalty', type=float, default=1)
+    parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='fixture')
+    parser.add_argument('--prune', action='store_true',
+                        help="Prune the pool on expected points first (mean objective only, not with a CVaR floor)")
+    add_solver_arguments(parser)
+    args = parser.parse_args()
+    if args.prune and (args.cvar_floor is not None or args.cvar_margin is not None):
+        # Dominance is decided on mean points, so pruning can drop a low-variance player the floor needs
+        parser.error("--prune is only exact for the mean objective and cannot be combined with --cvar-floor "
+                     "or --cvar-margin")
+
+    if args.synthetic_players:
+        from synthetic_instances import generate_instance
+        df_players, my_team = generate_instance(args.synthetic_players, seed=args.seed)
+    else:
+        from team_class import Team
+        df_players = read_player_data(args.csv)
+        my_team = Team(team_id=args.team_id)
+
+    if args.prune:
+        df_players, pool_report = prune_candidate_pool(df_players, my_team, base_opposing_penalty=args.base_opposing_penalty)
+        print_pool_report(pool_report)
+
+    solver_config = solver_config_from_args(args)
+    scenarios = generate_scenarios(df_players, args.scenarios, seed=args.seed, club_correlation=args.club_correlation)
+    fresh = generate_scenarios(df_players, args.out_of_sample, seed=args.seed + 1, club_correlation=args.club_correlation)
+    model_options = dict(
+        cvar_alpha=args.cvar_alpha,
+        penalty_points=args.penalty_points,
+        base_opposing_penalty=args.base_opposing_penalty,
+        opposing_formulation=args.opposing_formulation,
+    )
+    print(f"{args.scenarios} scenarios for {len(df_players)} players ({scenarios.nbytes / 1024 ** 2:.1f} MB)")
+
+    mean_model = StochasticSquadModel(df_players, my_team, scenarios, **model_options)
+    print_solve_stats(mean_model.solve(solver_config))
+    if mean_model.status != LpStatusOptimal:
+        print(f"No solution (status: {LpStatus[mean_model.status]})")
+        return
+    in_sample = summarise_scores(mean_model.scenario_scores(), args.cvar_alpha)
+    print_score_summary("Mean-optimal", in_sample, args.cvar_alpha)
+    print_score_summary("  out of sample", summarise_scores(mean_model.scenario_scores(fresh), args.cvar_alpha), args.cvar_alpha)
+
+    cvar_floor = args.cvar_floor
+    if cvar_floor is None and args.cvar_margin is not None:
+        cvar_floor = in_sample['cvar'] + args.cvar_margin
+    if cvar_floor is None:
+        return
+
+    model = StochasticSquadModel(df_players, my_team, scenarios, cvar_floor=cvar_floor, **model_options)
+    print(f"\nCVaR floor {cvar_floor:.2f}: {model.num_variables} variables, {model.num_constraints} constraints, "
+          f"{model.matrix_entries} non-zeros ({model.matrix_bytes / 1024 ** 2:.1f} MB)")
+    print_solve_stats(model.solve(solver_config))
+    if model.status != LpStatusOptimal:
+        print(f"No squad meets the CVaR floor (status: {LpStatus[model.status]})")
+        return
+    print_score_summary("CVaR-constrained", summarise_scores(model.scenario_scores(), args.cvar_alpha), args.cvar_alpha)
+    print_score_summary("  out of sample", summarise_scores(model.scenario_scores(fresh), args.cvar_alpha), args.cvar_alpha)
+
+    squad = model.process_results()
+    print(f"Captain: {squad['starting_df'].loc[squad['captain_idx'], 'name']}")
+    print(f"Starting XI: {', '.join(squad['starting_df']['name'])}")
+
+if __name__ == "__main__":
+    main()
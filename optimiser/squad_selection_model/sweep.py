@@ -0,0 +1,213 @@
+# sweep.py
+# Solve the squad selection model over a grid of penalty weights and transfer settings in parallel
+
+import argparse
+import itertools
+import os
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pulp import LpStatus, value
+from persistent_model import PersistentSquadModel
+from solver_config import SolverConfig, add_solver_arguments, solver_config_from_args
+from opposing_teams import OPPOSING_FORMULATIONS
+from fdr import CSVFDRCalculator
+from team_class import Team
+
+from fpl_data.storage import read_player_data
+
+SWEEP_PARAMETERS = ['penalty_points', 'base_opposing_penalty', 'fdr_penalty_weight', 'free_transfers']
+
+# Per-worker state, set once by init_sweep_worker so the player data is not re-sent with every task
+_worker_state = {}
+
+# ============================================================================
+# GRID
+# ============================================================================
+
+def build_parameter_grid(**parameter_values):
+    """
+    Build every combination of the given parameter values.
+
+    Args:
+        **parameter_values: Parameter name (from SWEEP_PARAMETERS) to list of values
+
+    Returns:
+        list: One dict per combination
+    """
+    unknown = set(parameter_values) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    names = list(parameter_values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*parameter_values.values())]
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def init_sweep_worker(df_players, my_team, fdr_calculator, opposing_formulation, solver_config):
+    """Store the shared player data in the worker process; the model is built on first use."""
+    _worker_state['df_players'] = df_players
+    _worker_state['my_team'] = my_team
+    _worker_state['fdr_calculator'] = fdr_calculator
+    _worker_state['opposing_formulation'] = opposing_formulation
+    _worker_state['solver_config'] = solver_config
+    _worker_state['model'] = None
+
+def summarise_solution(model):
+    """
+    Summarise the transfers and captain of a solved model.
+
+    Returns:
+        dict: Status, objective, transfers in/out, paid transfers and captain
+    """
+    df_players = model.df_players
+    vars = model.vars
+
+    def selected(var_types):
+        return [idx for var_type in var_types for idx, var in vars[var_type].items() if (var.value() or 0) > 0.5]
+
+    transfers_in = selected(['in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid'])
+    transfers_out = selected(['out_starting_free', 'out_starting_paid', 'out_bench_free', 'out_bench_paid'])
+    paid_transfers = selected(['in_to_starting_paid', 'in_to_bench_paid'])
+    captain = selected(['captain'])
+
+    return {
+        'status': LpStatus[model.prob.status],
+        'objective': value(model.prob.objective),
+        'transfers': len(transfers_in),
+        'paid_transfers': len(paid_transfers),
+        'transfers_in': ', '.join(df_players.loc[transfers_in, 'name']),
+        'transfers_out': ', '.join(df_players.loc[transfers_out, 'name']),
+        'captain': df_players.loc[captain[0], 'name'] if captain else None,
+    }
+
+def solve_sweep_point(parameters):
+    """
+    Solve one grid point in a worker, reusing the worker's persistent model.
+
+    Args:
+        parameters: Dict of parameter values for PersistentSquadModel.update
+
+    Returns:
+        dict: Parameters, solution summary and solve time
+    """
+    if _worker_state['model'] is None:
+        _worker_state['model'] = PersistentSquadModel(
+            _worker_state['df_players'], _worker_state['my_team'],
+            fdr_calculator=_worker_state['fdr_calculator'],
+            opposing_formulation=_worker_state['opposing_formulation']
+        )
+    model = _worker_state['model']
+
+    start = time.perf_counter()
+    model.update(**parameters)
+    solve_stats = model.solve(_worker_state['solver_config'])
+    solve_seconds = time.perf_counter() - start
+
+    return {
+        **parameters,
+        **summarise_solution(model),
+        'solve_seconds': solve_seconds,
+        'nodes': solve_stats['nodes'],
+        'gap': solve_stats['gap'],
+        'worker': os.getpid(),
+    }
+
+# ============================================================================
+# SWEEP
+# ============================================================================
+
+def run_sweep(df_players, my_team, grid, fdr_calculator=None, opposing_formulation='pairwise', workers=None,
+              solver_config=None):
+    """
+    Solve every grid point in a process pool.
+
+    Each worker receives the player data once and keeps a persistent model between its
+    grid points. Solvers default to one thread so workers do not oversubscribe cores.
+
+    Args:
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        grid: List of parameter dicts from build_parameter_grid
+        fdr_calculator: FDR calculator instance (optional)
+        opposing_formulation: Opposing teams penalty formulation
+        workers: Number of worker processes (default: CPU count)
+        solver_config: SolverConfig instance (default: single-threaded CBC)
+
+    Returns:
+        tuple: (results DataFrame in grid order, wall-clock seconds)
+    """
+    workers = workers or os.cpu_count()
+    solver_config = solver_config or SolverConfig(threads=1)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_sweep_worker,
+        initargs=(df_players, my_team, fdr_calculator, opposing_formulation, solver_config)
+    ) as executor:
+        results = list(executor.map(solve_sweep_point, grid))
+    wall_seconds = time.perf_counter() - start
+
+    return pd.DataFrame(results), wall_seconds
+
+def print_sweep_summary(results, wall_seconds, workers):
+    """Print the sweep results table and parallel efficiency."""
+    columns = [c for c in SWEEP_PARAMETERS if c in results.columns]
+    columns += ['objective', 'transfers', 'paid_transfers', 'captain', 'solve_seconds']
+    print(results[columns].to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    total_solve = results['solve_seconds'].sum()
+    print(f"\n{len(results)} grid points in {wall_seconds:.1f}s wall-clock on {workers} workers "
+          f"(sum of solve times {total_solve:.1f}s, ideal {total_solve / workers:.1f}s)")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep for the squad selection model")
+    parser.add_argument('--csv', default='data/fpl_players_gw_9.csv', help="Gameweek player CSV")
+    parser.add_argument('--team-id', type=int, default=2562804, help="FPL team ID for the current squad")
+    parser.add_argument('--penalty-points', type=float, nargs='+', default=[4])
+    parser.add_argument('--base-opposing-penalty', type=float, nargs='+', default=[1])
+    parser.add_argument('--fdr-penalty-weight', type=float, nargs='+', default=[0.5])
+    parser.add_argument('--free-transfers', type=int, nargs='+', default=None)
+    parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', default='sweep_results.csv', help="CSV file for the results table")
+    add_solver_arguments(parser)
+    args = parser.parse_args()
+
+    parameter_values = {
+        'penalty_points': args.penalty_points,
+        'base_opposing_penalty': args.base_opposing_penalty,
+        'fdr_penalty_weight': args.fdr_penalty_weight,
+    }
+    if args.free_transfers:
+        parameter_values['free_transfers'] = args.free_transfers
+    grid = build_parameter_grid(**parameter_values)
+
+    df_players = read_player_data(args.csv)
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+    my_team = Team(team_id=args.team_id)
+
+    workers = args.workers or os.cpu_count()
+    print(f"Sweeping {len(grid)} parameter combinations on {workers} workers")
+    results, wall_seconds = run_sweep(
+        df_players, my_team, grid,
+        fdr_calculator=fdr_calculator,
+        opposing_formulation=args.opposing_formulation,
+        workers=workers,
+        solver_config=solver_config_from_args(args, threads=args.threads or 1)
+    )
+
+    results.to_csv(args.output, index=False)
+    print_sweep_summary(results, wall_seconds, workers)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# synthetic_instances.py
+# Reproducible player pools and current squads for benchmarking without the FPL API
+
+import numpy as np
+import pandas as pd
+from team_class import Team
+
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Forward']
+
+# Share of each position in an FPL player pool
+POSITION_SHARES = [0.11, 0.33, 0.40, 0.16]
+
+# Price range (min, max) by position, in £m
+PRICE_RANGES = {
+    'Goalkeeper': (4.0, 6.0),
+    'Defender': (4.0, 7.5),
+    'Midfielder': (4.5, 14.0),
+    'Forward': (4.5, 15.0),
+}
+
+# Player statuses and how often they occur: available, doubtful, injured, suspended, unavailable
+STATUSES = ['a', 'd', 'i', 's', 'u']
+STATUS_SHARES = [0.86, 0.05, 0.05, 0.02, 0.02]
+
+# Roughly how many players an FPL club has in the game
+PLAYERS_PER_TEAM = 35
+
+SQUAD_SHAPE = {'Goalkeeper': 2, 'Defender': 5, 'Midfielder': 5, 'Forward': 3}
+STARTING_SHAPE = {'Goalkeeper': 1, 'Defender': 4, 'Midfielder': 4, 'Forward': 2}
+
+BENCHMARK_POOL_SIZES = [600, 800, 2000, 10000]
+
+def generate_player_pool(n_players, seed=0, n_teams=None, gameweek=9, blank_teams=0):
+    """
+    Generate a player pool with the columns of the gameweek CSVs used by the optimiser.
+
+    Prices follow a right-skewed distribution per position, expected points rise with
+    price, and ownership rises with expected points. Teams are paired into fixtures;
+    blank teams have no fixture this gameweek.
+
+    Args:
+        n_players: Number of players
+        seed: Random seed
+        n_teams: Number of clubs (default: one per ~35 players, at least 20, always even)
+        gameweek: Gameweek number written to the 'gameweek' column
+        blank_teams: Number of clubs without a fixture (rounded down to an even number)
+
+    Returns:
+        pd.DataFrame: Player pool with a RangeIndex
+    """
+    rng = np.random.default_rng(seed)
+
+    if n_teams is None:
+        n_teams = max(20, round(n_players / PLAYERS_PER_TEAM))
+    n_teams += n_teams % 2
+    team_ids = np.arange(1, n_teams + 1)
+
+    # Fixtures: pair clubs at random, leaving blank_teams without an opponent
+    shuffled = rng.permutation(team_ids)
+    blank = blank_teams - blank_teams % 2
+    opponents = {team_id: 0 for team_id in shuffled[:blank]}
+    playing = shuffled[blank:]
+    for home, away in zip(playing[::2], playing[1::2]):
+        opponents[home] = away
+        opponents[away] = home
+    team_fdr = {team_id: round(float(rng.uniform(1.8, 4.2)), 2) for team_id in team_ids}
+
+    positions = rng.choice(len(POSITIONS), size=n_players, p=POSITION_SHARES)
+    player_teams = rng.choice(team_ids, size=n_players)
+
+    # Prices: skewed towards the cheap end of each position's range, in £0.1m steps
+    low = np.array([PRICE_RANGES[POSITIONS[p]][0] for p in positions])
+    high = np.array([PRICE_RANGES[POSITIONS[p]][1] for p in positions])
+    prices = np.round(low + (high - low) * rng.beta(1.3, 4.0, n_players), 1)
+
+    statuses = rng.choice(STATUSES, size=n_players, p=STATUS_SHARES)
+    minutes = np.where(rng.random(n_players) < 0.2, 0, rng.integers(1, 90 * gameweek + 1, n_players))
+
+    # Expected points rise with price and with regular minutes
+    price_share = (prices - low) / (high - low)
+    expected_points = 1.5 + 6.0 * price_share + rng.normal(0, 1.2, n_players)
+    expected_points = np.where(minutes == 0, rng.uniform(0, 1, n_players), expected_points)
+    expected_points = np.where(np.isin(statuses, ['i', 's', 'u']), 0, expected_points)
+    expected_points = np.round(np.clip(expected_points, 0, None), 1)
+
+    ownership = np.round(np.clip(rng.gamma(1.0, 3.0, n_players) * (0.3 + 2 * price_share), 0, 80), 1)
+    form = np.round(np.clip(expected_points + rng.normal(0, 1.0, n_players), 0, None), 1)
+
+    team_names = {team_id: f"Club {team_id:02d}" for team_id in team_ids}
+    opponent_names = {team_id: team_names.get(opp, 'No fixture') for team_id, opp in opponents.items()}
+
+    return pd.DataFrame({
+        'id': np.arange(1, n_players + 1),
+        'name': [f"Player {i}" for i in range(1, n_players + 1)],
+        'position': [POSITIONS[p] for p in positions],
+        'team': [team_names[t] for t in player_teams],
+        'team_id': player_teams,
+        'opponent': [opponent_names[t] for t in player_teams],
+        'opponent_id': [opponents[t] for t in player_teams],
+        'price': prices,
+        'expected_points': expected_points,
+        'status': statuses,
+        'minutes': minutes,
+        'selected_by_percent': ownership,
+        'form': form,
+        'team_fdr_5gw': [team_fdr[t] for t in player_teams],
+        'gameweek': gameweek,
+    })
+
+def generate_current_squad(df_players, seed=0, budget=0.5, free_transfers=1, max_squad_cost=100.0):
+    """
+    Pick a valid 15-player squad from a pool and wrap it in a Team.
+
+    The squad has 2/5/5/3 players by position, at most 3 per club and only available
+    players, and costs at most max_squad_cost. The best players by expected points in
+    each position start, in a 4-4-2.
+
+    Args:
+        df_players: Player pool from generate_player_pool (or a gameweek CSV)
+        seed: Random seed
+        budget: Bank balance
+        free_transfers: Number of free transfers available
+        max_squad_cost: Maximum total price of the squad
+
+    Returns:
+        Team: Team built with Team.from_player_data
+    """
+    rng = np.random.default_rng(seed)
+    available = df_players[df_players['status'] == 'a']
+
+    for _ in range(100):
+        club_counts = {}
+        chosen = {}
+        for position, count in SQUAD_SHAPE.items():
+            candidates = available[available['position'] == position]
+            order = rng.permutation(len(candidates))
+            picks = []
+            for row in order:
+                player = candidates.iloc[row]
+                if club_counts.get(player['team_id'], 0) >= 3:
+                    continue
+                picks.append(player)
+                club_counts[player['team_id']] = club_counts.get(player['team_id'], 0) + 1
+                if len(picks) == count:
+                    break
+            chosen[position] = picks
+
+        if any(len(chosen[position]) < count for position, count in SQUAD_SHAPE.items()):
+            raise ValueError("Player pool is too small to pick a valid squad")
+        if sum(player['price'] for picks in chosen.values() for player in picks) <= max_squad_cost:
+            break
+    else:
+        raise ValueError(f"Could not pick a squad costing at most £{max_squad_cost}m")
+
+    starting_ids, bench_ids = [], []
+    for position, picks in chosen.items():
+        picks = sorted(picks, key=lambda player: player['expected_points'], reverse=True)
+        starters = STARTING_SHAPE[position]
+        starting_ids += [int(player['id']) for player in picks[:starters]]
+        bench_ids += [int(player['id']) for player in picks[starters:]]
+
+    return Team.from_player_data(
+        df_players, starting_ids, bench_ids,
+        budget=budget, free_transfers=free_transfers
+    )
+
+def generate_instance(n_players, seed=0, **pool_options):
+    """
+    Generate a player pool and a current squad from it.
+
+    Returns:
+        tuple: (df_players, my_team)
+    """
+    df_players = generate_player_pool(n_players, seed=seed, **pool_options)
+    return df_players, generate_current_squad(df_players, seed=seed)
+
+def generate_timetable(df_players, n_gameweeks=8, seed=0, blank_rate=0.0, double_rate=0.0):
+    """
+    Generate a fixture timetable with the columns of data/timetable_data/timetable.csv.
+
+    The first gameweek uses the fixtures in df_players (team_id vs opponent_id); later
+    gameweeks pair clubs at random. Difficulty follows the opponent's strength, derived
+    from the pool's team_fdr_5gw ratings.
+
+    Args:
+        df_players: Player pool from generate_player_pool
+        n_gameweeks: Number of gameweeks, starting at the pool's gameweek
+        seed: Random seed
+        blank_rate: Share of clubs without a fixture in each later gameweek
+        double_rate: Share of clubs with a second fixture in each later gameweek
+
+    Returns:
+        pd.DataFrame: One row per fixture
+    """
+    rng = np.random.default_rng(seed)
+    first_gameweek = int(df_players['gameweek'].iloc[0])
+    teams = df_players.drop_duplicates('team_id').set_index('team_id')
+    team_ids = teams.index.to_numpy()
+
+    # Strength 1 (weak) to 5 (strong): harder ratings in the pool mean a weaker side
+    ratings = teams['team_fdr_5gw']
+    strength = (5 - 4 * (ratings - ratings.min()) / max(ratings.max() - ratings.min(), 1e-9)).round().astype(int)
+
+    def pairings(gameweek):
+        if gameweek == first_gameweek:
+            pairs = teams['opponent_id'].items()
+            return [(home, away) for home, away in pairs if away and home < away]
+        shuffled = rng.permutation(team_ids)
+        n_blank = int(len(shuffled) * blank_rate) // 2 * 2
+        playing = shuffled[n_blank:]
+        pairs = list(zip(playing[::2], playing[1::2]))
+        n_double = int(len(playing) * double_rate) // 2
+        doubles = rng.permutation(playing)[:2 * n_double]
+        pairs += list(zip(doubles[::2], doubles[1::2]))
+        return pairs
+
+    rows = []
+    for gameweek in range(first_gameweek, first_gameweek + n_gameweeks):
+        for home, away in pairings(gameweek):
+            if rng.random() < 0.5:
+                home, away = away, home
+            rows.append({
+                'fixture_id': len(rows) + 1,
+                'gameweek': gameweek,
+                'kickoff_time': None,
+                'team_h': teams.loc[home, 'team'],
+                'team_h_id': int(home),
+                'team_a': teams.loc[away, 'team'],
+                'team_a_id': int(away),
+                'team_h_score': None,
+                'team_a_score': None,
+                'finished': False,
+                'started': False,
+                'team_h_difficulty': int(strength[away]),
+                'team_a_difficulty': int(strength[home]),
+            })
+
+    return pd.DataFrame(rows)
@@ -2,6 +2,8 @@
 import requests
 import pandas as pd
 
+from fpl_data.client import get_client
+
 class Team:
     def __init__(self, team_id, budget=0.0, free_transfers=1, manual_player_ids=None):
         """
@@ -30,7 +32,7 @@ class Team:
         """Fetch team data from FPL API"""
         # Get bootstrap data (all players)
         print("⏳ Fetching team data from FPL API...")
-        bootstrap = requests.get('https://fantasy.premierleague.com/api/bootstrap-static/', timeout=30).json()
+        bootstrap = get_client().get_json('bootstrap-static/')
         print("✅ Bootstrap data received")
         
         # Find current gameweek
@@ -39,14 +41,9 @@ class Team:
         
         # Get team picks
         print(f"⏳ Fetching team picks for gameweek {self.current_gw}...")
-        picks_resp = requests.get(f'https://fantasy.premierleague.com/api/entry/{self.team_id}/event/{self.current_gw}/picks/', timeout=30)
+        picks_data = self._fetch_picks_data()
         print("✅ Team picks received")
         
-        if picks_resp.status_code != 200:
-            raise ValueError(f"Could not fetch team {self.team_id}")
-        
-        picks_data = picks_resp.json()
-        
         # Create player lookup
         players = {p['id']: p for p in bootstrap['elements']}
         
@@ -74,6 +71,13 @@ class Team:
         # Calculate team value
         self.team_value = self.current_team['price'].sum()
     
+    def _fetch_picks_data(self):
+        """Fetch this team's picks for the current gameweek from the FPL API"""
+        try:
+            return get_client().get_json(f'entry/{self.team_id}/event/{self.current_gw}/picks/')
+        except requests.HTTPError:
+            raise ValueError(f"Could not fetch team {self.team_id}")
+    
     def _build_team_from_manual_ids(self, player_ids):
         """
         Build team from manually specified player IDs
@@ -86,7 +90,7 @@ class Team:
         
         # Get bootstrap data for player info
         print(f"⏳ Fetching player data from FPL API for manual team setup...")
-        bootstrap = requests.get('https://fantasy.premierleague.com/api/bootstrap-static/', timeout=30).json()
+        bootstrap = get_client().get_json('bootstrap-static/')
         print(f"✅ Player data received")
         
         # Find current gameweek
@@ -126,6 +130,67 @@ class Team:
         
         print(f"✅ Manual team loaded: {len(self.starting_ids)} starting, {len(self.bench_ids)} bench")
     
+    @classmethod
+    def from_player_data(cls, df_players, starting_ids, bench_ids, team_id=0, budget=0.0, free_transfers=1, current_gw=None):
+        """
+        Build a team from a player DataFrame without calling the FPL API
+        
+        Used for synthetic instances, benchmarks and offline runs.
+        
+        Args:
+            df_players: DataFrame with id, name, position, team, price and expected_points columns
+            starting_ids: 11 player IDs in the starting XI
+            bench_ids: 4 player IDs on the bench
+            team_id: FPL team ID to record (not fetched)
+            budget: Current bank balance
+            free_transfers: Number of free transfers available
+            current_gw: Current gameweek (default: the 'gameweek' column, if present)
+            
+        Returns:
+            Team: Team instance with the same attributes as one fetched from the API
+        """
+        team = cls.__new__(cls)
+        team.team_id = team_id
+        team.budget = budget
+        team.free_transfers = free_transfers
+        team.manual_player_ids = list(starting_ids) + list(bench_ids)
+        
+        players = df_players.set_index('id')
+        missing = [pid for pid in team.manual_player_ids if pid not in players.index]
+        if missing:
+            raise ValueError(f"Player IDs not found in player data: {missing}")
+        
+        if current_gw is None and 'gameweek' in players.columns:
+            current_gw = int(players['gameweek'].iloc[0])
+        team.current_gw = current_gw
+        
+        position_codes = {'Goalkeeper': 'GK', 'Defender': 'DEF', 'Midfielder': 'MID', 'Forward': 'FWD'}
+        starting = set(starting_ids)
+        team_data = []
+        for player_id in team.manual_player_ids:
+            player = players.loc[player_id]
+            team_data.append({
+                'player_id': player_id,
+                'name': player['name'],
+                'position': position_codes.get(player['position'], player['position']),
+                'team': player['team'],
+                'price': player['price'],
+                'is_starting': player_id in starting,
+                'expected_points': player.get('expected_points', 0),
+            })
+        
+        team.current_team = pd.DataFrame(team_data)
+        
+        # Create ID sets
+        team.starting_ids = set(team.current_team[team.current_team['is_starting']]['player_id'].tolist())
+        team.bench_ids = set(team.current_team[~team.current_team['is_starting']]['player_id'].tolist())
+        team.all_ids = team.starting_ids | team.bench_ids
+        
+        # Calculate team value
+        team.team_value = team.current_team['price'].sum()
+        
+        return team
+    
     def is_in_starting(self, player_id):
         """Check if player is in starting XI"""
         return player_id in self.starting_ids
@@ -206,19 +271,16 @@ class Team:
             dict: Complete team financial breakdown
         """
         # Get team picks data
-        picks_resp = requests.get(f'https://fantasy.premierleague.com/api/entry/{self.team_id}/event/{self.current_gw}/picks/')
-        
-        if picks_resp.status_code != 200:
-            raise ValueError(f"Could not fetch team {self.team_id}")
-        
-        picks_data = picks_resp.json()
+        picks_data = self._fetch_picks_data()
         
         # Get team general info
-        team_resp = requests.get(f'https://fantasy.premierleague.com/api/entry/{self.team_id}/')
-        team_info = team_resp.json() if team_resp.status_code == 200 else {}
+        try:
+            team_info = get_client().get_json(f'entry/{self.team_id}/')
+        except requests.HTTPError:
+            team_info = {}
         
         # Get bootstrap data for current prices
-        bootstrap = requests.get('https://fantasy.premierleague.com/api/bootstrap-static/').json()
+        bootstrap = get_client().get_json('bootstrap-static/')
         players = {p['id']: p for p in bootstrap['elements']}
         teams = {t['id']: t for t in bootstrap['teams']}
         
@@ -344,15 +406,10 @@ class Team:
         Returns:
             float: Total current team value including bank
         """
-        picks_resp = requests.get(f'https://fantasy.premierleague.com/api/entry/{self.team_id}/event/{self.current_gw}/picks/')
-        
-        if picks_resp.status_code != 200:
-            raise ValueError(f"Could not fetch team {self.team_id}")
-        
-        picks_data = picks_resp.json()
+        picks_data = self._fetch_picks_data()
         
         # Get bootstrap data for current prices
-        bootstrap = requests.get('https://fantasy.premierleague.com/api/bootstrap-static/').json()
+        bootstrap = get_client().get_json('bootstrap-static/')
         players = {p['id']: p for p in bootstrap['elements']}
         
         total_squad_value = sum(players[pick['element']]['now_cost'] / 10 for pick in picks_data['picks'])
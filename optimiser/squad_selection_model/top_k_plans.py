@@ -0,0 +1,342 @@
+# top_k_plans.py
+# Enumerate the best K distinct transfer plans by re-solving one model with no-good cuts
+
+import argparse
+import time
+import pandas as pd
+from pulp import LpStatus, LpStatusOptimal, lpSum, value
+from persistent_model import PersistentSquadModel
+from candidate_pool import prune_candidate_pool, print_pool_report
+from warm_start import set_current_squad_warm_start, find_violated_constraints
+from solver_config import solve_problem, add_solver_arguments, solver_config_from_args
+from squad_creator import process_optimization_results
+from opposing_teams import OPPOSING_FORMULATIONS
+
+from fpl_data.storage import read_player_data
+
+# Transitions that leave a player in the squad after the gameweek's transfers
+SQUAD_MEMBER_VAR_TYPES = [
+    'stay_starting', 'stay_bench', 'starting_to_bench', 'bench_to_starting',
+    'in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid'
+]
+
+NO_GOOD_CUT_PREFIX = "No_Good_Plan_"
+EXCLUDE_PLAYER_PREFIX = "Exclude_Player_"
+OBJECTIVE_FLOOR_NAME = "Top_K_Objective_Floor"
+
+# ============================================================================
+# CUTS
+# ============================================================================
+
+def squad_member_vars(vars, idx):
+    """Decision variables that keep player idx in the final squad."""
+    return [vars[var_type][idx] for var_type in SQUAD_MEMBER_VAR_TYPES if idx in vars[var_type]]
+
+def selected_squad(vars):
+    """
+    Final 15-player squad of a solved model.
+
+    The squad fixes the transfers (bought = squad minus current team, sold = current team
+    minus squad), so it identifies a transfer plan.
+
+    Returns:
+        frozenset: Player indices
+    """
+    return frozenset(
+        idx for var_type in SQUAD_MEMBER_VAR_TYPES for idx, var in vars[var_type].items()
+        if (var.value() or 0) > 0.5
+    )
+
+def add_no_good_cut(prob, vars, squad, name):
+    """
+    Exclude one final squad (and so one transfer plan) from the feasible set.
+
+    Every squad has exactly 15 players, so requiring at most 14 of these players rules
+    out this squad and nothing else. The starting XI, bench order and captain of the
+    remaining squads are still free.
+    """
+    prob += lpSum(var for idx in squad for var in squad_member_vars(vars, idx)) <= len(squad) - 1, name
+    return name
+
+def add_player_exclusions(prob, vars, df_players, player_ids):
+    """
+    Keep the given players out of the final squad (owned players are sold).
+
+    Returns:
+        list: Names of the added constraints
+    """
+    names = []
+    for idx in df_players.index[df_players['id'].isin(list(player_ids))]:
+        name = f"{EXCLUDE_PLAYER_PREFIX}{df_players.loc[idx, 'id']}"
+        prob += lpSum(squad_member_vars(vars, idx)) == 0, name
+        names.append(name)
+    return names
+
+def drop_excluded_candidates(df_players, my_team, player_ids):
+    """
+    Remove excluded players that are not owned from the pool.
+
+    Run this before prune_candidate_pool: an excluded player must not count as a
+    dominator, or the players that would replace them could be pruned. Owned excluded
+    players stay in the pool so add_player_exclusions can sell them.
+
+    Returns:
+        DataFrame: Player pool with a fresh RangeIndex
+    """
+    drop = df_players['id'].isin(list(player_ids)) & ~df_players['id'].isin(my_team.all_ids)
+    return df_players[~drop].reset_index(drop=True)
+
+def remove_constraints(prob, names):
+    """Delete constraints added for the enumeration, leaving the model as it was built."""
+    for name in names:
+        prob.constraints.pop(name, None)
+
+def snapshot_solution(prob):
+    """Variable values of the current solution, to restore later."""
+    return {var: var.varValue for var in prob.variables()}
+
+def restore_solution(prob, solution, status=LpStatusOptimal):
+    """Put back a solution taken with snapshot_solution."""
+    for var, var_value in solution.items():
+        var.varValue = var_value
+    prob.status = status
+
+# ============================================================================
+# ENUMERATION
+# ============================================================================
+
+def summarise_plan(vars, df_players, prob):
+    """
+    Describe the transfers and captain of the current solution.
+
+    Returns:
+        dict: Objective, transfers in/out (indices and names), paid transfers, captain and squad output
+    """
+    squad = process_optimization_results(vars, df_players, prob)
+    decision_results = squad['decision_results']
+
+    def selected(var_types):
+        return [idx for var_type in var_types for idx in decision_results.get(var_type, [])]
+
+    transfers_in = selected(['in_to_starting_free', 'in_to_starting_paid', 'in_to_bench_free', 'in_to_bench_paid'])
+    transfers_out = selected(['out_starting_free', 'out_starting_paid', 'out_bench_free', 'out_bench_paid'])
+
+    return {
+        'objective': value(prob.objective),
+        'transfers_in': transfers_in,
+        'transfers_out': transfers_out,
+        'transfers_in_names': ', '.join(df_players.loc[transfers_in, 'name']),
+        'transfers_out_names': ', '.join(df_players.loc[transfers_out, 'name']),
+        'paid_transfers': len(selected(['in_to_starting_paid', 'in_to_bench_paid'])),
+        'captain': df_players.loc[squad['captain_idx'], 'name'] if squad['captain_idx'] is not None else None,
+        'squad': squad,
+    }
+
+def enumerate_top_plans(prob, vars, df_players, my_team, k=5, solver_config=None, exclude_ids=(),
+                        max_gap=None, solved=False):
+    """
+    Find the K best distinct transfer plans by adding a no-good cut after each solve.
+
+    The model is built once. After each plan, a cut removing its final squad is added
+    and the same problem is re-solved. With CBC, each re-solve is warm-started from the
+    current squad (no transfers) while that plan has not been found yet. With max_gap, an
+    objective floor is added after the first plan so the solver can prune anything worse.
+    The cuts and exclusions are removed afterwards and the best plan's solution is
+    restored, so prob and vars can be used as if only the first solve had happened.
+
+    Args:
+        prob: PuLP problem from build_optimisation_problem (or PersistentSquadModel.prob)
+        vars: Dictionary of decision variables
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+        k: Number of plans to return
+        solver_config: SolverConfig instance (default: CBC without limits)
+        exclude_ids: Player IDs to keep out of every plan (owned players are sold)
+        max_gap: Stop at plans more than this many points below the best (optional)
+        solved: Whether prob already holds the optimal solution (skips the first solve
+            unless players are excluded)
+
+    Returns:
+        list: Plan dicts in rank order with rank, objective, gap, relative_gap, transfers,
+        captain, squad output and solve statistics
+    """
+    use_warm_start = solver_config is None or solver_config.solver == 'cbc'
+    added = add_player_exclusions(prob, vars, df_players, exclude_ids)
+
+    # The caller's solution is the first plan unless exclusions changed the problem
+    reuse_solution = solved and not added
+    if reuse_solution and prob.status != LpStatusOptimal:
+        return []
+
+    current_squad = frozenset(
+        df_players.index[df_players['id'].isin(my_team.all_ids)]
+    )
+
+    # Warm start values for the no-transfer plan, built once and reused for every re-solve
+    current_start = None
+    if use_warm_start:
+        saved = snapshot_solution(prob) if reuse_solution else None
+        if set_current_squad_warm_start(prob, vars, df_players, my_team):
+            current_start = snapshot_solution(prob)
+        if saved is not None:
+            restore_solution(prob, saved)
+
+    plans = []
+    best_solution = None
+    try:
+        while len(plans) < k:
+            solve_stats = None
+            warm_start = False
+            if not (reuse_solution and not plans):
+                warm_start = current_start is not None and current_squad not in [plan['final_squad'] for plan in plans]
+                if warm_start:
+                    for var, start_value in current_start.items():
+                        var.setInitialValue(start_value)
+                    warm_start = not find_violated_constraints(prob)
+                solve_stats = solve_problem(prob, solver_config, warm_start=warm_start)
+                if prob.status != LpStatusOptimal:
+                    break
+
+            plan = summarise_plan(vars, df_players, prob)
+            plan['final_squad'] = selected_squad(vars)
+            best_objective = plans[0]['objective'] if plans else plan['objective']
+            plan['rank'] = len(plans) + 1
+            plan['gap'] = best_objective - plan['objective']
+            plan['relative_gap'] = plan['gap'] / abs(best_objective) if best_objective else 0.0
+            plan['solve_seconds'] = solve_stats['wall_seconds'] if solve_stats else 0.0
+            plan['warm_start'] = warm_start
+            if max_gap is not None and plan['gap'] > max_gap + 1e-6:
+                break
+            plans.append(plan)
+
+            if best_solution is None:
+                best_solution = snapshot_solution(prob)
+                if max_gap is not None:
+                    prob += prob.objective >= plan['objective'] - max_gap - 1e-6, OBJECTIVE_FLOOR_NAME
+                    added.append(OBJECTIVE_FLOOR_NAME)
+
+            added.append(add_no_good_cut(prob, vars, plan['final_squad'], f"{NO_GOOD_CUT_PREFIX}{len(plans)}"))
+    finally:
+        remove_constraints(prob, added)
+        if best_solution is not None:
+            restore_solution(prob, best_solution)
+
+    return plans
+
+def find_top_plans(df_players, my_team, k=5, penalty_points=4, base_opposing_penalty=1, fdr_calculator=None,
+                   fdr_penalty_weight=0.5, opposing_formulation='pairwise', bench_criteria=None,
+                   solver_config=None, exclude_ids=(), max_gap=None):
+    """
+    Build a persistent model and enumerate its K best transfer plans.
+
+    Returns:
+        tuple: (list of plans from enumerate_top_plans, PersistentSquadModel)
+    """
+    model = PersistentSquadModel(
+        df_players, my_team,
+        penalty_points=penalty_points,
+        base_opposing_penalty=base_opposing_penalty,
+        fdr_calculator=fdr_calculator,
+        fdr_penalty_weight=fdr_penalty_weight,
+        opposing_formulation=opposing_formulation,
+        bench_criteria=bench_criteria
+    )
+    plans = enumerate_top_plans(
+        model.prob, model.vars, df_players, my_team,
+        k=k, solver_config=solver_config, exclude_ids=exclude_ids, max_gap=max_gap
+    )
+    model.solved = bool(plans)
+    return plans, model
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def plans_to_dataframe(plans):
+    """One row per plan with its rank, objective, gap, transfers and captain."""
+    columns = ['rank', 'objective', 'gap', 'relative_gap', 'paid_transfers', 'transfers_in_names',
+               'transfers_out_names', 'captain', 'solve_seconds', 'warm_start']
+    return pd.DataFrame([{column: plan[column] for column in columns} for plan in plans], columns=columns)
+
+def print_top_plans(plans):
+    """Print the ranked plans with their objective gaps to the best plan."""
+    print("\n" + "=" * 60)
+    print(f"TOP {len(plans)} TRANSFER PLANS")
+    print("=" * 60)
+    for plan in plans:
+        print(f"#{plan['rank']}: {plan['objective']:.2f} pts (gap {plan['gap']:.2f}, {plan['relative_gap']:.1%}), "
+              f"{len(plan['transfers_in'])} transfer(s), {plan['paid_transfers']} paid, captain {plan['captain']}")
+        if plan['transfers_in']:
+            print(f"  Out: {plan['transfers_out_names']}")
+            print(f"  In:  {plan['transfers_in_names']}")
+        else:
+            print("  No transfers")
+    solve_seconds = sum(plan['solve_seconds'] for plan in plans)
+    print(f"Solve time {solve_seconds:.2f}s over {len(plans)} plan(s)")
+    print("=" * 60)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the K best distinct transfer plans")
+    parser.add_argument('--csv', default='data/fpl_players_gw_9.csv', help="Gameweek player CSV")
+    parser.add_argument('--team-id', type=int, default=2562804, help="FPL team ID for the current squad")
+    parser.add_argument('--synthetic-players', type=int, default=None,
+                        help="Use a synthetic pool and squad instead of --csv and --team-id")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-k', '--k', type=int, default=5, help="Number of plans")
+    parser.add_argument('--exclude-ids', type=int, nargs='+', default=[], help="Player IDs to keep out of every plan")
+    parser.add_argument('--max-gap', type=float, default=None, help="Only plans within this many points of the best")
+    parser.add_argument('--penalty-points', type=float, default=4)
+    parser.add_argument('--base-opposing-penalty', type=float, default=1)
+    parser.add_argument('--fdr-penalty-weight', type=float, default=0.5)
+    parser.add_argument('--opposing-formulation', choices=OPPOSING_FORMULATIONS, default='pairwise')
+    parser.add_argument('--prune', action='store_true', help="Prune the candidate pool first")
+    parser.add_argument('--output', default='top_plans.csv', help="CSV file for the ranked plans")
+    add_solver_arguments(parser)
+    args = parser.parse_args()
+
+    from fdr import CSVFDRCalculator
+    if args.synthetic_players:
+        from synthetic_instances import generate_instance
+        df_players, my_team = generate_instance(args.synthetic_players, seed=args.seed)
+        fdr_calculator = CSVFDRCalculator(df_players=df_players)
+    else:
+        from team_class import Team
+        df_players = read_player_data(args.csv)
+        my_team = Team(team_id=args.team_id)
+        fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+    df_players = drop_excluded_candidates(df_players, my_team, args.exclude_ids)
+    if args.prune:
+        df_players, pool_report = prune_candidate_pool(df_players, my_team, fdr_calculator, args.fdr_penalty_weight,
+                                                       top_k=args.k, base_opposing_penalty=args.base_opposing_penalty)
+        print_pool_report(pool_report)
+
+    start = time.perf_counter()
+    plans, model = find_top_plans(
+        df_players, my_team,
+        k=args.k,
+        penalty_points=args.penalty_points,
+        base_opposing_penalty=args.base_opposing_penalty,
+        fdr_calculator=fdr_calculator,
+        fdr_penalty_weight=args.fdr_penalty_weight,
+        opposing_formulation=args.opposing_formulation,
+        solver_config=solver_config_from_args(args),
+        exclude_ids=args.exclude_ids,
+        max_gap=args.max_gap
+    )
+    total_seconds = time.perf_counter() - start
+
+    if not plans:
+        print(f"No feasible plan found (status: {LpStatus[model.prob.status]})")
+        return
+    print_top_plans(plans)
+    print(f"Built once in {model.build_seconds:.2f}s, {total_seconds:.2f}s in total")
+    plans_to_dataframe(plans).to_csv(args.output, index=False)
+    print(f"Plans written to {args.output}")
+
+if __name__ == "__main__":
+    main()
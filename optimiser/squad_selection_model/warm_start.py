@@ -0,0 +1,153 @@
+# warm_start.py
+# Seed the solver with the current squad (zero transfers) as an incumbent solution
+
+from opposing_teams import (
+    PAIR_BOTH_CONSTRAINT, FIXTURE_COUNT_LINK_CONSTRAINT, FIXTURE_UNIT_SUM_CONSTRAINT, FIXTURE_PENALTY_LINK_CONSTRAINT
+)
+
+def get_current_squad_start(df_players, vars, my_team):
+    """
+    Build the decision variable values for keeping the current squad unchanged.
+
+    Starters stay in the XI, bench players stay on the bench and the starter with the
+    highest expected points is captain. Every other decision variable is zero.
+
+    Args:
+        df_players: DataFrame with player data
+        vars: Dictionary of decision variables
+        my_team: Team instance with the current squad
+
+    Returns:
+        dict: Mapping of LpVariable to its starting value
+    """
+    start_values = {var: 0 for var_dict in vars.values() for var in var_dict.values()}
+
+    for idx in df_players.index[df_players['id'].isin(my_team.starting_ids)]:
+        if idx in vars['stay_starting']:
+            start_values[vars['stay_starting'][idx]] = 1
+
+    for idx in df_players.index[df_players['id'].isin(my_team.bench_ids)]:
+        if idx in vars['stay_bench']:
+            start_values[vars['stay_bench'][idx]] = 1
+
+    captain_candidates = [idx for idx in vars['captain'] if start_values.get(vars['stay_starting'].get(idx)) == 1]
+    if captain_candidates:
+        captain_idx = max(captain_candidates, key=lambda idx: df_players.loc[idx, 'expected_points'])
+        start_values[vars['captain'][captain_idx]] = 1
+
+    return start_values
+
+def find_violated_constraints(prob):
+    """
+    Find constraints broken by the current initial values.
+
+    Constraints involving variables without an initial value (penalty and counter
+    variables) are skipped; the solver completes those itself.
+
+    Returns:
+        list: Names of violated constraints
+    """
+    violated = []
+    for name, constraint in prob.constraints.items():
+        if constraint.value() is not None and not constraint.valid(eps=1e-6):
+            violated.append(name)
+    return violated
+
+def _solve_for(constraint, var, values):
+    """Value of var that makes constraint tight, given values for its other variables."""
+    rest = constraint.constant + sum(coef * values[other] for other, coef in constraint.items() if other is not var)
+    return -rest / constraint[var]
+
+def get_auxiliary_start_values(prob, start_values):
+    """
+    Values of the opposing teams penalty variables implied by a starting solution.
+
+    These follow from the decision variables with no solve: a pair indicator is 1 when
+    both players start, a fixture counter counts its starters, the first `count` unary
+    binaries of a counter are 1 and each fixture penalty sits at its lower bound (the
+    objective pushes it down).
+
+    Args:
+        prob: PuLP problem
+        start_values: Mapping of decision LpVariable to its starting value
+
+    Returns:
+        dict: Mapping of every other problem variable to its value, or None if a variable
+              is not one of the known penalty variables
+    """
+    values = dict(start_values)
+    constraints = prob.constraints
+
+    def lower_bound(name):
+        constraint = constraints[name]
+        var = next(var for var in constraint if var not in values)
+        values[var] = max(var.lowBound or 0, _solve_for(constraint, var, values))
+
+    for name in constraints:
+        if name.startswith(PAIR_BOTH_CONSTRAINT):
+            lower_bound(name)
+
+    for name in constraints:
+        if name.startswith(FIXTURE_COUNT_LINK_CONSTRAINT):
+            constraint = constraints[name]
+            counter = next(var for var in constraint if var not in values)
+            values[counter] = round(_solve_for(constraint, counter, values))
+
+    for name in constraints:
+        if name.startswith(FIXTURE_UNIT_SUM_CONSTRAINT):
+            constraint = constraints[name]
+            counter = next(var for var in constraint if var in values)
+            units = sorted((var for var in constraint if var is not counter),
+                           key=lambda var: int(var.name.rsplit('_', 1)[1]))
+            for k, unit in enumerate(units):
+                values[unit] = 1 if k < values[counter] else 0
+
+    for name in constraints:
+        if name.startswith(FIXTURE_PENALTY_LINK_CONSTRAINT):
+            lower_bound(name)
+
+    if any(var not in values for var in prob.variables()):
+        return None
+    return {var: value for var, value in values.items() if var not in start_values}
+
+def set_current_squad_warm_start(prob, vars, df_players, my_team):
+    """
+    Set the current squad as the initial solution for a warm-started solve.
+
+    If the current squad breaks a constraint (e.g. the 3-per-club rule after a player
+    moved club, or an owned player missing from df_players) the initial values are
+    cleared again and the solve starts cold.
+
+    Args:
+        prob: PuLP problem
+        vars: Dictionary of decision variables
+        df_players: DataFrame with player data
+        my_team: Team instance with the current squad
+
+    Returns:
+        bool: True if the warm start was set, False if falling back to a cold start
+    """
+    start_values = get_current_squad_start(df_players, vars, my_team)
+    for var, start_value in start_values.items():
+        var.varValue = start_value
+
+    auxiliary = get_auxiliary_start_values(prob, start_values)
+    if auxiliary is not None:
+        for var, start_value in auxiliary.items():
+            var.varValue = start_value
+    violated = find_violated_constraints(prob)
+
+    if violated or auxiliary is None:
+        if violated:
+            print(f"Warning: Current squad breaks {len(violated)} constraint(s) "
+                  f"(e.g. {', '.join(violated[:3])}), solving without warm start")
+        else:
+            print("Warning: Current squad could not be completed to a full solution, solving without warm start")
+        for var in prob.variables():
+            var.varValue = None
+        return False
+
+    for var in prob.variables():
+        var.setInitialValue(var.varValue)
+
+    return True
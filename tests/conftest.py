@@ -0,0 +1,57 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    """Serve server.routes: API path to a JSON payload, or to a function of the request headers."""
+
+    def do_GET(self):
+        path = self.path.lstrip('/')
+        with self.server.lock:
+            self.server.requests.append((path, dict(self.headers)))
+
+        route = self.server.routes.get(path)
+        if route is None:
+            status, payload, headers = 404, {'detail': 'Not found.'}, {}
+        elif callable(route):
+            status, payload, headers = route(self.headers)
+        else:
+            status, payload, headers = 200, route, {}
+
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fpl_server():
+    """
+    Local stand-in for the FPL API.
+
+    Set routes on the returned server; every request is recorded in server.requests as
+    (path, headers) and server.request_count(path) counts them. server.base_url is the
+    API root to pass to the client.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAPIHandler)
+    server.routes = {}
+    server.requests = []
+    server.lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    server.request_count = lambda path: sum(1 for requested, _ in list(server.requests) if requested == path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
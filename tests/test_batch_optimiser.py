@@ -0,0 +1,53 @@
+import json
+
+import pandas as pd
+import pytest
+
+from batch_optimiser import SharedPlayerData, attach_player_data, build_sources, run_batch
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from synthetic_instances import generate_current_squad, generate_player_pool
+
+
+@pytest.fixture(scope='module')
+def df_players():
+    return generate_player_pool(200, seed=15)
+
+
+def write_squad(path, my_team):
+    path.write_text(json.dumps({'team_id': 1, 'starting_ids': sorted(my_team.starting_ids),
+                                'bench_ids': sorted(my_team.bench_ids), 'budget': my_team.budget,
+                                'free_transfers': my_team.free_transfers}))
+    return str(path)
+
+
+def test_workers_see_the_player_data_without_copies(df_players):
+    with SharedPlayerData(df_players) as shared:
+        attached, blocks = attach_player_data(shared.spec)
+
+        pd.testing.assert_frame_equal(attached, df_players, check_dtype=False)
+        assert not attached['expected_points'].to_numpy().flags.writeable
+        del attached
+        for block in blocks:
+            block.close()
+
+
+def test_batch_matches_single_solves_and_resumes(df_players, tmp_path):
+    teams = [generate_current_squad(df_players, seed=seed) for seed in (1, 2)]
+    squad_files = [write_squad(tmp_path / f"squad{k}.json", team) for k, team in enumerate(teams)]
+    (tmp_path / 'broken.txt').write_text('1\n2\n')
+    sources = build_sources(squad_files=squad_files + [str(tmp_path / 'broken.txt')])
+    output = tmp_path / 'results.jsonl'
+
+    results = run_batch(df_players, sources, str(output), workers=2)
+
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+    for path, team in zip(squad_files, teams):
+        prob, _ = build_optimisation_problem(df_players, team, fdr_calculator=fdr_calculator)
+        assert results[f"file:{path}"]['objective'] == pytest.approx(solve_problem(prob)['objective'])
+    assert results[f"file:{tmp_path / 'broken.txt'}"]['status'] == 'Error'
+
+    run_batch(df_players, sources, str(output), workers=2)
+    retried = [json.loads(line)['source'] for line in output.read_text().splitlines()[len(sources):]]
+    assert retried == [f"file:{tmp_path / 'broken.txt'}"]
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from constraints.bench_selection_constraints import (BENCH_ELIGIBILITY_VAR_TYPES, add_bench_selection_constraints,
+                                                     get_bench_eligibility_mask)
+from decision_variables import create_decision_variables
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from squad_creator import process_optimization_results
+from synthetic_instances import generate_instance
+
+
+BENCH_CRITERIA = {'min_minutes': 0, 'min_price': 4.0, 'max_price': 5.5, 'min_ownership': 0}
+
+
+def test_mask_applies_every_criterion():
+    df_players = pd.DataFrame({
+        'price': [4.5, 7.0, 4.5, 4.5, 4.5],
+        'minutes': [90, 90, 10, 90, 90],
+        'expected_points': [2.0, 2.0, 2.0, 2.0, 0.5],
+        'status': ['a', 'a', 'a', 'i', 'a'],
+    })
+    assert get_bench_eligibility_mask(df_players).tolist() == [True, False, False, False, False]
+
+
+def test_ineligible_players_lose_their_bench_variables():
+    df_players, my_team = generate_instance(300, seed=12)
+    vars = create_decision_variables(df_players, my_team)
+    eligible = get_bench_eligibility_mask(df_players, **BENCH_CRITERIA)
+
+    add_bench_selection_constraints(None, vars, df_players, **BENCH_CRITERIA)
+
+    for var_type in BENCH_ELIGIBILITY_VAR_TYPES:
+        assert all(eligible[idx] for idx in vars[var_type])
+
+
+def test_solved_bench_meets_the_criteria():
+    df_players, my_team = generate_instance(300, seed=12)
+    prob, vars = build_optimisation_problem(df_players, my_team, bench_criteria=BENCH_CRITERIA)
+    assert solve_problem(prob)['proven_optimal']
+
+    bench = process_optimization_results(vars, df_players, prob)['bench_df']
+    eligible = get_bench_eligibility_mask(df_players, **BENCH_CRITERIA)
+    moved_to_bench = bench['id'].isin(my_team.starting_ids)
+    assert eligible[df_players['id'].isin(bench['id'][~moved_to_bench])].all()
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from fpl_data.cache import DiskCache
+from fpl_data.client import FPLClient
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+BOOTSTRAP = {'elements': [{'id': 1}], 'teams': [{'id': 1, 'name': 'Arsenal'}]}
+
+# Run in a separate process: fetch bootstrap-static/ through a DiskCache and print the client stats
+FETCH_SCRIPT = """
+import json, sys
+from fpl_data.cache import DiskCache
+from fpl_data.client import FPLClient
+client = FPLClient(sys.argv[1], store=DiskCache(sys.argv[2]))
+client.get_json('bootstrap-static/')
+print(json.dumps(client.stats))
+"""
+
+
+@pytest.fixture
+def api(fpl_server):
+    def slow_bootstrap(headers):
+        time.sleep(1.0)  # long enough for the concurrent processes to overlap
+        return 200, BOOTSTRAP, {'ETag': '"v1"'}
+
+    fpl_server.routes['bootstrap-static/'] = slow_bootstrap
+    return fpl_server
+
+
+def fetch_in_process(base_url, cache_dir):
+    return subprocess.Popen([sys.executable, '-c', FETCH_SCRIPT, base_url, str(cache_dir)],
+                            cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+
+
+def test_fresh_entry_is_served_without_a_request(api, tmp_path):
+    client = FPLClient(api.base_url, store=DiskCache(tmp_path))
+
+    assert client.get_json('bootstrap-static/') == BOOTSTRAP
+    assert client.get_json('bootstrap-static/') == BOOTSTRAP
+    assert api.request_count('bootstrap-static/') == 1
+    assert client.stats['cache_hits'] == 1
+
+
+def test_expired_entry_is_revalidated(api, tmp_path):
+    api.routes['bootstrap-static/'] = lambda headers: (
+        (304, None, {}) if headers.get('If-None-Match') == '"v1"' else (200, BOOTSTRAP, {'ETag': '"v1"'})
+    )
+    cache = DiskCache(tmp_path)
+    client = FPLClient(api.base_url, store=cache)
+    client.get_json('bootstrap-static/')
+
+    url = client.url('bootstrap-static/')
+    cache.set(url, dict(cache.get(url), fetched_at=time.time() - cache.ttl(url) - 1))
+
+    assert client.get_json('bootstrap-static/') == BOOTSTRAP
+    assert api.request_count('bootstrap-static/') == 2
+    assert client.stats['not_modified'] == 1
+    assert time.time() - cache.get(url)['fetched_at'] < 60
+
+
+def test_failed_write_keeps_the_previous_entry(tmp_path):
+    cache = DiskCache(tmp_path)
+    url = 'http://api/bootstrap-static/'
+    cache.set(url, {'etag': None, 'last_modified': None, 'fetched_at': time.time(), 'content': b'old'})
+
+    with pytest.raises(Exception):
+        cache.set(url, {'etag': None, 'last_modified': None, 'fetched_at': time.time(), 'content': lambda: None})
+
+    assert DiskCache(tmp_path).get(url)['content'] == b'old'
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_second_process_reads_the_cache(api, tmp_path):
+    first = fetch_in_process(api.base_url, tmp_path)
+    assert json.loads(first.communicate()[0])['requests'] == 1
+
+    second = fetch_in_process(api.base_url, tmp_path)
+    stats = json.loads(second.communicate()[0])
+
+    assert stats['requests'] == 0 and stats['cache_hits'] == 1
+    assert api.request_count('bootstrap-static/') == 1
+
+
+def test_concurrent_processes_download_once(api, tmp_path):
+    processes = [fetch_in_process(api.base_url, tmp_path) for _ in range(4)]
+    stats = [json.loads(process.communicate()[0]) for process in processes]
+
+    assert api.request_count('bootstrap-static/') == 1
+    assert sorted(stat['requests'] for stat in stats) == [0, 0, 0, 1]
@@ -0,0 +1,41 @@
+import pytest
+from pulp import value
+
+from candidate_pool import prune_candidate_pool
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from synthetic_instances import generate_instance
+
+
+BENCH_CRITERIA = dict(min_minutes=0, min_price=0, max_price=5.0, min_expected_points=0, max_expected_points=100,
+                      min_ownership=0, max_ownership=100, allow_injured=False, min_form=0)
+
+
+def solve_objective(df_players, my_team, fdr_calculator, base_opposing_penalty, bench_criteria):
+    prob, _ = build_optimisation_problem(df_players, my_team, base_opposing_penalty=base_opposing_penalty,
+                                         fdr_calculator=fdr_calculator, opposing_formulation='fixture',
+                                         bench_criteria=bench_criteria)
+    stats = solve_problem(prob)
+    assert stats['proven_optimal']
+    return value(prob.objective)
+
+
+@pytest.mark.parametrize('base_opposing_penalty, bench_criteria', [(0, None), (0, BENCH_CRITERIA), (1, None)])
+def test_dominance_pruning_keeps_the_optimal_objective(base_opposing_penalty, bench_criteria):
+    df_players, my_team = generate_instance(600, seed=1)
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+    pruned, report = prune_candidate_pool(df_players, my_team, fdr_calculator, drop_zero_minutes=False,
+                                          base_opposing_penalty=base_opposing_penalty, bench_criteria=bench_criteria)
+
+    if base_opposing_penalty == 0:
+        assert report['removed_dominated'] > 0
+    assert solve_objective(pruned, my_team, fdr_calculator, base_opposing_penalty, bench_criteria) == pytest.approx(
+        solve_objective(df_players, my_team, fdr_calculator, base_opposing_penalty, bench_criteria))
+
+
+def test_current_squad_is_never_pruned():
+    df_players, my_team = generate_instance(600, seed=1)
+    pruned, _ = prune_candidate_pool(df_players, my_team, base_opposing_penalty=0)
+    assert set(my_team.all_ids) <= set(pruned['id'])
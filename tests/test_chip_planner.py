@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from chip_planner import build_candidate_solves, choose_chip_plan, compute_chip_values
+
+
+def test_wildcard_window_is_full_at_the_end_of_the_horizon():
+    tasks = build_candidate_solves([10, 11, 12], chips=('wildcard',), wildcard_lookahead=4)
+    windows = {task['gameweek']: task['gameweeks'] for task in tasks if task['chip'] == 'wildcard'}
+
+    assert windows == {10: [10, 11, 12, 13], 11: [11, 12, 13, 14], 12: [12, 13, 14, 15]}
+
+
+def test_every_chip_has_a_baseline_over_the_same_gameweeks():
+    tasks = build_candidate_solves([1, 2], wildcard_lookahead=3)
+    baselines = {(task['gameweek'], tuple(task['gameweeks'])) for task in tasks if task['chip'] is None}
+
+    assert all((task['gameweek'], tuple(task['gameweeks'])) in baselines for task in tasks if task['chip'])
+
+
+def test_chip_values_are_gains_over_the_matching_baseline():
+    results = [
+        {'gameweek': 1, 'chip': None, 'gameweeks': [1], 'objective': 50.0},
+        {'gameweek': 1, 'chip': None, 'gameweeks': [1, 2], 'objective': 100.0},
+        {'gameweek': 1, 'chip': 'bench_boost', 'gameweeks': [1], 'objective': 58.0},
+        {'gameweek': 1, 'chip': 'wildcard', 'gameweeks': [1, 2], 'objective': 112.0},
+    ]
+    values = compute_chip_values(results, [1], chips=('wildcard', 'bench_boost'))
+
+    assert values.loc[1, 'bench_boost'] == pytest.approx(8.0)
+    assert values.loc[1, 'wildcard'] == pytest.approx(12.0)
+
+
+def test_plan_uses_each_gameweek_once_and_holds_back_small_gains():
+    values = pd.DataFrame({'wildcard': [10.0, 8.0], 'bench_boost': [9.0, 1.0]}, index=pd.Index([1, 2], name='gameweek'))
+
+    assert choose_chip_plan(values) == {'wildcard': 2, 'bench_boost': 1}
+    assert choose_chip_plan(values, min_gain=8.5) == {'wildcard': 1, 'bench_boost': None}
@@ -0,0 +1,64 @@
+import pytest
+import requests
+
+from fpl_data.client import FPLClient, get_client
+
+
+LIVE = {'elements': [{'id': 1, 'stats': {'total_points': 6}}]}
+
+
+def flaky(payload, failures, status=503):
+    """Route that fails `failures` times with `status`, then serves payload."""
+    calls = []
+
+    def route(headers):
+        calls.append(1)
+        if len(calls) <= failures:
+            return status, {'detail': 'Unavailable'}, {}
+        return 200, payload, {}
+    return route
+
+
+def test_unchanged_resource_is_revalidated_with_304(fpl_server):
+    fpl_server.routes['event/1/live/'] = lambda headers: (
+        (304, None, {}) if headers.get('If-None-Match') == '"abc"' else (200, LIVE, {'ETag': '"abc"'})
+    )
+    client = FPLClient(fpl_server.base_url)
+
+    first = client.get_json('event/1/live/')
+    second = client.get_json('event/1/live/')
+
+    assert first == second == LIVE
+    assert second is first
+    assert client.stats['requests'] == 2 and client.stats['not_modified'] == 1
+    assert fpl_server.requests[1][1].get('If-None-Match') == '"abc"'
+
+
+def test_server_errors_are_retried(fpl_server):
+    fpl_server.routes['event/1/live/'] = flaky(LIVE, failures=2)
+    client = FPLClient(fpl_server.base_url, backoff_factor=0)
+
+    assert client.get_json('event/1/live/') == LIVE
+    assert fpl_server.request_count('event/1/live/') == 3
+
+
+def test_exhausted_retries_raise(fpl_server):
+    fpl_server.routes['event/1/live/'] = flaky(LIVE, failures=10, status=500)
+    client = FPLClient(fpl_server.base_url, max_retries=2, backoff_factor=0)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_json('event/1/live/')
+    assert fpl_server.request_count('event/1/live/') == 3
+
+
+def test_not_found_is_not_retried(fpl_server):
+    client = FPLClient(fpl_server.base_url, backoff_factor=0)
+
+    with pytest.raises(requests.HTTPError) as error:
+        client.get_json('event/39/live/')
+    assert error.value.response.status_code == 404
+    assert fpl_server.request_count('event/39/live/') == 1
+
+
+def test_get_client_is_shared_per_base_url(fpl_server):
+    assert get_client(fpl_server.base_url, cache_dir=None) is get_client(fpl_server.base_url.rstrip('/'), cache_dir=None)
@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks import squad_signature
+from compact_formulation import build_compact_problem, process_compact_results
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from squad_creator import process_optimization_results
+from synthetic_instances import generate_instance
+
+
+@pytest.mark.parametrize('opposing_formulation', ['pairwise', 'fixture'])
+def test_compact_model_matches_the_full_model(opposing_formulation):
+    df_players, my_team = generate_instance(300, seed=3)
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+    prob, vars = build_optimisation_problem(df_players, my_team, fdr_calculator=fdr_calculator,
+                                            opposing_formulation=opposing_formulation)
+    full_stats = solve_problem(prob)
+    full = squad_signature(process_optimization_results(vars, df_players, prob))
+
+    compact_prob, compact_vars = build_compact_problem(df_players, my_team, fdr_calculator=fdr_calculator,
+                                                       opposing_formulation=opposing_formulation)
+    compact_stats = solve_problem(compact_prob)
+    compact = squad_signature(process_compact_results(compact_vars, df_players, my_team, compact_prob))
+
+    assert compact_stats['objective'] == pytest.approx(full_stats['objective'])
+    assert compact_prob.numVariables() < prob.numVariables()
+    # Bench players add nothing to the objective, so only the XI and captain must match
+    assert (compact['starting'], compact['captain']) == (full['starting'], full['captain'])
@@ -0,0 +1,101 @@
+import csv
+
+import pytest
+
+import create_single_csv as history
+from fpl_data import client
+
+
+PLAYER_IDS = list(range(1, 11))
+GAMEWEEKS = 3
+
+
+def history_entry(player_id, gameweek):
+    return {
+        'round': gameweek, 'kickoff_time': f"2025-08-{gameweek + 10}T14:00:00Z", 'opponent_team': 2,
+        'was_home': gameweek % 2 == 0, 'total_points': player_id + gameweek, 'minutes': 90, 'goals_scored': 0,
+        'assists': 0, 'clean_sheets': 1, 'goals_conceded': 0, 'own_goals': 0, 'penalties_saved': 0,
+        'penalties_missed': 0, 'yellow_cards': 0, 'red_cards': 0, 'saves': 0, 'bonus': 0, 'bps': 20,
+        'influence': '10.0', 'creativity': '5.0', 'threat': '8.0', 'ict_index': '2.3', 'value': 55,
+        'transfers_balance': 0, 'selected': 1000, 'transfers_in': 0, 'transfers_out': 0,
+        'expected_goals': '0.10', 'expected_assists': '0.05', 'expected_goal_involvements': '0.15',
+        'expected_goals_conceded': '0.90',
+    }
+
+
+BOOTSTRAP = {
+    'elements': [{'id': player_id, 'web_name': f"Player{player_id}", 'first_name': 'First',
+                  'second_name': f"Last{player_id}", 'team': 1, 'element_type': 1 + player_id % 4}
+                 for player_id in PLAYER_IDS],
+    'teams': [{'id': 1, 'name': 'Arsenal'}, {'id': 2, 'name': 'Chelsea'}],
+}
+
+
+@pytest.fixture
+def base_url(fpl_server, monkeypatch):
+    fpl_server.routes['bootstrap-static/'] = BOOTSTRAP
+    for player_id in PLAYER_IDS:
+        fpl_server.routes[f'element-summary/{player_id}/'] = {
+            'history': [history_entry(player_id, gameweek) for gameweek in range(1, GAMEWEEKS + 1)]
+        }
+    # In-memory client so the tests never read or write the shared disk cache
+    monkeypatch.setattr(history, 'get_client', lambda url: client.get_client(url, cache_dir=None))
+    return fpl_server.base_url
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_interrupted_run_resumes_without_duplicate_or_partial_rows(base_url, tmp_path, monkeypatch):
+    output = tmp_path / 'gameweek_data.csv'
+    fetch_player_rows = history.fetch_player_rows
+
+    def interrupted(player_id, *args):
+        if player_id == 6:
+            raise KeyboardInterrupt
+        return fetch_player_rows(player_id, *args)
+
+    monkeypatch.setattr(history, 'fetch_player_rows', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        history.build_season_history(output, workers=1, rate=0, base_url=base_url)
+    monkeypatch.setattr(history, 'fetch_player_rows', fetch_player_rows)
+
+    completed = history.read_checkpoint(history.checkpoint_path_for(output))
+    assert completed == {1, 2, 3, 4, 5}
+
+    # Rows for player 6 written before the crash, ending in a torn line
+    with open(output, 'a', newline='') as f:
+        row = history.build_history_rows(6, BOOTSTRAP['elements'][5], {1: 'Arsenal', 2: 'Chelsea'},
+                                         [history_entry(6, 1)])[0]
+        csv.DictWriter(f, fieldnames=history.COLUMNS).writerow(row)
+        f.write('6,Player6,First Last6,Ars')
+
+    summary = history.build_season_history(output, workers=4, rate=0, base_url=base_url)
+
+    rows = read_rows(output)
+    assert rows[0] == history.COLUMNS
+    keys = [(int(row[0]), int(row[5])) for row in rows[1:]]
+    assert all(len(row) == len(history.COLUMNS) for row in rows)
+    assert sorted(keys) == [(player_id, gameweek) for player_id in PLAYER_IDS for gameweek in range(1, GAMEWEEKS + 1)]
+    assert summary['skipped'] == 5 and summary['fetched'] == 5
+    assert history.read_checkpoint(history.checkpoint_path_for(output)) == set(PLAYER_IDS)
+
+
+def test_trim_to_checkpoint_drops_unfinished_players(tmp_path):
+    output = tmp_path / 'gameweek_data.csv'
+    teams = {1: 'Arsenal', 2: 'Chelsea'}
+    with open(output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=history.COLUMNS)
+        writer.writeheader()
+        for player_id in (1, 2, 3):
+            writer.writerows(history.build_history_rows(player_id, BOOTSTRAP['elements'][player_id - 1], teams,
+                                                        [history_entry(player_id, 1), history_entry(player_id, 2)]))
+        f.write('3,Player3,First')
+
+    kept = history.trim_to_checkpoint(output, {1, 3})
+
+    rows = read_rows(output)
+    assert kept == 4
+    assert [int(row[0]) for row in rows[1:]] == [1, 1, 3, 3]
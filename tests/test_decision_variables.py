@@ -0,0 +1,43 @@
+import pytest
+
+import model_builder
+from decision_variables import (BENCH_PLAYER_VAR_TYPES, NEW_PLAYER_VAR_TYPES, STARTER_VAR_TYPES, VAR_TYPES,
+                                create_decision_variables)
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from synthetic_instances import generate_instance
+
+
+@pytest.fixture(scope='module')
+def instance():
+    return generate_instance(300, seed=11)
+
+
+def player_var_types(vars, idx):
+    return sorted(var_type for var_type in VAR_TYPES if idx in vars[var_type])
+
+
+def test_each_player_only_gets_the_transitions_it_can_make(instance):
+    df_players, my_team = instance
+    vars = create_decision_variables(df_players, my_team)
+    index_of = dict(zip(df_players['id'], df_players.index))
+    unavailable = df_players.index[(df_players['status'] != 'a') & ~df_players['id'].isin(my_team.all_ids)]
+
+    assert player_var_types(vars, index_of[next(iter(my_team.starting_ids))]) == sorted(STARTER_VAR_TYPES)
+    assert player_var_types(vars, index_of[next(iter(my_team.bench_ids))]) == sorted(BENCH_PLAYER_VAR_TYPES)
+    assert all(not player_var_types(vars, idx) for idx in unavailable)
+    new = df_players.index[(df_players['status'] == 'a') & ~df_players['id'].isin(my_team.all_ids)][0]
+    assert player_var_types(vars, new) == sorted(NEW_PLAYER_VAR_TYPES)
+
+
+def test_sparse_variables_keep_the_dense_objective(instance, monkeypatch):
+    df_players, my_team = instance
+    prob, _ = build_optimisation_problem(df_players, my_team)
+    sparse_stats = solve_problem(prob)
+
+    monkeypatch.setattr(model_builder, 'create_decision_variables', lambda df, team: create_decision_variables(df))
+    dense_prob, _ = build_optimisation_problem(df_players, my_team)
+    dense_stats = solve_problem(dense_prob)
+
+    assert dense_prob.numVariables() > prob.numVariables()
+    assert sparse_stats['objective'] == pytest.approx(dense_stats['objective'])
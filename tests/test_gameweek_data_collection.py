@@ -0,0 +1,97 @@
+import pyarrow.parquet as pq
+import pytest
+
+import gameweek_data_collection as collection
+from fpl_data import client
+from fpl_data.storage import write_gameweek
+
+
+TEAMS = [{'id': 1, 'name': 'Arsenal'}, {'id': 2, 'name': 'Chelsea'}]
+
+
+def make_player(player_id, team, element_type):
+    """Bootstrap element with every field process_gameweek_data reads."""
+    return {
+        'id': player_id, 'web_name': f"Player{player_id}", 'first_name': 'First', 'second_name': f"Last{player_id}",
+        'team': team, 'element_type': element_type, 'now_cost': 55, 'selected_by_percent': '12.3',
+        'total_points': 40, 'points_per_game': '4.0', 'form': '3.5', 'ep_next': '4.1', 'ep_this': '3.9',
+        'status': 'a', 'chance_of_playing_next_round': None, 'chance_of_playing_this_round': None, 'news': '',
+        'news_added': None, 'minutes': 900, 'goals_scored': 2, 'assists': 1, 'clean_sheets': 3,
+        'goals_conceded': 8, 'own_goals': 0, 'penalties_saved': 0, 'penalties_missed': 0, 'yellow_cards': 1,
+        'red_cards': 0, 'saves': 0, 'bonus': 4, 'bps': 200, 'influence': '150.2', 'creativity': '80.1',
+        'threat': '120.0', 'ict_index': '35.0', 'starts': 10, 'expected_goals': '2.10',
+        'expected_assists': '1.05', 'expected_goal_involvements': '3.15', 'expected_goals_conceded': '7.80',
+    }
+
+
+BOOTSTRAP = {
+    'elements': [make_player(player_id, 1 + player_id % 2, 1 + player_id % 4) for player_id in range(1, 7)],
+    'teams': TEAMS,
+    'events': [{'id': gameweek} for gameweek in range(1, 39)],
+}
+
+
+def live_payload(gameweek):
+    stats = {'minutes': 90, 'goals_scored': gameweek % 2, 'assists': 0, 'clean_sheets': 1, 'goals_conceded': 0,
+             'own_goals': 0, 'penalties_saved': 0, 'penalties_missed': 0, 'yellow_cards': 0, 'red_cards': 0,
+             'saves': 0, 'bonus': 0, 'bps': 20, 'influence': '10.0', 'creativity': '5.0', 'threat': '8.0',
+             'ict_index': '2.3', 'total_points': gameweek}
+    return {'elements': [{'id': player['id'], 'stats': stats} for player in BOOTSTRAP['elements']]}
+
+
+@pytest.fixture
+def api(fpl_server):
+    """Fake API serving bootstrap-static/ and event/N/live/ (404 after 38); api.failing gameweeks return 403."""
+
+    def live_route(gameweek):
+        def route(headers):
+            if gameweek in fpl_server.failing:
+                return 403, {'detail': 'Forbidden'}, {}
+            return 200, live_payload(gameweek), {}
+        return route
+
+    fpl_server.failing = set()
+    fpl_server.routes['bootstrap-static/'] = BOOTSTRAP
+    for gameweek in range(1, 39):
+        fpl_server.routes[f'event/{gameweek}/live/'] = live_route(gameweek)
+    return fpl_server
+
+
+@pytest.fixture
+def base_url(api, monkeypatch):
+    # In-memory client so the tests never read or write the shared disk cache
+    monkeypatch.setattr(collection, 'get_client', lambda url: client.get_client(url, cache_dir=None))
+    return api.base_url
+
+
+def test_collect_gameweeks_writes_every_partition(base_url, tmp_path):
+    bootstrap = collection.fetch_bootstrap_data(base_url)
+    results = collection.collect_gameweeks(bootstrap, range(1, 39), tmp_path, base_url=base_url)
+
+    assert [result['gameweek'] for result in results] == list(range(1, 39))
+    assert all(result['status'] == "Complete" for result in results)
+    for gameweek in range(1, 39):
+        table = pq.read_table(tmp_path / 'gameweeks' / f"gameweek={gameweek}" / 'part-0.parquet')
+        assert table.num_rows == len(BOOTSTRAP['elements'])
+        assert set(table.column('gw_total_points').to_pylist()) == {gameweek}
+
+
+def test_unstarted_gameweek_is_future(base_url, tmp_path):
+    result = collection.collect_gameweek(BOOTSTRAP, 39, tmp_path, base_url=base_url)
+
+    assert result['status'] == "Future"
+    table = pq.read_table(tmp_path / 'gameweeks' / 'gameweek=39' / 'part-0.parquet')
+    assert table.column('gw_total_points').null_count == table.num_rows
+
+
+def test_failed_fetch_keeps_existing_partition(api, base_url, tmp_path):
+    existing = collection.process_gameweek_data(BOOTSTRAP, live_payload(5), 5)
+    path = write_gameweek(existing, 5, tmp_path / 'gameweeks')
+    before = path.read_bytes()
+
+    api.failing.add(5)
+    result = collection.collect_gameweek(BOOTSTRAP, 5, tmp_path, base_url=base_url)
+
+    assert result['status'] == "Error"
+    assert '403' in result['error']
+    assert path.read_bytes() == before
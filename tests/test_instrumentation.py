@@ -0,0 +1,59 @@
+import json
+import tracemalloc
+
+import pytest
+from pulp import LpMaximize, LpProblem, LpVariable
+
+from instrumentation import RunProfiler, profile_span
+
+
+def test_nested_spans_are_named_and_ordered():
+    profiler = RunProfiler('test')
+    with profiler.span('build'):
+        with profiler.span('variables'):
+            pass
+    with profiler.span('solve'):
+        pass
+
+    spans = profiler.report()['spans']
+    assert [(span['name'], span['depth']) for span in spans] == [('build', 0), ('build.variables', 1), ('solve', 0)]
+    assert spans[0]['seconds'] >= spans[1]['seconds']
+
+
+def test_span_counts_what_it_adds_to_the_problem():
+    profiler = RunProfiler()
+    prob = LpProblem('test', LpMaximize)
+    x = LpVariable('x', 0, 1)
+    prob += x <= 1, 'upper'
+    with profiler.span('constraints', prob):
+        y = LpVariable('y', 0, 1)
+        prob += x + y <= 1, 'pair'
+
+    span = profiler.report()['spans'][0]
+    assert (span['variables_added'], span['constraints_added']) == (1, 1)
+
+
+def test_span_is_recorded_when_the_block_raises():
+    profiler = RunProfiler()
+    with pytest.raises(RuntimeError):
+        with profiler.span('solve'):
+            raise RuntimeError
+    assert [span['name'] for span in profiler.spans] == ['solve']
+
+
+def test_memory_is_tracked_on_request(tmp_path):
+    profiler = RunProfiler(track_memory=True)
+    try:
+        with profiler.span('allocate'):
+            data = [0] * 1_000_000
+        del data
+    finally:
+        tracemalloc.stop()
+
+    report = json.loads(profiler.write_json(tmp_path / 'profile.json').read_text())
+    assert report['spans'][0]['peak_memory_mb'] > 5
+
+
+def test_profile_span_without_a_profiler_is_a_no_op():
+    with profile_span(None, 'build'):
+        pass
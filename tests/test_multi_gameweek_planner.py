@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from multi_gameweek_planner import MAX_FREE_TRANSFERS, plan_transfers, project_expected_points
+from synthetic_instances import SQUAD_SHAPE, generate_instance, generate_timetable
+
+
+@pytest.fixture(scope='module')
+def instance():
+    df_players, my_team = generate_instance(200, seed=14)
+    timetable = generate_timetable(df_players, n_gameweeks=4, seed=14, blank_rate=0.1, double_rate=0.1)
+    return df_players, my_team, timetable
+
+
+@pytest.fixture(scope='module')
+def plan(instance):
+    df_players, my_team, timetable = instance
+    return plan_transfers(df_players, my_team, timetable, horizon=4, window=2)
+
+
+def test_projection_follows_the_fixture_count():
+    df_players = pd.DataFrame({'team_id': [1, 2, 3], 'expected_points': [4.0, 4.0, 4.0], 'form': [1.0, 1.0, 1.0],
+                               'status': ['a', 'a', 'i']})
+    timetable = pd.DataFrame({'gameweek': [1, 2, 2], 'team_h_id': [1, 1, 1], 'team_a_id': [3, 2, 3],
+                              'team_h_difficulty': [3, 3, 3], 'team_a_difficulty': [3, 3, 3]})
+
+    projected = project_expected_points(df_players, timetable, [1, 2])
+
+    # Club 1 doubles in GW2, club 2 blanks in GW1 (falls back to form), player 3 is injured
+    np.testing.assert_allclose(projected, [[4.0, 8.0], [0.0, 1.0], [0.0, 0.0]])
+
+
+def test_every_gameweek_has_a_valid_squad(instance, plan):
+    df_players, _, _ = instance
+    for gameweek in plan['gameweeks']:
+        squad = df_players.loc[gameweek['squad']]
+
+        assert squad['position'].value_counts().to_dict() == SQUAD_SHAPE
+        assert squad['team_id'].value_counts().max() <= 3
+        assert len(gameweek['starting']) == 11 and gameweek['captain'] in gameweek['starting']
+
+
+def test_free_transfers_are_banked_by_the_fpl_rule(instance, plan):
+    _, my_team, _ = instance
+    previous = plan['gameweeks'][0]
+    assert previous['free_transfers'] == my_team.free_transfers
+
+    for gameweek in plan['gameweeks'][1:]:
+        assert set(gameweek['transfers_in']) == set(gameweek['squad']) - set(previous['squad'])
+        assert gameweek['free_transfers'] == min(previous['free_transfers'] - previous['free_transfers_used'] + 1,
+                                                 MAX_FREE_TRANSFERS)
+        previous = gameweek
+
+
+def test_rolling_windows_cover_the_horizon(instance, plan):
+    df_players, my_team, timetable = instance
+    single = plan_transfers(df_players, my_team, timetable, horizon=4, window=4, step=4)
+
+    assert [gameweek['gameweek'] for gameweek in plan['gameweeks']] == [9, 10, 11, 12]
+    assert len(plan['windows']) == 4 and len(single['windows']) == 1
+    assert single['windows'][0]['proven_optimal']
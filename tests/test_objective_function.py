@@ -0,0 +1,19 @@
+from pulp import LpMaximize, LpProblem
+
+from benchmarks import build_reference_objective, expression_coefficients
+from decision_variables import create_decision_variables
+from fdr import CSVFDRCalculator
+from objective_function import add_objective_function
+from synthetic_instances import generate_instance
+
+
+def test_vectorised_objective_matches_the_per_row_builder():
+    df_players, my_team = generate_instance(300, seed=10)
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+    for vars in (create_decision_variables(df_players), create_decision_variables(df_players, my_team)):
+        prob = add_objective_function(LpProblem('objective', LpMaximize), df_players, vars, penalty_points=4,
+                                      base_opposing_penalty=0, fdr_calculator=fdr_calculator, fdr_penalty_weight=0.5)
+        reference = build_reference_objective(df_players, vars, 4, fdr_calculator, 0.5)
+
+        assert expression_coefficients(prob.objective) == expression_coefficients(reference)
@@ -0,0 +1,45 @@
+import pytest
+
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from opposing_teams import find_opposing_pairs
+from solver_config import solve_problem
+from synthetic_instances import generate_instance
+
+
+@pytest.mark.parametrize('base_opposing_penalty', [1, 3])
+def test_pairwise_and_fixture_formulations_agree(base_opposing_penalty):
+    df_players, my_team = generate_instance(300, seed=2)
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+
+    objectives = {}
+    for formulation in ('pairwise', 'fixture'):
+        prob, _ = build_optimisation_problem(df_players, my_team, base_opposing_penalty=base_opposing_penalty,
+                                             fdr_calculator=fdr_calculator, opposing_formulation=formulation)
+        objectives[formulation] = solve_problem(prob)['objective']
+
+    assert objectives['fixture'] == pytest.approx(objectives['pairwise'])
+
+
+def test_unknown_formulation_is_rejected():
+    df_players, my_team = generate_instance(100, seed=2)
+    with pytest.raises(ValueError):
+        build_optimisation_problem(df_players, my_team, opposing_formulation='quadratic')
+
+
+def brute_force_pairs(df_players):
+    """Opposing pairs found by checking every index pair, as the builder did before grouping by fixture."""
+    rows = list(df_players.itertuples())
+    return sorted(
+        (a.Index, b.Index) for a in rows for b in rows
+        if a.Index < b.Index and a.opponent_id == b.team_id and b.opponent_id == a.team_id
+        and a.opponent != 'No fixture'
+    )
+
+
+def test_fixture_grouping_finds_the_same_pairs_as_a_full_scan():
+    df_players, _ = generate_instance(300, seed=2, blank_teams=2)
+    shuffled = df_players.sample(frac=1, random_state=0)
+
+    assert find_opposing_pairs(df_players) == brute_force_pairs(df_players)
+    assert find_opposing_pairs(shuffled) == brute_force_pairs(shuffled)
@@ -0,0 +1,37 @@
+import pytest
+
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from persistent_model import PersistentSquadModel
+from solver_config import solve_problem
+from synthetic_instances import generate_instance
+
+
+def rebuilt_objective(free_transfers=1, **parameters):
+    df_players, my_team = generate_instance(300, seed=9)
+    my_team.free_transfers = free_transfers
+    prob, _ = build_optimisation_problem(df_players, my_team, fdr_calculator=CSVFDRCalculator(df_players=df_players),
+                                         **parameters)
+    return solve_problem(prob)['objective']
+
+
+@pytest.fixture(scope='module')
+def model():
+    df_players, my_team = generate_instance(300, seed=9)
+    return PersistentSquadModel(df_players, my_team, fdr_calculator=CSVFDRCalculator(df_players=df_players))
+
+
+@pytest.mark.parametrize('update', [
+    {},
+    {'penalty_points': 8},
+    {'fdr_penalty_weight': 1.5, 'base_opposing_penalty': 3},
+    {'free_transfers': 2},
+    {'penalty_points': 4, 'fdr_penalty_weight': 0.5, 'base_opposing_penalty': 1, 'free_transfers': 1},
+])
+def test_updated_model_matches_a_rebuilt_model(model, update):
+    model.update(**update)
+    stats = model.solve()
+
+    parameters = {'penalty_points': model.penalty_points, 'fdr_penalty_weight': model.fdr_penalty_weight,
+                  'base_opposing_penalty': model.base_opposing_penalty}
+    assert stats['objective'] == pytest.approx(rebuilt_objective(model.free_transfers, **parameters))
@@ -0,0 +1,89 @@
+import os
+import time
+
+import pytest
+
+from model_builder import build_optimisation_problem
+from solution_cache import SolutionCache, compute_cache_key, make_cache_entry, should_cache
+from solver_config import SolverConfig, solve_problem
+from squad_creator import process_optimization_results
+from synthetic_instances import generate_instance
+
+
+PARAMETERS = {'penalty_points': 4, 'base_opposing_penalty': 1, 'opposing_formulation': 'pairwise'}
+
+
+@pytest.fixture(scope='module')
+def instance():
+    return generate_instance(300, seed=0)
+
+
+def test_key_is_stable_for_identical_inputs(instance):
+    df_players, my_team = instance
+    assert compute_cache_key(df_players, my_team, PARAMETERS) == compute_cache_key(df_players.copy(), my_team,
+                                                                                   dict(PARAMETERS))
+
+
+def test_key_changes_with_parameters(instance):
+    df_players, my_team = instance
+    assert compute_cache_key(df_players, my_team, PARAMETERS) != compute_cache_key(
+        df_players, my_team, dict(PARAMETERS, penalty_points=2))
+
+
+def test_key_changes_with_player_data(instance):
+    df_players, my_team = instance
+    changed = df_players.copy()
+    changed.loc[changed.index[0], 'expected_points'] += 0.1
+    assert compute_cache_key(df_players, my_team, PARAMETERS) != compute_cache_key(changed, my_team, PARAMETERS)
+
+
+def test_key_changes_with_team_state(instance):
+    df_players, _ = instance
+    _, one_free = generate_instance(300, seed=0)
+    _, two_free = generate_instance(300, seed=0)
+    two_free.free_transfers = 2
+    assert compute_cache_key(df_players, one_free, PARAMETERS) != compute_cache_key(df_players, two_free, PARAMETERS)
+
+
+def test_entries_round_trip(tmp_path):
+    cache = SolutionCache(tmp_path)
+    cache.put('a' * 64, {'objective': 12.5})
+
+    assert cache.get('a' * 64) == {'objective': 12.5}
+    assert cache.get('b' * 64) is None
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = SolutionCache(tmp_path)
+    (tmp_path / f"{'a' * 64}.pkl").write_bytes(b'not a pickle')
+
+    assert cache.get('a' * 64) is None
+    assert not (tmp_path / f"{'a' * 64}.pkl").exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    payload = {'squad': 'x' * 1000}
+    cache = SolutionCache(tmp_path, max_bytes=2500)
+    for key in ('a', 'b'):
+        cache.put(key * 64, payload)
+    past = time.time() - 60
+    os.utime(tmp_path / f"{'a' * 64}.pkl", (past, past))
+    os.utime(tmp_path / f"{'b' * 64}.pkl", (past - 60, past - 60))
+    cache.get('b' * 64)  # refreshes b, so a is now the least recently used
+
+    cache.put('c' * 64, payload)
+
+    assert cache.get('a' * 64) is None
+    assert cache.get('b' * 64) == payload and cache.get('c' * 64) == payload
+
+
+def test_only_proven_optimal_solves_are_cached(instance):
+    df_players, my_team = instance
+    prob, vars = build_optimisation_problem(df_players, my_team, opposing_formulation='fixture')
+    stats = solve_problem(prob, SolverConfig())
+    entry = make_cache_entry(process_optimization_results(vars, df_players, prob), prob, stats)
+
+    assert should_cache(stats)
+    assert entry['objective'] == pytest.approx(stats['objective'])
+    assert not should_cache(dict(stats, proven_optimal=False))
+    assert not should_cache(None)
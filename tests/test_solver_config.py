@@ -0,0 +1,53 @@
+import argparse
+
+import pytest
+
+from model_builder import build_optimisation_problem
+from solver_config import (SolverConfig, add_solver_arguments, is_proven_optimal, parse_cbc_log, solve_problem,
+                           solver_config_from_args)
+from synthetic_instances import generate_instance
+
+
+CBC_LOG = """
+Result - Stopped on gap
+
+Objective value:                -61.23000000
+Enumerated nodes:               14
+Gap:                            -0.03
+"""
+
+
+def test_cbc_and_highs_reach_the_same_optimum():
+    df_players, my_team = generate_instance(300, seed=8)
+    objectives = {}
+    for solver in ('cbc', 'highs'):
+        prob, _ = build_optimisation_problem(df_players, my_team, opposing_formulation='fixture')
+        stats = solve_problem(prob, SolverConfig(solver=solver, threads=1))
+        assert stats['solver'] == solver and stats['proven_optimal']
+        objectives[solver] = stats['objective']
+
+    assert objectives['highs'] == pytest.approx(objectives['cbc'])
+
+
+def test_cbc_log_is_parsed():
+    assert parse_cbc_log(CBC_LOG) == {'result': 'Stopped on gap', 'nodes': 14, 'gap': 0.03}
+    assert parse_cbc_log('') == {'result': None, 'nodes': None, 'gap': None}
+
+
+def test_gap_limited_solves_are_not_proven_optimal():
+    assert is_proven_optimal(True, 0.0)
+    assert not is_proven_optimal(True, 0.03)
+    assert not is_proven_optimal(True, None)
+    assert not is_proven_optimal(False, 0.0)
+
+
+def test_command_line_options_build_a_config():
+    args = add_solver_arguments(argparse.ArgumentParser()).parse_args(['--solver', 'highs', '--gap-rel', '0.01'])
+    config = solver_config_from_args(args, threads=2)
+
+    assert (config.solver, config.threads, config.time_limit, config.gap_rel) == ('highs', 2, None, 0.01)
+
+
+def test_unknown_solver_is_rejected():
+    with pytest.raises(ValueError):
+        SolverConfig(solver='gurobi')
@@ -0,0 +1,45 @@
+import pytest
+
+from benchmarks import squad_signature
+from compact_formulation import build_compact_problem, process_compact_results
+from fdr import CSVFDRCalculator
+from solver_config import solve_problem
+from sparse_backend import SparseSquadModel
+from synthetic_instances import generate_instance
+
+
+@pytest.fixture(scope='module')
+def instance():
+    df_players, my_team = generate_instance(300, seed=4)
+    return df_players, my_team, CSVFDRCalculator(df_players=df_players)
+
+
+@pytest.mark.parametrize('opposing_formulation', ['pairwise', 'fixture'])
+def test_sparse_backend_matches_pulp(instance, opposing_formulation):
+    df_players, my_team, fdr_calculator = instance
+    prob, vars = build_compact_problem(df_players, my_team, fdr_calculator=fdr_calculator,
+                                       opposing_formulation=opposing_formulation)
+    pulp_stats = solve_problem(prob)
+    pulp_squad = squad_signature(process_compact_results(vars, df_players, my_team, prob))
+
+    model = SparseSquadModel(df_players, my_team, fdr_calculator=fdr_calculator,
+                             opposing_formulation=opposing_formulation)
+    sparse_stats = model.solve()
+    sparse_squad = squad_signature(model.process_results())
+
+    assert sparse_stats['proven_optimal']
+    assert sparse_stats['objective'] == pytest.approx(pulp_stats['objective'])
+    assert (sparse_squad['starting'], sparse_squad['captain']) == (pulp_squad['starting'], pulp_squad['captain'])
+
+
+def test_index_labels_need_not_be_row_positions(instance):
+    df_players, my_team, fdr_calculator = instance
+    model = SparseSquadModel(df_players, my_team, fdr_calculator=fdr_calculator)
+    model.solve()
+
+    relabelled = df_players.set_axis(df_players.index * 7 + 1000)[::-1]
+    relabelled_model = SparseSquadModel(relabelled, my_team, fdr_calculator=fdr_calculator)
+    relabelled_model.solve()
+
+    assert relabelled_model.objective == pytest.approx(model.objective)
+    assert squad_signature(relabelled_model.process_results()) == squad_signature(model.process_results())
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from sparse_backend import SparseSquadModel
+from stochastic_optimiser import StochasticSquadModel, generate_scenarios, main, summarise_scores
+from synthetic_instances import generate_instance
+
+
+@pytest.fixture(scope='module')
+def instance():
+    df_players, my_team = generate_instance(300, seed=6)
+    return df_players, my_team, generate_scenarios(df_players, 100, seed=0)
+
+
+@pytest.fixture(scope='module')
+def mean_model(instance):
+    df_players, my_team, scenarios = instance
+    model = StochasticSquadModel(df_players, my_team, scenarios)
+    model.solve()
+    return model
+
+
+def test_scenarios_are_reproducible(instance):
+    df_players, _, scenarios = instance
+    assert np.array_equal(generate_scenarios(df_players, 100, seed=0), scenarios)
+
+
+def test_mean_objective_equals_the_deterministic_model_on_scenario_means(instance, mean_model):
+    df_players, my_team, scenarios = instance
+    mean_pool = df_players.assign(expected_points=scenarios.mean(axis=1, dtype=float))
+    model = SparseSquadModel(mean_pool, my_team)
+    model.solve()
+
+    assert mean_model.objective == pytest.approx(model.objective)
+
+
+def test_cvar_floor_is_met(instance, mean_model):
+    df_players, my_team, scenarios = instance
+    floor = summarise_scores(mean_model.scenario_scores())['cvar'] + 2
+    model = StochasticSquadModel(df_players, my_team, scenarios, cvar_floor=floor)
+    stats = model.solve()
+
+    assert stats['proven_optimal']
+    assert summarise_scores(model.scenario_scores())['cvar'] >= floor - 1e-6
+    assert model.objective <= mean_model.objective + 1e-6
+
+
+def test_scenarios_must_match_the_pool(instance):
+    df_players, my_team, scenarios = instance
+    with pytest.raises(ValueError):
+        StochasticSquadModel(df_players, my_team, scenarios[:-1])
+
+
+def test_prune_is_rejected_with_a_cvar_floor(monkeypatch):
+    monkeypatch.setattr('sys.argv', ['stochastic_optimiser.py', '--prune', '--cvar-floor', '40'])
+    with pytest.raises(SystemExit):
+        main()
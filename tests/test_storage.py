@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from fpl_data.storage import (GAMEWEEK_SCHEMA, export_gameweeks_csv, read_gameweeks, read_table, to_arrow,
+                              write_gameweek, write_table)
+
+
+def gameweek_rows(player_ids, minutes):
+    return pd.DataFrame({'player_id': player_ids, 'player_name': [f"Player {i}" for i in player_ids],
+                         'minutes': minutes, 'influence': ['12.4'] * len(player_ids)})
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    root = tmp_path / 'gameweeks'
+    write_gameweek(gameweek_rows([1, 2], [90, 0]), 1, root)
+    write_gameweek(gameweek_rows([1, 2], [45, 90]), 2, root)
+    return root
+
+
+def test_numeric_strings_are_parsed():
+    table = to_arrow(pd.DataFrame({'player_id': ['7'], 'influence': ['12.4'], 'minutes': ['n/a']}), GAMEWEEK_SCHEMA)
+
+    assert table.schema == GAMEWEEK_SCHEMA
+    assert table.column('influence').to_pylist() == [12.4]
+    assert table.column('minutes').to_pylist() == [None]
+
+
+def test_only_requested_columns_and_partitions_are_read(dataset):
+    df = read_gameweeks(dataset, columns=['player_id', 'minutes', 'gameweek'], gameweeks=[2])
+
+    assert list(df.columns) == ['player_id', 'minutes', 'gameweek']
+    assert df['minutes'].tolist() == [45, 90] and set(df['gameweek']) == {2}
+
+
+def test_rewriting_a_gameweek_replaces_its_partition(dataset):
+    write_gameweek(gameweek_rows([3], [60]), 2, dataset)
+    df = read_gameweeks(dataset, columns=['player_id', 'gameweek'])
+
+    assert sorted(df.itertuples(index=False, name=None)) == [(1, 1), (2, 1), (3, 2)]
+
+
+def test_csv_export_round_trips(dataset, tmp_path):
+    paths = export_gameweeks_csv(dataset, tmp_path / 'csv')
+    exported = pd.read_csv(paths[0])
+
+    assert [path.name for path in paths] == ['gameweek1.csv', 'gameweek2.csv']
+    assert exported['minutes'].tolist() == [90, 0]
+
+
+def test_read_table_finds_the_parquet_sibling_and_skips_missing_columns(tmp_path):
+    write_table(gameweek_rows([1], [90]), tmp_path / 'players.parquet', GAMEWEEK_SCHEMA)
+    df = read_table(tmp_path / 'players.csv', columns=['minutes', 'not_a_column', 'player_id'])
+
+    assert list(df.columns) == ['minutes', 'player_id']
@@ -0,0 +1,32 @@
+import pytest
+
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from sweep import build_parameter_grid, run_sweep
+from synthetic_instances import generate_instance
+
+
+def test_grid_covers_every_combination():
+    grid = build_parameter_grid(penalty_points=[0, 4], free_transfers=[1, 2, 3])
+
+    assert len(grid) == 6
+    assert {'penalty_points': 4, 'free_transfers': 3} in grid
+
+
+def test_unknown_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        build_parameter_grid(budget=[0, 1])
+
+
+def test_parallel_sweep_matches_independent_solves():
+    df_players, my_team = generate_instance(200, seed=13)
+    fdr_calculator = CSVFDRCalculator(df_players=df_players)
+    grid = build_parameter_grid(penalty_points=[0, 8], base_opposing_penalty=[0, 2])
+
+    results, _ = run_sweep(df_players, my_team, grid, fdr_calculator=fdr_calculator, workers=2)
+
+    assert results[['penalty_points', 'base_opposing_penalty']].to_dict('records') == grid
+    for parameters, objective in zip(grid, results['objective']):
+        prob, _ = build_optimisation_problem(df_players, my_team, fdr_calculator=fdr_calculator, **parameters)
+        assert objective == pytest.approx(solve_problem(prob)['objective'])
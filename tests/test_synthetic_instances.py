@@ -0,0 +1,40 @@
+import pandas as pd
+
+from synthetic_instances import SQUAD_SHAPE, generate_instance, generate_timetable
+
+
+def test_instances_are_reproducible_per_seed():
+    first, first_team = generate_instance(300, seed=1)
+    second, second_team = generate_instance(300, seed=1)
+    other, _ = generate_instance(300, seed=2)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert first_team.all_ids == second_team.all_ids
+    assert not first.equals(other)
+
+
+def test_current_squad_is_valid():
+    df_players, my_team = generate_instance(300, seed=1)
+    squad = df_players[df_players['id'].isin(my_team.all_ids)]
+
+    assert len(my_team.starting_ids) == 11 and len(my_team.bench_ids) == 4
+    assert squad['position'].value_counts().to_dict() == SQUAD_SHAPE
+    assert squad['team'].value_counts().max() <= 3
+    assert (squad['status'] == 'a').all() and squad['price'].sum() <= 100.0
+
+
+def test_blank_teams_have_no_opponent():
+    df_players, _ = generate_instance(300, seed=1, blank_teams=2)
+    blank = df_players[df_players['opponent_id'] == 0]
+
+    assert blank['team_id'].nunique() == 2
+
+
+def test_timetable_pairs_every_club_once_per_gameweek():
+    df_players, _ = generate_instance(300, seed=1)
+    timetable = generate_timetable(df_players, n_gameweeks=4)
+
+    assert sorted(timetable['gameweek'].unique()) == [9, 10, 11, 12]
+    for _, fixtures in timetable.groupby('gameweek'):
+        clubs = pd.concat([fixtures['team_h_id'], fixtures['team_a_id']])
+        assert clubs.is_unique and len(clubs) == df_players['team_id'].nunique()
@@ -0,0 +1,43 @@
+import pytest
+
+from fdr import CSVFDRCalculator
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from synthetic_instances import generate_instance
+from top_k_plans import find_top_plans
+
+
+@pytest.fixture(scope='module')
+def instance():
+    df_players, my_team = generate_instance(300, seed=5)
+    return df_players, my_team, CSVFDRCalculator(df_players=df_players)
+
+
+@pytest.fixture(scope='module')
+def plans(instance):
+    df_players, my_team, fdr_calculator = instance
+    plans, _ = find_top_plans(df_players, my_team, k=4, fdr_calculator=fdr_calculator)
+    return plans
+
+
+def test_best_plan_matches_a_single_solve(instance, plans):
+    df_players, my_team, fdr_calculator = instance
+    prob, _ = build_optimisation_problem(df_players, my_team, fdr_calculator=fdr_calculator)
+    assert plans[0]['objective'] == pytest.approx(solve_problem(prob)['objective'])
+
+
+def test_plans_are_distinct_and_ranked(plans):
+    objectives = [plan['objective'] for plan in plans]
+
+    assert [plan['rank'] for plan in plans] == [1, 2, 3, 4]
+    assert len({plan['final_squad'] for plan in plans}) == len(plans)
+    assert objectives == sorted(objectives, reverse=True)
+
+
+def test_max_gap_stops_early(instance, plans):
+    df_players, my_team, fdr_calculator = instance
+    max_gap = plans[1]['gap'] + 1e-3
+    limited, _ = find_top_plans(df_players, my_team, k=4, fdr_calculator=fdr_calculator, max_gap=max_gap)
+
+    assert all(plan['gap'] <= max_gap + 1e-6 for plan in limited)
+    assert [plan['final_squad'] for plan in limited] == [plan['final_squad'] for plan in plans if plan['gap'] <= max_gap]
@@ -0,0 +1,31 @@
+import pytest
+from pulp import value
+
+from model_builder import build_optimisation_problem
+from solver_config import solve_problem
+from synthetic_instances import generate_instance
+from warm_start import find_violated_constraints, set_current_squad_warm_start
+
+
+@pytest.mark.parametrize('opposing_formulation', ['pairwise', 'fixture'])
+def test_current_squad_is_a_complete_feasible_start(opposing_formulation):
+    df_players, my_team = generate_instance(300, seed=7)
+    prob, vars = build_optimisation_problem(df_players, my_team, opposing_formulation=opposing_formulation)
+
+    assert set_current_squad_warm_start(prob, vars, df_players, my_team)
+    assert all(var.varValue is not None for var in prob.variables())
+    assert not find_violated_constraints(prob)
+
+    start_objective = value(prob.objective)
+    assert solve_problem(prob, warm_start=True)['objective'] >= start_objective - 1e-6
+
+
+def test_infeasible_current_squad_falls_back_to_a_cold_start():
+    df_players, my_team = generate_instance(300, seed=7)
+    # Four owned players at one club break the three-per-club rule
+    owned = df_players.index[df_players['id'].isin(my_team.starting_ids)][:4]
+    df_players.loc[owned, 'team'] = df_players.loc[owned[0], 'team']
+    prob, vars = build_optimisation_problem(df_players, my_team)
+
+    assert not set_current_squad_warm_start(prob, vars, df_players, my_team)
+    assert all(var.varValue is None for var in prob.variables())